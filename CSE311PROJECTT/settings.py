@@ -10,10 +10,16 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import atexit
+import copy
 import os
+import shutil
+import sys
+import tempfile
 from pathlib import Path
 from urllib.request import localhost
 
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -54,8 +60,10 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'course_management.middleware.ProfilingMiddleware',  # süper kullanıcılar için ?profile=1
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'course_management.middleware.RequestMetricsMiddleware',  # Server-Timing + istek metrikleri, sonda kalmalı
 ]
 
 ROOT_URLCONF = 'CSE311PROJECTT.urls'
@@ -81,12 +89,108 @@ WSGI_APPLICATION = 'CSE311PROJECTT.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
+# `manage.py test` ile mi çalışıyoruz (log seviyeleri, rapor veritabanı vb. buna göre ayarlanır)
+TESTING = sys.argv[1:2] == ['test']
+
+# varsayılan SQLite; DB_ENGINE=postgresql ile PostgreSQL + Django'nun bağlantı havuzu kullanılır
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('POSTGRES_DB', 'obe'),
+            'USER': os.getenv('POSTGRES_USER', 'postgres'),
+            'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+            'HOST': os.getenv('POSTGRES_HOST', 'localhost'),
+            'PORT': os.getenv('POSTGRES_PORT', '5432'),
+            # havuzdan alınan bağlantı kullanılmadan önce doğrulanır
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                # psycopg_pool: her worker süreci kendi havuzunu tutar (CONN_MAX_AGE ile birlikte kullanılmaz)
+                'pool': {
+                    'min_size': int(os.getenv('POSTGRES_POOL_MIN_SIZE', '2')),
+                    'max_size': int(os.getenv('POSTGRES_POOL_MAX_SIZE', '10')),
+                    'timeout': float(os.getenv('POSTGRES_POOL_TIMEOUT', '10')),
+                },
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # yazan transaction'lar kilidi BEGIN anında alır; okuma -> yazma yükseltmesinde
+                # "database is locked" ile ortada kalmazlar (bkz. course_management.retry)
+                'transaction_mode': 'IMMEDIATE',
+                # kilit için beklenecek süre (sn), sonrasında retry_on_lock devreye girer
+                'timeout': float(os.getenv('SQLITE_TIMEOUT', '5')),
+                # WAL: yazma sürerken okumalar bloklanmaz
+                'init_command': 'PRAGMA journal_mode=WAL;',
+            },
+        }
+    }
+
+# Ağır raporlar (po_achievement, view_outcomes, export_po_achievement) salt okunur 'reporting'
+# alias'ından okur (course_management.reporting):
+#   REPORTING_DATABASE=snapshot --> refresh_reporting_snapshot ile alınan SQLite kopyası
+#   REPORTING_DATABASE=replica  --> REPORTING_DB_HOST/PORT ile verilen PostgreSQL read replica
+#   boş (varsayılan)            --> alias tanımlanmaz, raporlar ana veritabanından okur
+# Testlerde alias tanımlanmaz: TestCase'in transaction içindeki verisi ayrı bir bağlantıdan görünmez.
+REPORTING_DATABASE = '' if TESTING else os.getenv('REPORTING_DATABASE', '')
+REPORTING_SNAPSHOT_PATH = Path(os.getenv('REPORTING_SNAPSHOT_PATH', BASE_DIR / 'var' / 'reporting.sqlite3'))
+
+if REPORTING_DATABASE == 'snapshot':
+    DATABASES['reporting'] = {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': REPORTING_SNAPSHOT_PATH,
+        'OPTIONS': {'init_command': 'PRAGMA query_only=1;'},
+    }
+elif REPORTING_DATABASE == 'replica':
+    DATABASES['reporting'] = {
+        **copy.deepcopy(DATABASES['default']),
+        'HOST': os.getenv('REPORTING_DB_HOST', DATABASES['default'].get('HOST', '')),
+        'PORT': os.getenv('REPORTING_DB_PORT', DATABASES['default'].get('PORT', '')),
+    }
+
+DATABASE_ROUTERS = ['course_management.reporting.ReportingRouter']
+
+
+# Cache: REDIS_URL verilirse tüm worker'ların paylaştığı Redis, yoksa süreç içi bellek (LocMemCache).
+REDIS_URL = os.getenv('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
     }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Oturum saklama stratejisi (SESSION_STRATEGY):
+#   db             --> her istekte session tablosu okunur (Django varsayılanı)
+#   cached_db      --> oturum önce cache'ten okunur, yazmalar hem cache'e hem veritabanına gider;
+#                      birden fazla worker varsa paylaşılan bir cache (REDIS_URL) gerekir
+#   signed_cookies --> oturum verisi imzalı çerezde taşınır, sunucuda hiç okuma/yazma yapılmaz;
+#                      çıkışta sunucu tarafında geçersiz kılınamaz, çerez 4 KB sınırına tabidir
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
 }
+SESSION_STRATEGY = os.getenv('SESSION_STRATEGY', 'db')
+if SESSION_STRATEGY not in SESSION_ENGINES:
+    raise ImproperlyConfigured(
+        f"SESSION_STRATEGY '{SESSION_STRATEGY}' geçersiz; seçenekler: {', '.join(SESSION_ENGINES)}"
+    )
+SESSION_ENGINE = SESSION_ENGINES[SESSION_STRATEGY]
 
 
 # Password validation
@@ -141,5 +245,64 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Bölüm başkanı paneli sayaçları (course_management.stats): not yazmalarından sonra pahalı not
+# sayımları en fazla bu kadar saniyede bir yapılır; arada panel eskimiş satırı gösterir
+DEPARTMENT_STATS_REFRESH_INTERVAL = int(os.getenv('DEPARTMENT_STATS_REFRESH_INTERVAL', '60'))
+
+# Yüklenen Excel dosyaları ayrı bir süreçte okunur (course_management.spreadsheets.read_excel_rows);
+# sürecin bellek sınırı (MB, RLIMIT_AS) ve en uzun çalışma süresi (saniye)
+SPREADSHEET_PARSE_MEMORY_MB = int(os.getenv('SPREADSHEET_PARSE_MEMORY_MB', '512'))
+SPREADSHEET_PARSE_TIMEOUT = float(os.getenv('SPREADSHEET_PARSE_TIMEOUT', '30'))
+
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'  # djangoda hazır gelen şifre sistemi
                                                                   # şifremi unuttum yapabilmek için olan mail ayarı
+
+# İstek metrikleri (course_management.middleware.RequestMetricsMiddleware) tek satır JSON olarak loglanır.
+# Testlerde her istek için log basılmasın diye seviye yükseltilir.
+REQUEST_METRICS_LOG_LEVEL = os.getenv('REQUEST_METRICS_LOG_LEVEL', 'WARNING' if TESTING else 'INFO')
+
+# ProfilingMiddleware çıktıları (.prof + .html) ve dizinde tutulacak en fazla profil sayısı
+PROFILING_DIR = os.getenv('PROFILING_DIR', BASE_DIR / 'profiling')
+PROFILING_MAX_FILES = int(os.getenv('PROFILING_MAX_FILES', '50'))
+
+# /metrics: süreç başına metrik dosyalarının dizini. Süper kullanıcı dışında sadece
+# `Authorization: Bearer <METRICS_TOKEN>` ile erişilir; token boşsa bu yol kapalıdır.
+# METRICS_ALLOWED_IPS açıkça verilmedikçe boştur: reverse proxy arkasında her istek 127.0.0.1'den
+# geldiği için loopback'e güvenmek /metrics'i herkese açar.
+METRICS_DIR = os.getenv('METRICS_DIR', BASE_DIR / 'var' / 'metrics')
+if TESTING:
+    # testler gerçek metrik dizinine süreç dosyası bırakmasın
+    METRICS_DIR = tempfile.mkdtemp(prefix='metrics-test-')
+    atexit.register(shutil.rmtree, METRICS_DIR, ignore_errors=True)
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+METRICS_ALLOWED_IPS = [ip.strip() for ip in os.getenv('METRICS_ALLOWED_IPS', '').split(',') if ip.strip()]
+
+# Bu süreyi (ms) aşan sorgular SQL, parametreler, view ve EXPLAIN planıyla loglanır (course_management.slow_queries).
+# Boş bırakılırsa yavaş sorgu logu kapanır.
+_slow_query_threshold = os.getenv('SLOW_QUERY_THRESHOLD_MS', '200')
+SLOW_QUERY_THRESHOLD_MS = float(_slow_query_threshold) if _slow_query_threshold else None
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'metrics': {'format': '%(asctime)s %(name)s %(message)s'},
+    },
+    'handlers': {
+        'metrics_console': {'class': 'logging.StreamHandler', 'formatter': 'metrics'},
+        'slow_query_console': {'class': 'logging.StreamHandler', 'formatter': 'metrics'},
+    },
+    'loggers': {
+        'course_management.metrics': {
+            'handlers': ['metrics_console'],
+            'level': REQUEST_METRICS_LOG_LEVEL,
+            'propagate': False,
+        },
+        # handler'lar AppConfig.ready içinde QueueListener arkasına alınır, istek thread'i bloklanmaz
+        'course_management.slow_queries': {
+            'handlers': ['slow_query_console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
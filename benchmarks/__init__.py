@@ -0,0 +1,6 @@
+"""
+Rol bazlı sıcak view'lar için benchmark paketi.
+
+`python manage.py run_benchmarks` komutu ile çalıştırılır; sonuçlar JSON olarak yazılır
+ve commitler arasında karşılaştırılabilir.
+"""
@@ -0,0 +1,124 @@
+"""Senaryoları çalıştırır ve gecikme, sorgu sayısı ve bellek tepe değerini ölçer."""
+import statistics
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from .scenarios import SCENARIOS, build_url, resolve_targets
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def measure(client, url, repeat, warmup):
+    """
+    Tek bir URL'i ölçer. Süre ölçümü sorgu yakalama ve tracemalloc olmadan yapılır,
+    çünkü ikisi de isteği belirgin şekilde yavaşlatır; sorgu sayısı ve bellek ayrı turlarda ölçülür.
+    """
+    for _ in range(warmup):
+        client.get(url)
+
+    timings = []
+    status_code = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(url)
+        timings.append((time.perf_counter() - started) * 1000)
+        status_code = response.status_code
+
+    # DEBUG kapalıyken sorgu log'u tutulmaz, sayım execute_wrapper ile yapılır
+    query_count = 0
+
+    def count_queries(execute, sql, params, many, context):
+        nonlocal query_count
+        query_count += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count_queries):
+        client.get(url)
+
+    tracemalloc.start()
+    try:
+        client.get(url)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "status": status_code,
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "queries": query_count,
+        "peak_memory_kib": round(peak / 1024, 1),
+    }
+
+
+def run_scenarios(scale, repeat=20, warmup=2, only=None):
+    targets = resolve_targets()
+    results = []
+
+    for scenario in SCENARIOS:
+        if only and scenario.name not in only:
+            continue
+        user = targets["users"][scenario.role]
+        if user is None:
+            continue
+
+        client = Client()
+        client.force_login(user)
+        result = measure(client, build_url(scenario, targets["course"]), repeat, warmup)
+        results.append({"scale": scale, "view": scenario.name, **result})
+
+    return results
+
+
+def run_session_scenarios(scale, repeat=20, warmup=2, strategies=None):
+    """
+    Öğrenci panelini her oturum stratejisiyle (settings.SESSION_ENGINES) ölçer. Her satırda
+    `db` stratejisine göre istek başına kazanılan sorgu sayısı ve p50 süresi de bulunur.
+    """
+    student = resolve_targets()["users"]["student"]
+    url = reverse("student_dashboard")
+    results = []
+
+    for strategy in strategies or settings.SESSION_ENGINES:
+        # SessionMiddleware motoru yüklenirken seçer; her strateji yeni bir Client ile ölçülür
+        with override_settings(SESSION_ENGINE=settings.SESSION_ENGINES[strategy]):
+            cache.clear()
+            client = Client()
+            client.force_login(student)
+            result = measure(client, url, repeat, warmup)
+        results.append({"scale": scale, "view": "student_dashboard", "session": strategy, **result})
+
+    baseline = next((row for row in results if row["session"] == "db"), None)
+    if baseline:
+        for row in results:
+            row["saved_queries"] = baseline["queries"] - row["queries"]
+            row["saved_p50_ms"] = round(baseline["p50_ms"] - row["p50_ms"], 3)
+    return results
+
+
+def compare(baseline, current, threshold=0.2):
+    """
+    İki sonuç dosyasını (scale, view) bazında karşılaştırır.
+    p95 gecikmesi veya sorgu sayısı eşikten fazla artan satırları regresyon olarak döner.
+    """
+    previous = {(r["scale"], r["view"]): r for r in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        before = previous.get((row["scale"], row["view"]))
+        if before is None:
+            continue
+        if row["queries"] > before["queries"] or row["p95_ms"] > before["p95_ms"] * (1 + threshold):
+            regressions.append({"scale": row["scale"], "view": row["view"], "before": before, "after": row})
+    return regressions
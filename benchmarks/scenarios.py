@@ -0,0 +1,55 @@
+"""Ölçülen view'lar ve her birinin hangi kullanıcıyla, hangi URL'e istek atacağı."""
+from dataclasses import dataclass
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.urls import reverse
+
+from course_management.models import Course
+
+User = get_user_model()
+
+
+@dataclass
+class Scenario:
+    name: str
+    role: str
+    url_name: str
+    needs_course: bool = False
+
+
+SCENARIOS = [
+    Scenario("manage_course", "instructor", "manage_course", needs_course=True),
+    Scenario("course_grades", "instructor", "course_grades", needs_course=True),
+    Scenario("course_lo_scores", "instructor", "course_lo_scores", needs_course=True),
+    Scenario("student_dashboard", "student", "student_dashboard"),
+    Scenario("student_course_detail", "student", "student_course_detail", needs_course=True),
+    Scenario("po_achievement", "department_head", "po_achievement"),
+    Scenario("manage_lo_po_weights", "department_head", "manage_lo_po_weights"),
+    Scenario("view_outcomes", "department_head", "view_outcomes"),
+]
+
+
+def resolve_targets():
+    """
+    En kalabalık dersi ve o dersin bir hocası ile bir öğrencisini seçer;
+    böylece ölçümler veri setinin en ağır sayfaları üzerinden yapılır.
+    """
+    course = Course.objects.annotate(student_total=Count("students")).order_by("-student_total").first()
+    if course is None:
+        raise LookupError("Benchmark için en az bir ders gereklidir.")
+
+    return {
+        "course": course,
+        "users": {
+            "instructor": course.instructors.first(),
+            "student": course.students.first(),
+            "department_head": User.objects.filter(profile__role="department_head").first(),
+        },
+    }
+
+
+def build_url(scenario, course):
+    if scenario.needs_course:
+        return reverse(scenario.url_name, args=[course.id])
+    return reverse(scenario.url_name)
@@ -0,0 +1,71 @@
+"""
+Worker açılış maliyeti: `django.setup()` + URLConf importunun süresi ve bellek kullanımı.
+
+Her ölçüm temiz bir Python sürecinde yapılır. `lazy` modu projenin şu anki hâlidir; `eager` modu
+pandas'ı önceden import ederek spreadsheet desteğinin modül seviyesinde yüklendiği eski durumu taklit eder.
+
+    python -m benchmarks.startup --repeat 10
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+PROBE = r"""
+import json, os, resource, sys, time
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "CSE311PROJECTT.settings")
+started = time.perf_counter()
+if {eager}:
+    import pandas
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "pandas_loaded": "pandas" in sys.modules,
+}}))
+"""
+
+
+def probe(eager):
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(eager=eager)],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(repeat=5):
+    results = {}
+    for mode, eager in (("lazy", False), ("eager", True)):
+        samples = [probe(eager) for _ in range(repeat)]
+        seconds = [s["seconds"] * 1000 for s in samples]
+        results[mode] = {
+            "p50_ms": round(statistics.median(seconds), 1),
+            "min_ms": round(min(seconds), 1),
+            "max_rss_mib": round(statistics.median(s["max_rss_kib"] for s in samples) / 1024, 1),
+            "pandas_loaded": samples[0]["pandas_loaded"],
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Her mod için süreç sayısı")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    for mode, row in results.items():
+        print(f"{mode:<6} p50={row['p50_ms']:>7.1f}ms min={row['min_ms']:>7.1f}ms "
+              f"rss={row['max_rss_mib']:>6.1f}MiB pandas={'evet' if row['pandas_loaded'] else 'hayır'}")
+
+
+if __name__ == "__main__":
+    main()
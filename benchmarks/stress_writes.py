@@ -0,0 +1,141 @@
+"""
+Eşzamanlı yazma stres testi: çok sayıda süreç aynı SQLite dosyasına aynı anda not yazar.
+
+Her süreç kendi Django bağlantısıyla upsert_grades çağırır (BEGIN IMMEDIATE + retry_on_lock).
+Sonunda her yazmanın bir kez uygulandığı, sürüm (version) toplamının başarılı yazma sayısına
+eşit olmasıyla doğrulanır.
+
+    python -m benchmarks.stress_writes --processes 8 --writes 200
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+STUDENTS = 20
+COMPONENTS = 3
+
+
+def _setup_django(db_path):
+    # DB_ENGINE=postgresql ortamında bile betik her zaman geçici SQLite dosyasını kullanır
+    os.environ["DB_ENGINE"] = "sqlite"
+    os.environ["SQLITE_PATH"] = str(db_path)
+    # kilit beklemeleri (BEGIN IMMEDIATE) yavaş sorgu olarak loglanmasın
+    os.environ.setdefault("SLOW_QUERY_THRESHOLD_MS", "")
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "CSE311PROJECTT.settings")
+    sys.path.insert(0, str(BASE_DIR))
+    import django
+
+    django.setup()
+
+
+def _prepare(db_path):
+    env = {**os.environ, "DB_ENGINE": "sqlite", "SQLITE_PATH": str(db_path),
+           "DJANGO_SETTINGS_MODULE": "CSE311PROJECTT.settings"}
+    subprocess.run(
+        [sys.executable, "manage.py", "migrate", "--noinput", "-v", "0"],
+        cwd=BASE_DIR, env=env, check=True,
+    )
+    subprocess.run(
+        [sys.executable, "-m", "benchmarks.stress_writes", "--seed-only", "--db", str(db_path)],
+        cwd=BASE_DIR, env=env, check=True,
+    )
+
+
+def _seed(db_path):
+    _setup_django(db_path)
+    from django.contrib.auth.models import User
+    from course_management.models import Course, EvaluationComponent
+
+    course = Course.objects.create(course_code="STRESS", course_name="Stress")
+    for i in range(COMPONENTS):
+        EvaluationComponent.objects.create(course=course, name=f"C{i}", percentage=30)
+    students = User.objects.bulk_create([User(username=f"stress_{i}") for i in range(STUDENTS)])
+    course.students.add(*students)
+
+
+def _writer(db_path, writes, seed, results):
+    _setup_django(db_path)
+    from django.contrib.auth.models import User
+    from course_management.bulk import upsert_grades
+    from course_management.models import EvaluationComponent, Grade
+    from course_management.retry import DatabaseBusy
+
+    rng = random.Random(seed)
+    student_ids = list(User.objects.filter(username__startswith="stress_").values_list("id", flat=True))
+    component_ids = list(EvaluationComponent.objects.values_list("id", flat=True))
+
+    ok = busy = failed = 0
+    for _ in range(writes):
+        grade = Grade(student_id=rng.choice(student_ids), component_id=rng.choice(component_ids),
+                      score=rng.randint(0, 100))
+        try:
+            upsert_grades([grade])
+            ok += 1
+        except DatabaseBusy:
+            busy += 1
+        except Exception:
+            failed += 1
+    results.put((ok, busy, failed))
+
+
+def run(processes=8, writes=100, db_path=None):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(db_path or Path(tmp) / "stress.sqlite3")
+        _prepare(db_path)
+
+        ctx = multiprocessing.get_context("spawn")
+        results = ctx.Queue()
+        workers = [ctx.Process(target=_writer, args=(db_path, writes, seed, results)) for seed in range(processes)]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        totals = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+
+        ok = sum(t[0] for t in totals)
+        # doğrulama: her başarılı yazma tam bir kez uygulanmış olmalı
+        with sqlite3.connect(db_path) as conn:
+            version_sum = conn.execute("SELECT COALESCE(SUM(version), 0) FROM course_management_grade").fetchone()[0]
+
+        return {
+            "processes": processes,
+            "writes": processes * writes,
+            "ok": ok,
+            "busy": sum(t[1] for t in totals),
+            "failed": sum(t[2] for t in totals),
+            "version_sum": version_sum,
+            "seconds": round(elapsed, 2),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=100, help="Süreç başına yazma sayısı")
+    parser.add_argument("--db", help="SQLite dosya yolu (varsayılan: geçici dosya)")
+    parser.add_argument("--seed-only", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.seed_only:
+        _seed(args.db)
+        return
+
+    report = run(args.processes, args.writes, args.db)
+    print(" ".join(f"{key}={value}" for key, value in report.items()))
+    if report["failed"] or report["busy"] or report["version_sum"] != report["ok"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,4 +7,13 @@ class CourseManagementConfig(AppConfig):
 
     # signal load
     def ready(self):
+        import course_management.checks
         import course_management.signals
+        from django.db.backends.signals import connection_created
+        from course_management.middleware import install_request_metrics
+        from course_management.slow_queries import install_slow_query_logging, start_queue_listener
+
+        # istek sorgu sayacı ve yavaş sorgu hook'u her yeni bağlantıya eklenir, loglar kuyruk üzerinden yazılır
+        connection_created.connect(install_request_metrics, dispatch_uid='request_metrics')
+        connection_created.connect(install_slow_query_logging, dispatch_uid='slow_query_logging')
+        start_queue_listener()
@@ -0,0 +1,65 @@
+from django.db import transaction
+from django.db.models import F
+
+from .retry import retry_on_lock
+
+# tek INSERT ... ON CONFLICT sorgusunda yazılacak en fazla satır (SQLite değişken sınırının altında kalır)
+UPSERT_BATCH_SIZE = 500
+
+
+@retry_on_lock()
+def bulk_upsert(model, objs, unique_fields, update_fields, increment_fields=(), batch_size=UPSERT_BATCH_SIZE):
+    """
+    unique_together modelleri için toplu "varsa güncelle, yoksa ekle".
+
+    update_or_create'in satır başına SELECT + INSERT/UPDATE'i ve eşzamanlı isteklerde IntegrityError
+    yarışı yerine, her parti tek bir `INSERT ... ON CONFLICT (unique_fields) DO UPDATE` sorgusudur.
+    increment_fields (örn. Grade.version) yazılan her satırda bir artırılır; ON CONFLICT sadece
+    EXCLUDED değerini atayabildiği için bu, aynı transaction içinde ikinci bir UPDATE ile yapılır.
+
+    Transaction dışından çağrılırsa kilit hatalarında yeniden denenir (retry_on_lock).
+    Yazılan satır sayısını döner.
+    """
+    # aynı anahtar bir partide iki kez olursa PostgreSQL ON CONFLICT hata verir, son değer geçerli olur
+    attnames = [model._meta.get_field(name).attname for name in unique_fields]
+    by_key = {tuple(getattr(obj, attname) for attname in attnames): obj for obj in objs}
+    # satırlar her zaman anahtar sırasıyla kilitlenir; PostgreSQL'de aynı satırlara ters sırayla
+    # yazan iki istek birbirini beklerken "deadlock detected" oluşmaz
+    objs = [by_key[key] for key in sorted(by_key)]
+    if not objs:
+        return 0
+
+    manager = model._default_manager
+    with transaction.atomic():
+        for start in range(0, len(objs), batch_size):
+            batch = objs[start:start + batch_size]
+            manager.bulk_create(
+                batch,
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=update_fields,
+            )
+            if increment_fields:
+                # update_conflicts ile bulk_create, eklenen ve güncellenen satırların pk'larını doldurur
+                manager.filter(pk__in=[obj.pk for obj in batch]).update(
+                    **{name: F(name) + 1 for name in increment_fields}
+                )
+    return len(objs)
+
+
+def upsert_grades(grades, batch_size=UPSERT_BATCH_SIZE):
+    """Grade nesnelerini (öğrenci, bileşen) anahtarıyla yazar ve sürümlerini artırır."""
+    from .models import Grade
+    from .stats import mark_stale_on_commit
+
+    written = bulk_upsert(
+        Grade, grades,
+        unique_fields=["student", "component"],
+        update_fields=["score"],
+        increment_fields=["version"],
+        batch_size=batch_size,
+    )
+    # bulk_create post_save göndermez; panel sayaçları burada eskitilir
+    if written:
+        mark_stale_on_commit()
+    return written
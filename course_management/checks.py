@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+# her süreçte ayrı tutulan cache backend'leri
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_cached_sessions(app_configs, **kwargs):
+    """
+    cached_db oturumları süreç içi cache ile çok worker'lı kurulumda tutarsızlaşır: bir worker'da
+    çıkış yapan kullanıcı, oturumunu cache'inde tutan başka bir worker'da girişli görünmeye devam eder.
+    """
+    if settings.SESSION_ENGINE != 'django.contrib.sessions.backends.cached_db':
+        return []
+    cache = settings.CACHES[getattr(settings, 'SESSION_CACHE_ALIAS', 'default')]
+    if cache['BACKEND'] not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Warning(
+        'SESSION_STRATEGY=cached_db süreç içi bir cache ile kullanılıyor.',
+        hint='Birden fazla worker çalıştırıyorsanız REDIS_URL ile paylaşılan bir cache tanımlayın.',
+        id='course_management.W001',
+    )]
@@ -1,14 +1,46 @@
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
 from django.core.exceptions import PermissionDenied
 from django.shortcuts import redirect
 from .models import Profile
 
 
+def _async_role_required(function, role):
+    """
+    rol kontrolünün async view'lar için sürümü: kullanıcı ve profil await ile okunur,
+    event loop'ta senkron veritabanı erişimi yapılmaz
+    """
+
+    @wraps(function)
+    async def wrap(request, *args, **kwargs):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return redirect('login')
+
+        try:
+            profile = await Profile.objects.aget(user=user)
+        except Profile.DoesNotExist:
+            raise PermissionDenied
+        if profile.role != role:
+            raise PermissionDenied
+
+        # template'ler request.user'a eriştiğinde tekrar (senkron) sorgu atılmasın
+        request.user = user
+        return await function(request, *args, **kwargs)
+
+    return wrap
+
+
 def user_is_instructor(function):
 
     """
     kullanıcı instructor mu
     """
 
+    if iscoroutinefunction(function):
+        return _async_role_required(function, 'instructor')
+
     def wrap(request, *args, **kwargs):
         if not request.user.is_authenticated:
             # giriş yapmamışsa giriş sayfasına yönlendir
@@ -35,6 +67,9 @@ def user_is_student(function):
     giriş yapan kullanıcı student rolüne sahip mi
     """
 
+    if iscoroutinefunction(function):
+        return _async_role_required(function, 'student')
+
     def wrap(request, *args, **kwargs):
         if not request.user.is_authenticated:
             return redirect('login')
@@ -56,6 +91,9 @@ def user_is_department_head(function):
     """
     giriş yapan kullanıcı department_head rolüne sahip mi
     """
+    if iscoroutinefunction(function):
+        return _async_role_required(function, 'department_head')
+
     def wrap(request, *args, **kwargs):
         if not request.user.is_authenticated:
             return redirect('login')
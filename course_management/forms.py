@@ -1,4 +1,5 @@
 from django import forms
+from django.core.validators import FileExtensionValidator
 from .models import (
     EvaluationComponent,
     LearningOutcome,
@@ -166,6 +167,13 @@ class GradeUploadForm(forms.Form):
     file = forms.FileField(label="Excel Dosyası")
 
 
+class GradeCSVUploadForm(forms.Form):
+    file = forms.FileField(
+        label="CSV Dosyası",
+        validators=[FileExtensionValidator(allowed_extensions=["csv", "txt"])],
+    )
+
+
 class InstructorCourseEditForm(forms.Form):
     """
     Bölüm başkanının, bir hocanın verdiği dersleri
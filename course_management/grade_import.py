@@ -0,0 +1,394 @@
+"""
+Toplu not içe aktarma (Excel/CSV).
+
+Satırlar doğrulanıp Grade nesnelerine çevrilir; hatalı satırlar her biri için ayrı bir flash mesajı
+üretmek yerine tek bir listede toplanır ve GradeImport kaydına bir kez yazılır. Kullanıcıya sadece
+özet sayı mesaj olarak gösterilir, ayrıntılar CSV olarak indirilir.
+
+Geçerli notlar dersin mevcut notlarıyla bellekte karşılaştırılır (diff_grades); sadece yeni veya
+değişen notlar yazılır. Önizleme (dry-run) aynı değişiklik listesini GradeImport.changes'e kaydeder,
+onay (apply_preview) dosyayı tekrar okumadan bu listeyi uygular.
+"""
+import codecs
+import csv
+import io
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from .bulk import UPSERT_BATCH_SIZE, upsert_grades
+from .models import Course, EvaluationComponent, Grade, GradeImport
+from .retry import retry_on_lock
+
+ERROR_COLUMNS = ("row", "username", "component", "error")
+# tamamen bozuk çok büyük bir dosya raporu şişirmesin; hata sayısı yine de eksiksiz tutulur
+MAX_STORED_ERRORS = 10000
+# uzun formatı belirleyen sütunlar; geniş formatta bilgi amaçlı sütunlar bileşen sanılmaz
+LONG_FORMAT_COLUMNS = {"component_name", "score"}
+WIDE_FORMAT_INFO_COLUMNS = {"first_name", "last_name", "student_number", "email"}
+# öğrenciler bu kadar satırlık partiler halinde çözülür (upsert partileriyle aynı boyut)
+LOOKUP_BATCH_SIZE = UPSERT_BATCH_SIZE
+# CSV kodlama/ayraç algılaması için okunan baş kısım ve denenen ayraçlar
+CSV_SNIFF_BYTES = 64 * 1024
+CSV_DELIMITERS = ",;\t|"
+# Grade.score iki ondalıklı saklanır; karşılaştırma aynı hassasiyetle yapılır
+SCORE_PLACES = Decimal("0.01")
+# not formu ve autosave ile aynı aralık
+MIN_SCORE, MAX_SCORE = Decimal("0"), Decimal("100")
+# onayda henüz not satırı olmayan hücreler için (None, notu boş bir satırdan ayırmak için)
+_MISSING = object()
+
+
+def _blank(value):
+    # None (Excel) veya boş metin (CSV); NaN kendisine eşit değildir
+    return value is None or value != value or str(value).strip() == ""
+
+
+def _error(row, username, component, message):
+    return {"row": row, "username": username, "component": component, "error": message}
+
+
+def parse_grade_table(header, rows, course):
+    """
+    Not tablosunu doğrular; format başlık satırından algılanır:
+
+    * uzun format: username / component_name / score, her satır bir not
+    * geniş format: username + her değerlendirme bileşeni için bir sütun, her satır bir öğrenci
+
+    rows herhangi bir satır iterable'ı olabilir (spreadsheets.read_excel_rows veya csv.reader); baştan sona
+    bir kez okunur, öğrenciler LOOKUP_BATCH_SIZE satırlık partiler halinde tek sorguda çözülür.
+
+    (grades, errors, row_count) döner: grades kaydedilmeye hazır Grade nesneleri, errors ERROR_COLUMNS
+    alanlı sözlükler. Satır numaraları Excel'deki gibidir (başlık 1. satır).
+    """
+    header = ["" if _blank(name) else str(name).strip() for name in header]
+    components_by_name = {c.name: c for c in EvaluationComponent.objects.filter(course=course)}
+    counter = _RowCounter(rows)
+
+    if LONG_FORMAT_COLUMNS.issubset(header):
+        grades, errors = _parse_long(header, counter, course, components_by_name)
+    else:
+        grades, errors = _parse_wide(header, counter, course, components_by_name)
+    return grades, errors, counter.count
+
+
+class _RowCounter:
+    """Satırları akıtırken sayar; CSV'de toplam satır sayısı önceden bilinmez."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.count = 0
+
+    def __iter__(self):
+        for row in self.rows:
+            self.count += 1
+            yield row
+
+
+def _batches(rows):
+    numbered = enumerate(rows, start=2)
+    while batch := list(islice(numbered, LOOKUP_BATCH_SIZE)):
+        yield batch
+
+
+def _cell(row, position):
+    # CSV satırları başlıktan kısa olabilir
+    if position is None or position >= len(row):
+        return None
+    return row[position]
+
+
+def _users_for(batch, username_at, course):
+    """
+    Partideki kullanıcı adlarını tek sorguda çözer. Not formu gibi sadece derse kayıtlı öğrencilere
+    not yazılabilir; kayıtlı olmayan kullanıcılar (hoca dahil) enrolled=False ile döner.
+    """
+    usernames = {str(_cell(row, username_at)).strip() for _, row in batch if not _blank(_cell(row, username_at))}
+    enrollment = Course.students.through.objects.filter(course=course, user=OuterRef("pk"))
+    return {
+        u.username: u
+        for u in User.objects.filter(username__in=usernames).annotate(enrolled=Exists(enrollment))
+    }
+
+
+def _student_error(student):
+    if student is None:
+        return "Öğrenci sistemde bulunamadı"
+    if not student.enrolled:
+        return "Öğrenci bu derse kayıtlı değil"
+    return None
+
+
+def _parse_long(header, rows, course, components_by_name):
+    username_at = header.index("username") if "username" in header else None
+    component_at, score_at = header.index("component_name"), header.index("score")
+
+    grades, errors = [], []
+    for batch in _batches(rows):
+        users_by_username = _users_for(batch, username_at, course)
+        for row_number, row in batch:
+            username, component_name = _cell(row, username_at), _cell(row, component_at)
+            raw_score = _cell(row, score_at)
+            if _blank(username) or _blank(component_name) or _blank(raw_score):
+                errors.append(_error(
+                    row_number,
+                    "" if _blank(username) else str(username).strip(),
+                    "" if _blank(component_name) else str(component_name).strip(),
+                    "Eksik veri (username, component_name veya score boş)",
+                ))
+                continue
+
+            username, component_name = str(username).strip(), str(component_name).strip()
+
+            student = users_by_username.get(username)
+            if message := _student_error(student):
+                errors.append(_error(row_number, username, component_name, message))
+                continue
+
+            # sadece bu dersin bileşenleri
+            component = components_by_name.get(component_name)
+            if component is None:
+                errors.append(_error(row_number, username, component_name,
+                                     f"'{component_name}' adında değerlendirme bileşeni yok"))
+                continue
+
+            try:
+                score = _to_score(raw_score)
+            except ValueError as e:
+                errors.append(_error(row_number, username, component_name, str(e)))
+                continue
+
+            grades.append(Grade(student=student, component=component, score=score))
+    return grades, errors
+
+
+def _parse_wide(header, rows, course, components_by_name):
+    """
+    Başlık satırı bileşenlerle bir kez eşleştirilir; eşleşmeyen her sütun için (satır başına değil)
+    tek bir hata yazılır. Boş hücre o bileşenin notunun henüz girilmediği anlamına gelir, hata değildir.
+    """
+    if "username" not in header:
+        return [], [_error(1, "", "", "username sütunu yok")]
+    username_at = header.index("username")
+
+    columns, errors = [], []
+    for position, name in enumerate(header):
+        # başlıksız sütunlar (ör. CSV satır sonundaki fazladan ayraç) sessizce atlanır
+        if position == username_at or not name or name in WIDE_FORMAT_INFO_COLUMNS:
+            continue
+        component = components_by_name.get(name)
+        if component is None:
+            errors.append(_error(1, "", name, f"'{name}' adında değerlendirme bileşeni yok; sütun atlandı"))
+            continue
+        columns.append((component, position))
+
+    grades = []
+    for batch in _batches(rows):
+        users_by_username = _users_for(batch, username_at, course)
+        for row_number, row in batch:
+            username = _cell(row, username_at)
+            if _blank(username):
+                errors.append(_error(row_number, "", "", "Eksik veri (username boş)"))
+                continue
+            username = str(username).strip()
+
+            student = users_by_username.get(username)
+            if message := _student_error(student):
+                errors.append(_error(row_number, username, "", message))
+                continue
+
+            for component, position in columns:
+                value = _cell(row, position)
+                if _blank(value):
+                    continue
+                try:
+                    score = _to_score(value)
+                except ValueError as e:
+                    errors.append(_error(row_number, username, component.name, str(e)))
+                    continue
+                grades.append(Grade(student=student, component=component, score=score))
+    return grades, errors
+
+
+def _to_score(value):
+    """Hücreyi Decimal nota çevirir; sayısal değilse, sonlu değilse (NaN/inf) veya 0-100 dışındaysa ValueError."""
+    text = str(value).strip()
+    # Türkçe Excel CSV çıktısı ondalık ayracı olarak virgül kullanır (75,5)
+    if "," in text and "." not in text:
+        text = text.replace(",", ".")
+    try:
+        score = Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"Not sayısal değil: {value}")
+    # NaN ile karşılaştırma InvalidOperation atar; önce sonlu olup olmadığına bakılır
+    if not score.is_finite() or not (MIN_SCORE <= score <= MAX_SCORE):
+        raise ValueError(f"Not 0-100 arasında olmalıdır: {value}")
+    return score.quantize(SCORE_PLACES)
+
+
+def read_csv_table(uploaded_file):
+    """
+    Yüklenen CSV dosyasını pandas olmadan, csv modülüyle akış halinde okur.
+
+    Kodlama (UTF-8, BOM'lu UTF-8, Windows-1254) ve ayraç (, ; sekme |) dosyanın başından
+    algılanır. (header, rows) döner; rows dosyayı satır satır okuyan bir csv.reader'dır.
+    """
+    raw = uploaded_file.file
+    raw.seek(0)
+    sample = raw.read(CSV_SNIFF_BYTES)
+    raw.seek(0)
+
+    encoding = _sniff_encoding(sample)
+    # algılanan kodlamaya uymayan tek tük bayt satırı düşürmesin, o satır hata raporuna düşer
+    text = io.TextIOWrapper(raw, encoding=encoding, errors="replace", newline="")
+    try:
+        dialect = csv.Sniffer().sniff(sample.decode(encoding, errors="ignore"), delimiters=CSV_DELIMITERS)
+    except csv.Error:
+        # tek sütunlu veya ayracı belirsiz dosya
+        dialect = csv.excel
+    reader = csv.reader(text, dialect)
+    return next(reader, []), reader
+
+
+def _sniff_encoding(sample):
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        # örnek çok baytlı bir karakterin ortasında bitmiş olabilir
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "cp1254"
+
+
+def diff_grades(grades, course):
+    """
+    Notları dersin mevcut notlarıyla karşılaştırır; mevcut notlar tek sorguda okunur.
+
+    (changes, unchanged_count) döner. changes GradeImport.changes biçimindedir ve sadece yeni veya
+    değişen notları içerir. Aynı (öğrenci, bileşen) dosyada birden fazla geçerse sonuncusu geçerlidir.
+    """
+    current = {
+        (student_id, component_id): score
+        for student_id, component_id, score in Grade.objects.filter(component__course=course)
+        .values_list("student_id", "component_id", "score")
+    }
+    latest = {(grade.student_id, grade.component_id): grade for grade in grades}
+
+    changes, unchanged = [], 0
+    for key, grade in latest.items():
+        # notlar _to_score ile ayrıştırılırken sonlu ve 0-100 aralığında olduğu doğrulandı
+        new = grade.score
+        created = key not in current
+        old = current.get(key)
+        if not created and old == new:
+            unchanged += 1
+            continue
+        changes.append({
+            "student": grade.student_id,
+            "component": grade.component_id,
+            "username": grade.student.username,
+            "component_name": grade.component.name,
+            "created": created,
+            "old": None if old is None else str(old),
+            "new": str(new),
+        })
+    return changes, unchanged
+
+
+def changes_to_grades(changes):
+    return [
+        Grade(student_id=change["student"], component_id=change["component"], score=Decimal(change["new"]))
+        for change in changes
+    ]
+
+
+def save_import_report(course, user, file_name, source, total_rows, errors, changes, unchanged_count,
+                       status=GradeImport.STATUS_APPLIED):
+    """
+    İçe aktarmanın özetini ve hatalı satırlarını tek bir GradeImport kaydı olarak yazar.
+    Önizlemelerde değişiklik listesi de saklanır; uygulanmış yüklemelerde sadece sayılar tutulur.
+    """
+    created_count = sum(1 for change in changes if change["created"])
+    preview = status == GradeImport.STATUS_PREVIEW
+    return GradeImport.objects.create(
+        course=course,
+        uploaded_by=user,
+        file_name=file_name[:255],
+        source=source,
+        status=status,
+        total_rows=total_rows,
+        created_count=created_count,
+        updated_count=len(changes) - created_count,
+        unchanged_count=unchanged_count,
+        imported_count=0 if preview else len(changes),
+        error_count=len(errors),
+        errors=errors[:MAX_STORED_ERRORS],
+        changes=changes if preview else [],
+    )
+
+
+@retry_on_lock()
+@transaction.atomic
+def apply_preview(import_id):
+    """
+    Önizlemedeki değişiklikleri yazar ve kaydı uygulandı olarak işaretler. Önizlemeden sonra
+    değiştirilmiş notlar atlanır ve çakışma olarak hata raporuna eklenir.
+    Önizleme zaten uygulanmışsa (ör. onay butonuna iki kez basıldıysa) hiçbir şey yazmaz, None döner.
+    """
+    # durum koşullu UPDATE ile alınır: aynı önizlemeyi eşzamanlı iki onay iki kez uygulayamaz
+    if not GradeImport.objects.filter(id=import_id, status=GradeImport.STATUS_PREVIEW).update(
+        status=GradeImport.STATUS_APPLIED
+    ):
+        return None
+    grade_import = GradeImport.objects.get(id=import_id)
+    changes, conflicts = _still_applicable(grade_import)
+    grade_import.imported_count = upsert_grades(changes_to_grades(changes))
+    grade_import.conflict_count = len(conflicts)
+    grade_import.errors = (grade_import.errors + conflicts)[:MAX_STORED_ERRORS]
+    grade_import.changes = []
+    grade_import.save(update_fields=["imported_count", "conflict_count", "errors", "changes"])
+    return grade_import
+
+
+def _still_applicable(grade_import):
+    """
+    Önizlemeden sonra (autosave, not formu) değiştirilmiş notlar üzerine yazılmaz: her değişiklik
+    notun şu anki değeri önizlemedeki eski değerle aynıysa uygulanır. Güncel notlar tek sorguda okunur.
+    (uygulanacak değişiklikler, çakışmalar) döner; çakışmalar ERROR_COLUMNS biçimindedir.
+    """
+    current = {
+        (student_id, component_id): score
+        for student_id, component_id, score in Grade.objects.filter(component__course_id=grade_import.course_id)
+        .values_list("student_id", "component_id", "score")
+    }
+
+    changes, conflicts = [], []
+    for change in grade_import.changes:
+        key = (change["student"], change["component"])
+        now = current.get(key, _MISSING)
+        before = _MISSING if change["created"] else _decimal_or_none(change["old"])
+        if now == before:
+            changes.append(change)
+        elif now != Decimal(change["new"]):
+            # aynı değere getirilmişse çakışma değil, yazılacak bir şey de yok
+            conflicts.append(_error(
+                "", change["username"], change["component_name"],
+                f"Önizlemeden sonra başka biri tarafından değiştirildi (şu anki not: "
+                f"{'-' if now in (None, _MISSING) else now}); üzerine yazılmadı",
+            ))
+    return changes, conflicts
+
+
+def _decimal_or_none(value):
+    return None if value is None else Decimal(value)
+
+
+def write_errors_csv(grade_import, stream):
+    """Hatalı satırları CSV olarak stream'e yazar."""
+    writer = csv.DictWriter(stream, fieldnames=ERROR_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(grade_import.errors)
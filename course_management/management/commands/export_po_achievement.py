@@ -0,0 +1,34 @@
+import csv
+
+from django.core.management.base import BaseCommand
+
+from course_management.reporting import po_achievement_data, reporting_db
+
+
+class Command(BaseCommand):
+    help = 'Program çıktısı başarı raporunu CSV olarak dışa aktarır (rapor veritabanından okunur).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='', help='CSV dosyası (varsayılan: standart çıktı)')
+        parser.add_argument('--database', default='', help='Okunacak alias (varsayılan: reporting, yoksa default)')
+
+    def handle(self, *args, **options):
+        using = options['database'] or reporting_db()
+        rows = po_achievement_data(using)
+
+        output = open(options['output'], 'w', newline='', encoding='utf-8') if options['output'] else self.stdout
+        try:
+            writer = csv.writer(output, lineterminator='\n')
+            writer.writerow(['code', 'description', 'average_score', 'min_score', 'max_score', 'student_count'])
+            for row in rows:
+                po = row['program_outcome']
+                writer.writerow([
+                    po.code, po.description, round(row['average_score'], 2),
+                    round(row['min_score'], 2), round(row['max_score'], 2), row['student_count'],
+                ])
+        finally:
+            if output is not self.stdout:
+                output.close()
+
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(f'{len(rows)} program çıktısı yazıldı: {options["output"]} ({using})'))
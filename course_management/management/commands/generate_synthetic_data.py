@@ -0,0 +1,244 @@
+import random
+import re
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+
+from course_management.models import (
+    Course, EvaluationComponent, Grade, LearningOutcome, LearningOutcomeProgramOutcomeWeight,
+    OutcomeWeight, Profile, ProgramOutcome,
+)
+from course_management.stats import refresh_on_commit
+
+
+class Command(BaseCommand):
+    help = (
+        'Yük testi için sentetik veri üretir: öğrenci, hoca, ders, bileşen, LO, PO, ağırlık ve notlar. '
+        'Tüm kayıtlar bulk insert ile yazılır; aynı --seed aynı veri setini üretir.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=1000, help='Öğrenci sayısı')
+        parser.add_argument('--instructors', type=int, default=20, help='Öğretim görevlisi sayısı')
+        parser.add_argument('--courses', type=int, default=50, help='Ders sayısı')
+        parser.add_argument('--components', type=int, default=4, help='Ders başına değerlendirme bileşeni')
+        parser.add_argument('--outcomes', type=int, default=5, help='Ders başına learning outcome')
+        parser.add_argument('--program-outcomes', type=int, default=10, help='Program outcome sayısı')
+        parser.add_argument('--courses-per-student', type=int, default=6, help='Öğrenci başına kayıtlı ders')
+        parser.add_argument('--sparsity', type=float, default=0.1,
+                            help='Girilmemiş not oranı (0 = her hücre dolu, 1 = hiç not yok)')
+        parser.add_argument('--seed', type=int, default=42, help='Rastgele sayı üreteci tohumu')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Toplu yazım (bulk insert) parti boyutu')
+        parser.add_argument('--prefix', default='syn', help='Üretilen kullanıcı adı/kodlarının ön eki')
+        parser.add_argument('--password', default='synthetic123', help='Tüm sentetik kullanıcıların şifresi')
+        parser.add_argument('--clear', action='store_true', help='Önce aynı ön ekli eski sentetik veriyi sil')
+
+    def handle(self, *args, **options):
+        if not 0 <= options['sparsity'] <= 1:
+            raise CommandError('--sparsity 0 ile 1 arasında olmalıdır.')
+        if options['courses'] < 1 or options['components'] < 1:
+            raise CommandError('En az bir ders ve bir bileşen gereklidir.')
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        prefix = options['prefix']
+        # ders ve PO kodları max 10 karakter
+        self.code_prefix = prefix[:4].upper()
+        self.po_prefix = self.code_prefix[:3]
+        # sadece bu komutun ürettiği kodlar/kullanıcı adları (ör. SYN00003, SYN-PO2, syn_student_12);
+        # aynı ön ekle başlayan gerçek kayıtlar (ör. --prefix cse için CSE311) asla seçilmez
+        self.synthetic_users = Q(username__regex=rf'^{re.escape(prefix)}_(student_[0-9]+|instructor_[0-9]+|head)$')
+        self.synthetic_courses = Q(course_code__regex=rf'^{re.escape(self.code_prefix)}[0-9]{{5}}$')
+        self.synthetic_pos = Q(code__regex=rf'^{re.escape(self.po_prefix)}-PO[0-9]+$')
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            self._check_prefix()
+            if options['clear']:
+                self._clear()
+            elif User.objects.filter(self.synthetic_users).exists():
+                raise CommandError(f'"{prefix}_" ön ekli kullanıcılar zaten var. --clear veya başka bir --prefix kullanın.')
+
+            counts = self._generate(prefix, options)
+            # toplu yazmalar signal göndermez; panel sayaçları commit'te yeniden hesaplanır
+            refresh_on_commit()
+
+        elapsed = time.perf_counter() - started
+        summary = ', '.join(f'{count} {name}' for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f'Sentetik veri {elapsed:.1f} sn içinde oluşturuldu: {summary}'))
+
+    def _check_prefix(self):
+        """Ön ek sentetik olmayan bir ders veya PO koduyla çakışıyorsa hiçbir şey yazmadan durur."""
+        real_course = (
+            Course.objects.filter(course_code__startswith=self.code_prefix).exclude(self.synthetic_courses)
+            .values_list('course_code', flat=True).first()
+        )
+        if real_course:
+            raise CommandError(f'"{real_course}" dersi "{self.code_prefix}" ön ekiyle çakışıyor. Başka bir --prefix kullanın.')
+        real_po = (
+            ProgramOutcome.objects.filter(code__startswith=f'{self.po_prefix}-').exclude(self.synthetic_pos)
+            .values_list('code', flat=True).first()
+        )
+        if real_po:
+            raise CommandError(f'"{real_po}" program çıktısı "{self.po_prefix}" ön ekiyle çakışıyor. Başka bir --prefix kullanın.')
+
+    def _clear(self):
+        # sadece üretilen kayıtlar silinir; notlar, kayıtlar ve ağırlıklar CASCADE ile gider
+        Course.objects.filter(self.synthetic_courses).delete()
+        ProgramOutcome.objects.filter(self.synthetic_pos).delete()
+        User.objects.filter(self.synthetic_users).delete()
+
+    def _bulk(self, model, objs):
+        model.objects.bulk_create(objs, batch_size=self.batch_size)
+
+    def _insert_rows(self, model, fields, rows):
+        """
+        Çok satırlı tablolar (kayıtlar, notlar) için model nesnesi oluşturmadan executemany ile yazar.
+        bulk_create'in nesne başına SQL derleme maliyeti milyonlarca satırda dakikalar tutuyor.
+        """
+        quote = connection.ops.quote_name
+        columns = [model._meta.get_field(name).column for name in fields]
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            quote(model._meta.db_table),
+            ', '.join(quote(column) for column in columns),
+            ', '.join(['%s'] * len(columns)),
+        )
+        written = 0
+        batch = []
+        with connection.cursor() as cursor:
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    cursor.executemany(sql, batch)
+                    written += len(batch)
+                    batch = []
+            if batch:
+                cursor.executemany(sql, batch)
+                written += len(batch)
+        return written
+
+    def _generate(self, prefix, options):
+        rng = self.rng
+        # şifre bir kez hash'lenir ve tüm kullanıcılarda kullanılır (kullanıcı başına PBKDF2 çok yavaş)
+        password = make_password(options['password'])
+
+        student_count, instructor_count = options['students'], options['instructors']
+        users = [
+            User(username=f'{prefix}_student_{i}', first_name=f'Öğrenci{i}', last_name=f'Sentetik{i % 997}',
+                 email=f'{prefix}_student_{i}@example.com', password=password)
+            for i in range(student_count)
+        ] + [
+            User(username=f'{prefix}_instructor_{i}', first_name=f'Hoca{i}', last_name='Sentetik', password=password)
+            for i in range(instructor_count)
+        ] + [
+            User(username=f'{prefix}_head', first_name='Bölüm', last_name='Başkanı', password=password)
+        ]
+        self._bulk(User, users)
+
+        user_ids = dict(User.objects.filter(self.synthetic_users).values_list('username', 'id'))
+        student_ids = [user_ids[f'{prefix}_student_{i}'] for i in range(student_count)]
+        instructor_ids = [user_ids[f'{prefix}_instructor_{i}'] for i in range(instructor_count)]
+
+        # bulk_create post_save sinyali göndermez, profiller de topluca oluşturulur
+        self._bulk(Profile, [Profile(user_id=uid, role='student') for uid in student_ids]
+                   + [Profile(user_id=uid, role='instructor') for uid in instructor_ids]
+                   + [Profile(user_id=user_ids[f'{prefix}_head'], role='department_head')])
+
+        self._bulk(Course, [
+            Course(course_code=f'{self.code_prefix}{i:05d}', course_name=f'Sentetik Ders {i}')
+            for i in range(options['courses'])
+        ])
+        course_ids = list(
+            Course.objects.filter(self.synthetic_courses).order_by('course_code').values_list('id', flat=True)
+        )
+
+        if instructor_ids:
+            self._bulk(Course.instructors.through, [
+                Course.instructors.through(course_id=course_id, user_id=instructor_ids[i % len(instructor_ids)])
+                for i, course_id in enumerate(course_ids)
+            ])
+
+        per_student = min(options['courses_per_student'], len(course_ids))
+        enrollments = [
+            (student_id, course_id)
+            for student_id in student_ids
+            for course_id in rng.sample(course_ids, per_student)
+        ]
+        self._insert_rows(Course.students.through, ['course', 'user'], (
+            (course_id, student_id) for student_id, course_id in enrollments
+        ))
+
+        component_count = options['components']
+        percentages = [100 // component_count] * component_count
+        percentages[-1] += 100 - sum(percentages)
+        self._bulk(EvaluationComponent, [
+            EvaluationComponent(course_id=course_id, name=f'Bileşen {j + 1}', percentage=percentages[j])
+            for course_id in course_ids
+            for j in range(component_count)
+        ])
+        self._bulk(LearningOutcome, [
+            LearningOutcome(course_id=course_id, description=f'Sentetik öğrenim çıktısı {j + 1}')
+            for course_id in course_ids
+            for j in range(options['outcomes'])
+        ])
+        self._bulk(ProgramOutcome, [
+            ProgramOutcome(code=f'{self.po_prefix}-PO{i + 1}', description=f'Sentetik program çıktısı {i + 1}')
+            for i in range(options['program_outcomes'])
+        ])
+
+        components_by_course, outcomes_by_course = {}, {}
+        for component_id, course_id in EvaluationComponent.objects.filter(course_id__in=course_ids).values_list('id', 'course_id'):
+            components_by_course.setdefault(course_id, []).append(component_id)
+        for outcome_id, course_id in LearningOutcome.objects.filter(course_id__in=course_ids).values_list('id', 'course_id'):
+            outcomes_by_course.setdefault(course_id, []).append(outcome_id)
+        program_outcome_ids = list(
+            ProgramOutcome.objects.filter(self.synthetic_pos).values_list('id', flat=True)
+        )
+
+        outcome_weights = []
+        for course_id in course_ids:
+            outcomes = outcomes_by_course.get(course_id, [])
+            for component_id in components_by_course[course_id]:
+                for outcome_id in rng.sample(outcomes, min(len(outcomes), rng.randint(1, 3))):
+                    outcome_weights.append(OutcomeWeight(component_id=component_id, outcome_id=outcome_id,
+                                                         weight=rng.randint(1, 5)))
+        self._bulk(OutcomeWeight, outcome_weights)
+
+        lo_po_weights = [
+            LearningOutcomeProgramOutcomeWeight(learning_outcome_id=outcome_id, program_outcome_id=po_id,
+                                                weight=rng.randint(1, 5))
+            for outcomes in outcomes_by_course.values()
+            for outcome_id in outcomes
+            for po_id in rng.sample(program_outcome_ids, min(len(program_outcome_ids), rng.randint(1, 3)))
+        ]
+        self._bulk(LearningOutcomeProgramOutcomeWeight, lo_po_weights)
+
+        # notlar bellekte tutulmadan parti parti yazılır
+        sparsity = options['sparsity']
+
+        def grade_rows():
+            for student_id, course_id in enrollments:
+                for component_id in components_by_course[course_id]:
+                    if rng.random() < sparsity:
+                        continue
+                    score = min(max(rng.gauss(70, 15), 0), 100)
+                    yield student_id, component_id, f'{score:.2f}', 0
+
+        grade_count = self._insert_rows(Grade, ['student', 'component', 'score', 'version'], grade_rows())
+
+        return {
+            'öğrenci': student_count,
+            'hoca': instructor_count,
+            'ders': len(course_ids),
+            'kayıt': len(enrollments),
+            'bileşen': len(course_ids) * component_count,
+            'LO': sum(len(o) for o in outcomes_by_course.values()),
+            'PO': len(program_outcome_ids),
+            'bileşen-LO ağırlığı': len(outcome_weights),
+            'LO-PO ağırlığı': len(lo_po_weights),
+            'not': grade_count,
+        }
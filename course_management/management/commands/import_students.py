@@ -1,7 +1,7 @@
 from django.contrib.auth.models import User
 from django.core.management.base import BaseCommand, CommandError
-import pandas as pd
 from django.db import IntegrityError
+from course_management import spreadsheets
 from course_management.models import Student
 
 
@@ -16,7 +16,7 @@ class Command(BaseCommand):
 
         try:
             self.stdout.write(self.style.NOTICE(f'"{file_path}" yolu okunuyor...'))
-            df = pd.read_excel(file_path)
+            df = spreadsheets.read_excel(file_path)
             kayit_sayisi = 0
 
             for index, row in df.iterrows():
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from course_management.stats import refresh_department_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Bölüm başkanı panelinin sayaç satırını (DepartmentStats) kaynak tablolardan yeniden hesaplar. '
+        'Signal göndermeyen toplu yazmalardan (raw SQL, bulk_create) sonra kullanın.'
+    )
+
+    def handle(self, *args, **options):
+        stats = refresh_department_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f'Bölüm istatistikleri güncellendi: {stats.course_count} ders, {stats.instructor_count} hoca, '
+            f'{stats.student_count} öğrenci, {stats.grade_count} not (doluluk %{stats.fill_ratio})'
+        ))
@@ -0,0 +1,35 @@
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from course_management.reporting import take_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        'Ana SQLite veritabanının SQLite online backup API ile tutarlı bir kopyasını alır. '
+        'REPORTING_DATABASE=snapshot iken raporlar bu kopyadan okunur.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='', help='Kopya dosyası (varsayılan: REPORTING_SNAPSHOT_PATH)')
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Verilirse kopya bu aralıkla (saniye) sürekli yenilenir')
+
+    def handle(self, *args, **options):
+        target = Path(options['output'] or settings.REPORTING_SNAPSHOT_PATH)
+
+        while True:
+            started = time.perf_counter()
+            try:
+                size = take_snapshot(target)
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            self.stdout.write(self.style.SUCCESS(
+                f'Rapor kopyası yazıldı: {target} ({size / 1024:.0f} KiB, {time.perf_counter() - started:.2f} sn)'
+            ))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,127 @@
+import json
+import logging
+import platform
+import subprocess
+from datetime import datetime, timezone
+from io import StringIO
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test.utils import override_settings
+
+from benchmarks.runner import compare, run_scenarios, run_session_scenarios
+from course_management.reporting import REPORTING_DB, reporting_db
+
+
+class Command(BaseCommand):
+    help = (
+        'Rol bazlı sıcak view\'ları farklı ölçeklerdeki sentetik veri üzerinde ölçer '
+        '(p50/p95 gecikme, sorgu sayısı, bellek tepe değeri) ve sonuçları JSON olarak yazar. '
+        'Ölçümler geçici bir test veritabanında yapılır; asıl veritabanına dokunulmaz.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='100,1000,5000',
+                            help='Virgülle ayrılmış öğrenci sayıları (örn: 100,1000,5000)')
+        parser.add_argument('--repeat', type=int, default=20, help='Her view için ölçüm tekrarı')
+        parser.add_argument('--warmup', type=int, default=2, help='Ölçüm öncesi ısınma isteği sayısı')
+        parser.add_argument('--views', default='', help='Sadece bu view\'ları ölç (virgülle ayrılmış)')
+        parser.add_argument('--seed', type=int, default=42, help='Sentetik veri tohumu')
+        parser.add_argument('--output', default='benchmarks/results/latest.json', help='JSON çıktı dosyası')
+        parser.add_argument('--compare', default='', help='Karşılaştırılacak önceki JSON sonuç dosyası')
+        parser.add_argument('--sessions', action='store_true',
+                            help='Öğrenci panelini her oturum stratejisiyle (db, cached_db, signed_cookies) ayrıca ölç')
+
+    def handle(self, *args, **options):
+        try:
+            scales = [int(s) for s in options['scales'].split(',') if s.strip()]
+        except ValueError:
+            raise CommandError('--scales virgülle ayrılmış sayılardan oluşmalıdır.')
+        only = {v.strip() for v in options['views'].split(',') if v.strip()}
+
+        # her ölçüm isteği için metrik log satırı basılmasın
+        logging.getLogger('course_management.metrics').setLevel(logging.WARNING)
+
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        # rapor veritabanı (snapshot/replica) tanımlıysa rapor view'ları da ölçüm veritabanını okusun
+        reporting = connections[REPORTING_DB] if reporting_db() == REPORTING_DB else None
+        if reporting:
+            reporting_settings = dict(reporting.settings_dict)
+            reporting.close()
+            reporting.settings_dict.update(connection.settings_dict)
+        try:
+            # DEBUG sorgu loglama maliyeti ölçümleri şişirmesin diye kapatılır
+            with override_settings(DEBUG=False, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                results, session_results = [], []
+                for scale in scales:
+                    self.stdout.write(self.style.NOTICE(f'{scale} öğrencilik veri seti hazırlanıyor...'))
+                    call_command(
+                        'generate_synthetic_data', students=scale, instructors=max(2, scale // 250),
+                        courses=max(5, scale // 100), seed=options['seed'], clear=True, stdout=StringIO(),
+                    )
+                    results.extend(run_scenarios(scale, options['repeat'], options['warmup'], only))
+                    if options['sessions']:
+                        session_results.extend(run_session_scenarios(scale, options['repeat'], options['warmup']))
+                vendor = connection.vendor
+        finally:
+            if reporting:
+                reporting.close()
+                reporting.settings_dict.clear()
+                reporting.settings_dict.update(reporting_settings)
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        report = {
+            'meta': {
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'git_commit': self._git_commit(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': vendor,
+                'repeat': options['repeat'],
+            },
+            'results': results,
+        }
+        if session_results:
+            report['sessions'] = session_results
+
+        output = Path(options['output'])
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+
+        for row in results:
+            self.stdout.write(
+                f"{row['scale']:>7} {row['view']:<24} p50={row['p50_ms']:>9.2f}ms p95={row['p95_ms']:>9.2f}ms "
+                f"sorgu={row['queries']:>4} bellek={row['peak_memory_kib']:>9.1f}KiB"
+            )
+        for row in session_results:
+            self.stdout.write(
+                f"{row['scale']:>7} oturum={row['session']:<15} p50={row['p50_ms']:>9.2f}ms "
+                f"sorgu={row['queries']:>4} kazanç={row['saved_queries']} sorgu / {row['saved_p50_ms']:.2f}ms"
+            )
+        self.stdout.write(self.style.SUCCESS(f'Sonuçlar yazıldı: {output}'))
+
+        if options['compare']:
+            baseline = json.loads(Path(options['compare']).read_text())
+            regressions = compare(baseline, report)
+            for item in regressions:
+                self.stdout.write(self.style.WARNING(
+                    f"Regresyon: {item['scale']} {item['view']} "
+                    f"p95 {item['before']['p95_ms']} -> {item['after']['p95_ms']} ms, "
+                    f"sorgu {item['before']['queries']} -> {item['after']['queries']}"
+                ))
+            if regressions:
+                raise CommandError(f'{len(regressions)} regresyon bulundu.')
+
+    def _git_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
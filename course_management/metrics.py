@@ -0,0 +1,259 @@
+"""
+Prometheus metin formatında sunulan uygulama metrikleri.
+
+Her worker süreci değerleri kendi belleğinde toplar ve en fazla saniyede bir METRICS_DIR altındaki
+`metrics_<pid>.json` dosyasına yazar. /metrics isteğinde tüm süreç dosyaları birleştirilir; böylece
+gunicorn gibi çok süreçli kurulumlarda da tek bir toplam görülür.
+
+Ölen süreçlerin dosyaları scrape sırasında `metrics_archive.json` dosyasına eklenip silinir: yeniden
+başlayan worker'lar dizini şişirmez ve toplamlar kaybolmaz. Aynı pid'i alan yeni bir süreç de ilk
+yazımdan önce eski dosyayı arşive ekler; aksi halde üzerine yazar ve sayaçlar geriye gider
+(Prometheus rate() bozulur). Ölü süreç tespiti pid ile yapıldığından METRICS_DIR sadece aynı
+makinedeki süreçler arasında paylaşılmalıdır.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: dizin kilidi yok, arşivleme tek süreçte yapılmış sayılır
+    fcntl = None
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+IMPORT_RATE_BUCKETS = (10, 50, 100, 500, 1000, 5000, 10000, 50000)
+
+# ad -> (tip, açıklama, histogram bucket'ları)
+METRICS = {
+    'http_requests_total': ('counter', 'URL adı, metot ve durum koduna göre istek sayısı', None),
+    'http_request_duration_seconds': ('histogram', 'URL adına göre istek süresi', LATENCY_BUCKETS),
+    'db_queries_per_request': ('histogram', 'URL adına göre istek başına SQL sorgu sayısı', QUERY_BUCKETS),
+    'db_query_duration_seconds_total': ('counter', 'URL adına göre toplam SQL süresi', None),
+    'grade_import_rows_total': ('counter', 'Dosyadan içe aktarılan not satırı sayısı', None),
+    'grade_import_duration_seconds_total': ('counter', 'Not içe aktarmada geçen toplam süre', None),
+    'grade_import_rows_per_second': ('histogram', 'İçe aktarma başına satır/saniye', IMPORT_RATE_BUCKETS),
+}
+
+FLUSH_INTERVAL = 1.0
+ARCHIVE_NAME = 'metrics_archive.json'
+
+logger = logging.getLogger(__name__)
+
+
+class _Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # aynı anda sadece bir thread dosyaya yazar
+        self._flush_lock = threading.Lock()
+        self._values = {}  # (ad, label tuple) -> sayı veya [bucket sayıları..., sum, count]
+        self._last_flush = 0.0
+        self._pid = os.getpid()
+        # bu süreç kendi pid dosyasına en az bir kez yazdı mı
+        self._claimed = False
+
+    def inc(self, name, labels=(), amount=1):
+        key = (name, tuple(sorted(labels)))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+        self._maybe_flush()
+
+    def observe(self, name, value, labels=()):
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels)))
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * (len(buckets) + 2)
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+        self._maybe_flush()
+
+    def _path(self):
+        return Path(settings.METRICS_DIR) / f'metrics_{os.getpid()}.json'
+
+    def _maybe_flush(self):
+        if time.monotonic() - self._last_flush < FLUSH_INTERVAL:
+            return
+        # başka bir thread zaten yazıyorsa istek beklemez; değerler bir sonraki yazımda dosyaya geçer
+        if not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            self._write()
+        finally:
+            self._flush_lock.release()
+
+    def flush(self):
+        with self._flush_lock:
+            self._write()
+
+    def _write(self):
+        # metrik dosyası yazılamasa bile (disk dolu, izin, silinen dizin) hata isteğe yansımaz
+        try:
+            self._write_file()
+        except OSError:
+            logger.warning('Metrik dosyası yazılamadı', exc_info=True)
+
+    def _write_file(self):
+        if os.getpid() != self._pid:
+            # fork sonrası ebeveynin değerleri çocuğa kopyalanmış olur, çift sayılmasın
+            with self._lock:
+                self._values.clear()
+                self._pid = os.getpid()
+                self._claimed = False
+        path = self._path()
+        if not self._claimed:
+            # dosya varsa aynı pid'i kullanmış ölü bir sürece aittir; toplamları arşive geçer
+            if path.exists():
+                _archive([path])
+            self._claimed = True
+        with self._lock:
+            payload = [[name, list(labels), value] for (name, labels), value in self._values.items()]
+            self._last_flush = time.monotonic()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # geçici dosya thread'e özel: yarım kalmış başka bir yazımın dosyasını ezmez
+        tmp = path.with_name(f'{path.stem}.{threading.get_ident()}.tmp')
+        tmp.write_text(json.dumps(payload))
+        os.replace(tmp, path)
+
+    def collect(self):
+        """Tüm süreç dosyalarını birleştirir: (ad, label tuple) -> değer."""
+        self.flush()
+        directory = Path(settings.METRICS_DIR)
+        dead = [path for path in directory.glob('metrics_*.json') if _is_dead(path)]
+        if dead:
+            try:
+                _archive(dead)
+            except OSError:
+                logger.warning('Ölü süreç metrikleri arşivlenemedi', exc_info=True)
+        merged = {}
+        for path in directory.glob('metrics_*.json'):
+            _merge(merged, _read(path))
+        return merged
+
+
+def _read(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return []
+
+
+def _merge(merged, payload):
+    for name, labels, value in payload:
+        if name not in METRICS:
+            continue
+        key = (name, tuple(tuple(pair) for pair in labels))
+        if isinstance(value, list):
+            current = merged.setdefault(key, [0] * len(value))
+            merged[key] = [a + b for a, b in zip(current, value)]
+        else:
+            merged[key] = merged.get(key, 0) + value
+
+
+def _is_dead(path):
+    """metrics_<pid>.json dosyasının süreci artık çalışmıyor mu (arşiv dosyası hiçbir zaman)."""
+    pid = path.stem[len('metrics_'):]
+    if not pid.isdigit() or int(pid) == os.getpid():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        # süreç var ama başka kullanıcıya ait
+        return False
+    return False
+
+
+@contextmanager
+def _directory_lock(directory):
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / 'metrics.lock', 'a') as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        yield
+
+
+def _archive(paths):
+    """Süreç dosyalarını arşiv dosyasına ekleyip siler; aynı dosya iki kez eklenmesin diye kilit altında."""
+    directory = Path(settings.METRICS_DIR)
+    with _directory_lock(directory):
+        # kilidi beklerken başka bir scrape aynı dosyaları arşivlemiş olabilir
+        paths = [path for path in paths if path.exists()]
+        if not paths:
+            return
+        archive = directory / ARCHIVE_NAME
+        merged = {}
+        _merge(merged, _read(archive))
+        for path in paths:
+            _merge(merged, _read(path))
+        payload = [[name, [list(pair) for pair in labels], value] for (name, labels), value in merged.items()]
+        tmp = archive.with_name(f'{archive.stem}.{os.getpid()}.tmp')
+        tmp.write_text(json.dumps(payload))
+        os.replace(tmp, archive)
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+
+registry = _Registry()
+atexit.register(lambda: registry.flush() if registry._values else None)
+
+
+def record_request(view_name, method, status, duration, queries, sql_time):
+    view = view_name or 'unmatched'
+    registry.inc('http_requests_total', (('view', view), ('method', method), ('status', str(status))))
+    registry.observe('http_request_duration_seconds', duration, (('view', view),))
+    registry.observe('db_queries_per_request', queries, (('view', view),))
+    registry.inc('db_query_duration_seconds_total', (('view', view),), sql_time)
+
+
+def record_grade_import(rows, duration, source):
+    labels = (('source', source),)
+    registry.inc('grade_import_rows_total', labels, rows)
+    registry.inc('grade_import_duration_seconds_total', labels, duration)
+    if duration > 0:
+        registry.observe('grade_import_rows_per_second', rows / duration, labels)
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in pairs
+    )
+    return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+
+def render_prometheus():
+    merged = registry.collect()
+    by_name = {}
+    for (name, labels), value in merged.items():
+        by_name.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in sorted(by_name.get(name, [])):
+            if kind == 'histogram':
+                for bound, count in zip(buckets, value):
+                    lines.append(f'{name}_bucket{_format_labels(labels, [("le", bound)])} {count}')
+                lines.append(f'{name}_bucket{_format_labels(labels, [("le", "+Inf")])} {value[-1]}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {value[-2]}')
+                lines.append(f'{name}_count{_format_labels(labels)} {value[-1]}')
+            else:
+                lines.append(f'{name}{_format_labels(labels)} {value}')
+    return '\n'.join(lines) + '\n'
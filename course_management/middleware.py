@@ -0,0 +1,277 @@
+import contextvars
+import cProfile
+import io
+import json
+import logging
+import pstats
+import re
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.utils.html import escape
+from django.template.backends.django import Template
+
+from . import metrics as app_metrics
+from .slow_queries import current_view
+
+logger = logging.getLogger('course_management.metrics')
+
+# o anki isteğin ölçüm nesnesi; template render süresi bu değişken üzerinden isteğe yazılır
+_current_metrics = contextvars.ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    __slots__ = ('queries', 'sql_time', 'template_time', 'view_time', 'total_time', '_render_depth')
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.view_time = 0.0
+        self.total_time = 0.0
+        self._render_depth = 0
+
+    def as_dict(self):
+        return {
+            'queries': self.queries,
+            'sql_ms': round(self.sql_time * 1000, 2),
+            'template_ms': round(self.template_time * 1000, 2),
+            'view_ms': round(self.view_time * 1000, 2),
+            'total_ms': round(self.total_time * 1000, 2),
+        }
+
+    def server_timing(self):
+        return ', '.join([
+            f'db;desc="{self.queries} queries";dur={self.sql_time * 1000:.2f}',
+            f'tpl;dur={self.template_time * 1000:.2f}',
+            f'view;dur={self.view_time * 1000:.2f}',
+            f'total;dur={self.total_time * 1000:.2f}',
+        ])
+
+
+def _patch_template_render():
+    """
+    Django template backend'inin render metodunu bir kez sarar.
+    Ölçüm sadece aktif bir istek varken yapılır; iç içe render'lar (partial'lar) iki kez sayılmaz.
+    """
+    if getattr(Template.render, '_metrics_patched', False):
+        return
+    original_render = Template.render
+
+    def render(self, context=None, request=None):
+        metrics = _current_metrics.get()
+        if metrics is None:
+            return original_render(self, context, request)
+        metrics._render_depth += 1
+        started = time.perf_counter()
+        try:
+            return original_render(self, context, request)
+        finally:
+            metrics._render_depth -= 1
+            if metrics._render_depth == 0:
+                metrics.template_time += time.perf_counter() - started
+
+    render._metrics_patched = True
+    Template.render = render
+
+
+def record_query(execute, sql, params, many, context):
+    """Aktif bir istek varsa sorguyu o isteğin sayacına yazar."""
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.sql_time += time.perf_counter() - started
+
+
+def install_request_metrics(sender, connection, **kwargs):
+    """
+    connection_created sinyali: her yeni bağlantıya sorgu sayacı eklenir.
+    İstek, contextvar üzerinden bulunur; async view'larda ORM sorguları başka bir thread'de
+    (sync_to_async) çalışsa da contextvar oraya kopyalandığı için doğru isteğe yazılır.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class RequestMetricsMiddleware:
+    """
+    İstek başına sorgu sayısı, toplam SQL süresi, template render süresi ve view süresini ölçer.
+    Sonuçlar `Server-Timing` header'ı ve `course_management.metrics` logger'ına tek satır JSON olarak yazılır,
+    ayrıca `request.metrics` üzerinden okunabilir. View süresinin doğru ölçülmesi için MIDDLEWARE listesinin
+    sonuna eklenmelidir.
+
+    Sorgular DEBUG'dan bağımsız olarak execute_wrapper ile sayılır (install_request_metrics); sorgu metni
+    saklanmadığı için yük altında açık bırakılabilir. Hem WSGI hem ASGI zincirinde çalışır.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        _patch_template_render()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics, tokens, started = self._start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            self._reset(tokens)
+        return self._finish(request, response, metrics, started)
+
+    async def __acall__(self, request):
+        metrics, tokens, started = self._start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            self._reset(tokens)
+        return self._finish(request, response, metrics, started)
+
+    def _start(self, request):
+        metrics = RequestMetrics()
+        request.metrics = metrics
+        tokens = (_current_metrics.set(metrics), current_view.set(None))
+        return metrics, tokens, time.perf_counter()
+
+    def _reset(self, tokens):
+        _current_metrics.reset(tokens[0])
+        current_view.reset(tokens[1])
+
+    def _finish(self, request, response, metrics, started):
+        finished = time.perf_counter()
+        metrics.total_time = finished - started
+        # MIDDLEWARE listesinin sonunda olduğundan process_view ile yanıt arası sadece view'ı (ve render'ı) kapsar
+        view_started = getattr(request, '_metrics_view_started', None)
+        if view_started is not None:
+            metrics.view_time = finished - view_started
+
+        response['Server-Timing'] = metrics.server_timing()
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else None
+        try:
+            app_metrics.record_request(
+                view_name, request.method, response.status_code, metrics.total_time, metrics.queries, metrics.sql_time,
+            )
+        except Exception:
+            # metrik toplanamaması kullanıcının isteğini bozmamalı
+            logger.exception('İstek metriği kaydedilemedi')
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'view': view_name,
+                'status': response.status_code,
+                **metrics.as_dict(),
+            }))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics_view_started = time.perf_counter()
+        # yavaş sorgu loglarında sorguyu tetikleyen view görünsün
+        match = request.resolver_match
+        current_view.set(match.view_name if match else view_func.__qualname__)
+
+
+class ProfilingMiddleware:
+    """
+    Süper kullanıcılar `?profile=1` parametresi veya `X-Profile: 1` header'ı ile isteği cProfile altında çalıştırır.
+    Sonuç PROFILING_DIR altına `.prof` (snakeviz/pstats ile açılır) ve özet `.html` olarak yazılır;
+    dizinde en fazla PROFILING_MAX_FILES profil tutulur, eskileri silinir.
+    AuthenticationMiddleware'den sonra eklenmelidir.
+
+    ASGI'de profil sadece event loop thread'ini kapsar; sync_to_async ile başka thread'de çalışan
+    ORM sorguları ve template render'ı profilde beklenen süre olarak görünür.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _flagged(self, request):
+        return request.GET.get('profile') == '1' or request.headers.get('X-Profile') == '1'
+
+    def _requested(self, request):
+        if not self._flagged(request):
+            return False
+        user = getattr(request, 'user', None)
+        return bool(user and user.is_superuser)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._requested(request):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        name = self._save(request, profiler, elapsed_ms)
+        response['X-Profile-Id'] = name
+        return response
+
+    async def __acall__(self, request):
+        # kullanıcı sadece bayrak varsa yüklenir; normal isteklere ek sorgu binmez
+        if not self._flagged(request) or not (await request.auser()).is_superuser:
+            return await self.get_response(request)
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = await self.get_response(request)
+        finally:
+            profiler.disable()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        name = await sync_to_async(self._save)(request, profiler, elapsed_ms)
+        response['X-Profile-Id'] = name
+        return response
+
+    def _save(self, request, profiler, elapsed_ms):
+        directory = Path(settings.PROFILING_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', request.path).strip('-')[:60] or 'root'
+        name = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}_{slug}_{uuid.uuid4().hex[:6]}"
+        profiler.dump_stats(directory / f'{name}.prof')
+
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(60)
+        (directory / f'{name}.html').write_text(
+            '<!doctype html><meta charset="utf-8">'
+            f'<title>{escape(request.path)}</title>'
+            f'<h1>{escape(request.method)} {escape(request.get_full_path())}</h1>'
+            f'<p>Toplam süre: {elapsed_ms:.1f} ms &middot; Kullanıcı: {escape(request.user.get_username())}</p>'
+            f'<pre>{escape(stream.getvalue())}</pre>',
+            encoding='utf-8',
+        )
+
+        self._prune(directory)
+        return name
+
+    def _prune(self, directory):
+        profiles = sorted(directory.glob('*.prof'), key=lambda p: p.stat().st_mtime, reverse=True)
+        for old in profiles[settings.PROFILING_MAX_FILES:]:
+            old.unlink(missing_ok=True)
+            old.with_suffix('.html').unlink(missing_ok=True)
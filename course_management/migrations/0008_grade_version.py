@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_management', '0007_learningoutcomeprogramoutcomeweight'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='grade',
+            name='version',
+            field=models.PositiveIntegerField(default=0, verbose_name='Sürüm'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_management', '0008_grade_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DepartmentStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_count', models.PositiveIntegerField(default=0, verbose_name='Ders Sayısı')),
+                ('instructor_count', models.PositiveIntegerField(default=0, verbose_name='Öğretim Görevlisi Sayısı')),
+                ('student_count', models.PositiveIntegerField(default=0, verbose_name='Öğrenci Sayısı')),
+                ('courses_without_components', models.PositiveIntegerField(default=0, verbose_name='Bileşensiz Ders Sayısı')),
+                ('grade_count', models.PositiveIntegerField(default=0, verbose_name='Girilmiş Not Sayısı')),
+                ('expected_grade_count', models.PositiveIntegerField(default=0, verbose_name='Beklenen Not Sayısı')),
+                ('filled_grade_count', models.PositiveIntegerField(default=0, verbose_name='Doldurulmuş Not Sayısı')),
+                ('stale', models.BooleanField(default=True, verbose_name='Eskimiş')),
+                ('updated_at', models.DateTimeField(blank=True, null=True, verbose_name='Güncellenme Zamanı')),
+            ],
+            options={
+                'verbose_name': 'Bölüm İstatistiği',
+                'verbose_name_plural': 'Bölüm İstatistikleri',
+            },
+        ),
+    ]
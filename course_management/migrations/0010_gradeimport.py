@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_management', '0009_departmentstats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GradeImport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_name', models.CharField(blank=True, max_length=255, verbose_name='Dosya Adı')),
+                ('source', models.CharField(default='excel', max_length=20, verbose_name='Kaynak')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Yüklenme Zamanı')),
+                ('total_rows', models.PositiveIntegerField(default=0, verbose_name='Toplam Satır')),
+                ('imported_count', models.PositiveIntegerField(default=0, verbose_name='İşlenen Not')),
+                ('error_count', models.PositiveIntegerField(default=0, verbose_name='Hatalı Satır')),
+                ('errors', models.JSONField(blank=True, default=list, verbose_name='Hatalar')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='grade_imports', to='course_management.course', verbose_name='Ders')),
+                ('uploaded_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='grade_imports', to=settings.AUTH_USER_MODEL, verbose_name='Yükleyen')),
+            ],
+            options={
+                'verbose_name': 'Not Yüklemesi',
+                'verbose_name_plural': 'Not Yüklemeleri',
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_management', '0010_gradeimport'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gradeimport',
+            name='changes',
+            field=models.JSONField(blank=True, default=list, verbose_name='Bekleyen Değişiklikler'),
+        ),
+        migrations.AddField(
+            model_name='gradeimport',
+            name='created_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Yeni Not'),
+        ),
+        migrations.AddField(
+            model_name='gradeimport',
+            name='status',
+            field=models.CharField(choices=[('preview', 'Önizleme'), ('applied', 'Uygulandı')], default='applied', max_length=10, verbose_name='Durum'),
+        ),
+        migrations.AddField(
+            model_name='gradeimport',
+            name='unchanged_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Değişmeyen Not'),
+        ),
+        migrations.AddField(
+            model_name='gradeimport',
+            name='updated_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Güncellenen Not'),
+        ),
+    ]
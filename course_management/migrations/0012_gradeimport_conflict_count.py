@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_management', '0011_gradeimport_preview'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gradeimport',
+            name='conflict_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Çakışan Not'),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import ExpressionWrapper, F, FloatField, Sum
+from django.db.models.functions import Cast
 from django.contrib.auth.models import User     # <--  size zoomda bahsettiğim djangonun kendi
 from django.conf import settings                     # user modeli ama biz bu modeli genişleteceğiz
 
@@ -83,6 +85,29 @@ class LearningOutcome(models.Model):
         return f"{self.course.course_code} - Çıktı #{self.id}"
 
 
+class GradeQuerySet(models.QuerySet):
+
+    def lo_scores(self):
+        """
+        (öğrenci, learning outcome) başına ağırlıklı LO skorunu veritabanında hesaplar:
+            Σ(not · bileşen-LO ağırlığı) / Σ(bileşen-LO ağırlığı)
+        Not girilmemiş veya LO ile ilişkilendirilmemiş bileşenler hesaba katılmaz.
+        Tek bir GROUP BY sorgusudur; her satır student_id, outcome_id, weighted_sum,
+        total_weight ve lo_score (float) içerir. Filtreler (ders, öğrenci vb.) önce uygulanmalıdır.
+        """
+        weight = F("component__outcome_weights__weight")
+        return (
+            self.filter(score__isnull=False, component__outcome_weights__isnull=False)
+            .values("student_id", outcome_id=F("component__outcome_weights__outcome_id"))
+            .annotate(
+                weighted_sum=Sum(Cast("score", FloatField()) * weight, output_field=FloatField()),
+                total_weight=Sum(weight),
+            )
+            .annotate(lo_score=ExpressionWrapper(F("weighted_sum") / F("total_weight"), output_field=FloatField()))
+            .order_by()
+        )
+
+
 class Grade(models.Model):
     """öğrencinin bir sınav bileşeninden aldığı notu tut"""
     student = models.ForeignKey(
@@ -106,6 +131,10 @@ class Grade(models.Model):
         null=True,
         blank=True
     )
+    # her yazımda artan satır sürümü --> autosave eşzamanlı düzenlemeleri (optimistic concurrency) bununla yakalar
+    version = models.PositiveIntegerField(default=0, verbose_name="Sürüm")
+
+    objects = GradeQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Not"
@@ -116,6 +145,15 @@ class Grade(models.Model):
     def __str__(self):
         return f"{self.student.username} - {self.component.name}: {self.score}"
 
+    def save(self, *args, **kwargs):
+        # mevcut bir not güncelleniyorsa sürümü artır
+        if not self._state.adding:
+            self.version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "version" not in update_fields:
+                kwargs["update_fields"] = [*update_fields, "version"]
+        super().save(*args, **kwargs)
+
 
 class ProgramOutcome(models.Model):
     """bölüm program çıktısı"""
@@ -203,3 +241,82 @@ class LearningOutcomeProgramOutcomeWeight(models.Model):
 
     def __str__(self):
         return f"{self.learning_outcome} ⇄ {self.program_outcome} (Ağırlık: {self.weight})"
+
+
+class GradeImport(models.Model):
+    """
+    toplu not yüklemesinin özeti --> hatalı satırlar her biri ayrı flash mesajı olarak session'a değil,
+    bu kayda tek seferde yazılır ve CSV olarak indirilir
+    """
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="grade_imports", verbose_name="Ders")
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="grade_imports",
+        verbose_name="Yükleyen"
+    )
+    STATUS_PREVIEW = "preview"
+    STATUS_APPLIED = "applied"
+    STATUS_CHOICES = (
+        (STATUS_PREVIEW, "Önizleme"),
+        (STATUS_APPLIED, "Uygulandı"),
+    )
+
+    file_name = models.CharField(max_length=255, blank=True, verbose_name="Dosya Adı")
+    source = models.CharField(max_length=20, default="excel", verbose_name="Kaynak")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_APPLIED, verbose_name="Durum")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Yüklenme Zamanı")
+    total_rows = models.PositiveIntegerField(default=0, verbose_name="Toplam Satır")
+    created_count = models.PositiveIntegerField(default=0, verbose_name="Yeni Not")
+    updated_count = models.PositiveIntegerField(default=0, verbose_name="Güncellenen Not")
+    unchanged_count = models.PositiveIntegerField(default=0, verbose_name="Değişmeyen Not")
+    imported_count = models.PositiveIntegerField(default=0, verbose_name="İşlenen Not")
+    error_count = models.PositiveIntegerField(default=0, verbose_name="Hatalı Satır")
+    # önizlemeden sonra başka biri tarafından değiştirildiği için onayda üzerine yazılmayan notlar
+    conflict_count = models.PositiveIntegerField(default=0, verbose_name="Çakışan Not")
+    # [{"row": 5, "username": "...", "component": "...", "error": "..."}, ...]
+    errors = models.JSONField(default=list, blank=True, verbose_name="Hatalar")
+    # önizlemede yazılacak değişiklikler --> onayda dosya tekrar okunmadan bunlar uygulanır
+    # [{"student": 3, "component": 7, "username": "...", "component_name": "...", "old": "85.00", "new": "90.00"}, ...]
+    changes = models.JSONField(default=list, blank=True, verbose_name="Bekleyen Değişiklikler")
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        verbose_name = "Not Yüklemesi"
+        verbose_name_plural = "Not Yüklemeleri"
+
+    def __str__(self):
+        return f"{self.course.course_code} - {self.file_name} ({self.imported_count} not, {self.error_count} hata)"
+
+
+class DepartmentStats(models.Model):
+    """
+    bölüm başkanı panelindeki sayaçlar --> tek satır (pk=1), her istekte count/join yapmamak için
+    signal'lar ve course_management.stats tarafından güncel tutulur
+    """
+    course_count = models.PositiveIntegerField(default=0, verbose_name="Ders Sayısı")
+    instructor_count = models.PositiveIntegerField(default=0, verbose_name="Öğretim Görevlisi Sayısı")
+    student_count = models.PositiveIntegerField(default=0, verbose_name="Öğrenci Sayısı")
+    courses_without_components = models.PositiveIntegerField(default=0, verbose_name="Bileşensiz Ders Sayısı")
+    grade_count = models.PositiveIntegerField(default=0, verbose_name="Girilmiş Not Sayısı")
+    # kayıtlı öğrenci × bileşen: doldurulması beklenen not hücresi sayısı
+    expected_grade_count = models.PositiveIntegerField(default=0, verbose_name="Beklenen Not Sayısı")
+    filled_grade_count = models.PositiveIntegerField(default=0, verbose_name="Doldurulmuş Not Sayısı")
+    # not yazmaları satırı eskimiş olarak işaretler; yeniden hesaplama en fazla aralıklı yapılır (stats.py)
+    stale = models.BooleanField(default=True, verbose_name="Eskimiş")
+    updated_at = models.DateTimeField(null=True, blank=True, verbose_name="Güncellenme Zamanı")
+
+    class Meta:
+        verbose_name = "Bölüm İstatistiği"
+        verbose_name_plural = "Bölüm İstatistikleri"
+
+    def __str__(self):
+        return f"Bölüm istatistikleri ({self.updated_at:%Y-%m-%d %H:%M})" if self.updated_at else "Bölüm istatistikleri"
+
+    @property
+    def fill_ratio(self):
+        """doldurulmuş not hücrelerinin yüzdesi"""
+        if not self.expected_grade_count:
+            return 0
+        return round(100 * self.filled_grade_count / self.expected_grade_count, 1)
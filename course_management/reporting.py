@@ -0,0 +1,160 @@
+"""
+Ağır bölüm raporları için salt okunur 'reporting' veritabanı.
+
+Alias, ayarlara (REPORTING_DATABASE) göre ana SQLite veritabanının periyodik kopyasını
+(refresh_reporting_snapshot) veya bir PostgreSQL read replica'sını gösterir. Rapor view'ları ve
+dışa aktarma komutları okuyacakları veritabanını `.using(reporting_db())` ile açıkça seçer;
+böylece not yazmalarıyla aynı veritabanında yarışmazlar. Alias tanımlı değilse ana veritabanı kullanılır.
+"""
+import os
+import sqlite3
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import F, Sum
+
+REPORTING_DB = 'reporting'
+
+
+def reporting_db():
+    """Rapor sorgularının alias'ı: yapılandırılmışsa 'reporting', değilse ana veritabanı."""
+    return REPORTING_DB if REPORTING_DB in settings.DATABASES else DEFAULT_DB_ALIAS
+
+
+class ReportingRouter:
+    """
+    Okumalar normal akışında kalır (default, ya da nesne hangi veritabanından geldiyse o);
+    reporting'e sadece açıkça istenen sorgular gider. Yazmalar ve migrate hiçbir zaman
+    reporting'e yönlenmez, kopyadan okunmuş bir nesne kaydedilirse bile ana veritabanına yazılır.
+    """
+
+    def db_for_read(self, model, **hints):
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, REPORTING_DB}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPORTING_DB:
+            return False
+        return None
+
+
+def take_snapshot(target, using=DEFAULT_DB_ALIAS):
+    """
+    SQLite online backup API ile `using` veritabanının tutarlı bir kopyasını target'a yazar.
+
+    Kopya önce geçici dosyaya alınır ve os.replace ile yerine konur; açık rapor bağlantıları eski
+    dosyayı okumaya devam eder, yeni bağlantılar yeni kopyayı görür. WAL modunda kopyalama sırasında
+    ana veritabanına yazmalar bloklanmaz. Yazılan dosyanın boyutunu (bayt) döner.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        raise ValueError(f"'{using}' bir SQLite veritabanı değil; PostgreSQL için read replica kullanın.")
+
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + '.tmp')
+    tmp.unlink(missing_ok=True)
+
+    connection.ensure_connection()
+    destination = sqlite3.connect(tmp)
+    try:
+        connection.connection.backup(destination)
+        # kopya tek dosya olsun: WAL modu kopyalanırsa yanında -wal/-shm dosyaları oluşur
+        destination.execute('PRAGMA journal_mode=DELETE')
+    finally:
+        destination.close()
+    os.replace(tmp, target)
+    return target.stat().st_size
+
+
+def po_achievement_data(using=None):
+    """
+    Her program çıktısı için öğrenci PO skorlarının ortalama/min/max değerleri.
+
+    Bir öğrencinin LO skoru Σ(not · ağırlık) / Σ(ağırlık)'tır; payda LO'ya bağlı tüm bileşenleri
+    içerir, yani girilmemiş not 0 sayılır. Not toplamları (öğrenci, LO) başına veritabanında
+    hesaplanır ve satır satır okunur; Python tarafında sadece LO -> PO ağırlıklandırması yapılır.
+    """
+    from .models import Course, Grade, LearningOutcomeProgramOutcomeWeight, OutcomeWeight, ProgramOutcome
+
+    using = using or reporting_db()
+    all_program_outcomes = ProgramOutcome.objects.using(using).order_by("code")
+
+    lo_po_weights = {}
+    for learning_outcome_id, program_outcome_id, weight in (
+        LearningOutcomeProgramOutcomeWeight.objects.using(using)
+        .filter(weight__gt=0)
+        .values_list("learning_outcome_id", "program_outcome_id", "weight")
+    ):
+        lo_po_weights.setdefault(learning_outcome_id, []).append((program_outcome_id, weight))
+
+    # LO -> dersteki tüm bileşen ağırlıklarının toplamı (not girilmiş olsun olmasın)
+    lo_total_weights = {}
+    course_outcomes = {}
+    for outcome_id, course_id, total in (
+        OutcomeWeight.objects.using(using)
+        .filter(component__course=F("outcome__course"), weight__gt=0)
+        .values("outcome_id", "outcome__course_id")
+        .annotate(total=Sum("weight"))
+        .values_list("outcome_id", "outcome__course_id", "total")
+        .order_by()
+    ):
+        lo_total_weights[outcome_id] = total
+        if outcome_id in lo_po_weights:
+            course_outcomes.setdefault(course_id, []).append(outcome_id)
+
+    # (öğrenci, LO) -> girilmiş notların ağırlıklı toplamı
+    weighted_sums = {
+        (row["student_id"], row["outcome_id"]): row["weighted_sum"]
+        for row in (
+            Grade.objects.using(using)
+            .filter(
+                student__profile__role="student",
+                component__course__students=F("student"),  # sadece derse kayıtlı öğrencilerin notları
+            )
+            .lo_scores()
+            .iterator()
+        )
+        if row["outcome_id"] in lo_total_weights
+    }
+
+    # (öğrenci, PO) -> [ağırlıklı toplam, toplam ağırlık]; kayıtlı her öğrenci hiç notu olmasa da sayılır
+    student_po_totals = {}
+    enrollments = (
+        Course.students.through.objects.using(using)
+        .filter(user__profile__role="student")
+        .values_list("user_id", "course_id")
+        .iterator()
+    )
+    for student_id, course_id in enrollments:
+        for outcome_id in course_outcomes.get(course_id, ()):
+            lo_score = weighted_sums.get((student_id, outcome_id), 0.0) / lo_total_weights[outcome_id]
+            for program_outcome_id, weight in lo_po_weights[outcome_id]:
+                totals = student_po_totals.setdefault((student_id, program_outcome_id), [0.0, 0])
+                totals[0] += lo_score * weight
+                totals[1] += weight
+
+    po_scores = {}
+    for (_, program_outcome_id), (weighted_sum, total_weight) in student_po_totals.items():
+        po_scores.setdefault(program_outcome_id, []).append(weighted_sum / total_weight)
+
+    po_achievement_data = []
+    for po in all_program_outcomes:
+        student_po_scores = po_scores.get(po.id, [])
+        po_achievement_data.append({
+            "program_outcome": po,
+            "average_score": sum(student_po_scores) / len(student_po_scores) if student_po_scores else 0,
+            "min_score": min(student_po_scores) if student_po_scores else 0,
+            "max_score": max(student_po_scores) if student_po_scores else 0,
+            "student_count": len(student_po_scores),
+        })
+    return po_achievement_data
@@ -0,0 +1,53 @@
+import functools
+import logging
+import random
+import time
+
+from django.db import OperationalError, connection
+
+logger = logging.getLogger(__name__)
+
+# SQLite kilit zaman aşımları ve PostgreSQL'in kilitlenme (deadlock) sonucu iptal ettiği transaction'lar
+LOCK_ERRORS = ('database is locked', 'database table is locked', 'deadlock detected')
+
+# yazma kilidi yeniden denemelere rağmen alınamadığında kullanıcıya gösterilen mesaj
+DATABASE_BUSY_MESSAGE = 'Sistem şu anda yoğun olduğu için kayıt yapılamadı. Lütfen birkaç saniye sonra tekrar deneyin.'
+
+
+class DatabaseBusy(Exception):
+    """Yeniden denemelere rağmen yazma kilidi alınamadı."""
+
+
+def is_lock_error(exc):
+    return isinstance(exc, OperationalError) and any(text in str(exc) for text in LOCK_ERRORS)
+
+
+def retry_on_lock(attempts=5, base_delay=0.05, max_delay=1.0):
+    """
+    "database is locked" (SQLite) veya "deadlock detected" (PostgreSQL) hatasında fonksiyonu
+    üstel bekleme + jitter ile yeniden çalıştırır.
+    Fonksiyon kendi transaction.atomic bloğunu açmalıdır; böylece her deneme temiz bir transaction'dır.
+
+    Zaten bir transaction içinden çağrılırsa yeniden deneme yapılmaz (yarım kalan dış transaction
+    tekrar edilemez), hata olduğu gibi yukarı iletilir. Denemeler tükenirse DatabaseBusy fırlatılır.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if connection.in_atomic_block:
+                return func(*args, **kwargs)
+
+            for attempt in range(1, attempts + 1):
+                try:
+                    return func(*args, **kwargs)
+                except OperationalError as exc:
+                    if not is_lock_error(exc):
+                        raise
+                    if attempt == attempts:
+                        raise DatabaseBusy(str(exc)) from exc
+                    # full jitter: aynı anda kilitlenen worker'lar aynı anda tekrar denemesin
+                    delay = random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+                    logger.warning('%s: veritabanı kilitli, %d. deneme %.3f sn sonra', func.__qualname__, attempt + 1, delay)
+                    time.sleep(delay)
+        return wrapper
+    return decorator
@@ -0,0 +1,15 @@
+"""
+Async view'lar için yardımcılar.
+
+Template render'ı senkron çalışır ve template içinden tembel (lazy) ilişkilere erişilebilir;
+bu yüzden async view'lar render'ı event loop yerine sync_to_async ile thread'de yapar.
+"""
+from asgiref.sync import sync_to_async
+from django.shortcuts import render
+
+arender = sync_to_async(render)
+
+
+async def alist(queryset):
+    """QuerySet'i (prefetch'leri dahil) await ile listeye çevirir; asyncio.gather ile birlikte kullanılır."""
+    return [obj async for obj in queryset]
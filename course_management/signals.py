@@ -1,7 +1,8 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import Profile
+from .models import Course, EvaluationComponent, Grade, Profile
+from .stats import mark_stale_on_commit, refresh_on_commit
 
 
 @receiver(post_save, sender=User)
@@ -15,3 +16,48 @@ def create_or_update_user_profile(sender, instance, created, **kwargs):
         # bölüm başkanı veya hoca ise admin panelinden değiştir
         Profile.objects.create(user=instance, role='student')
     instance.profile.save()
+
+
+# =========================
+# BÖLÜM İSTATİSTİKLERİ
+# =========================
+@receiver(post_init, sender=Profile)
+def remember_profile_role(sender, instance, **kwargs):
+    # rol değişikliğini post_save'de yakalamak için yüklenen değer saklanır (ertelenmiş alana dokunmadan)
+    instance._loaded_role = instance.__dict__.get('role')
+
+
+@receiver(post_save, sender=Profile)
+def profile_role_changed(sender, instance, created, **kwargs):
+    if created or instance.role != instance._loaded_role:
+        refresh_on_commit()
+    instance._loaded_role = instance.role
+
+
+@receiver(post_delete, sender=Profile)
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=EvaluationComponent)
+def structure_deleted(sender, instance, **kwargs):
+    refresh_on_commit()
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=EvaluationComponent)
+def structure_created(sender, instance, created, **kwargs):
+    if created:
+        refresh_on_commit()
+
+
+@receiver(m2m_changed, sender=Course.students.through)
+def enrollment_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        refresh_on_commit()
+
+
+@receiver(post_save, sender=Grade)
+def grade_saved(sender, instance, **kwargs):
+    # not yazmaları sık: satır eskitilir, not sayımı commit'te en fazla DEPARTMENT_STATS_REFRESH_INTERVAL
+    # saniyede bir yapılır (panel okuması hiç saymaz)
+    # (post_delete bağlanmaz; Grade'lerin cascade ile hızlı silinmesini bozar, silmeleri zaten
+    # bileşen/ders/kullanıcı silme signal'ları kapsar)
+    mark_stale_on_commit()
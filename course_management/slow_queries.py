@@ -0,0 +1,83 @@
+import atexit
+import contextvars
+import logging
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+from django.conf import settings
+
+logger = logging.getLogger('course_management.slow_queries')
+
+# sorguyu tetikleyen view'ın adı; RequestMetricsMiddleware.process_view tarafından doldurulur
+current_view = contextvars.ContextVar('current_view', default=None)
+
+# EXPLAIN sorgusunun kendisi tekrar yakalanmasın diye
+_explaining = contextvars.ContextVar('explaining', default=False)
+
+_listener = None
+
+
+def _explain(connection, sql, params):
+    """Yavaş SELECT sorgusunun planını döner; plan alınamazsa None."""
+    prefix = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+    token = _explaining.set(True)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            return [' '.join(str(col) for col in row) for row in cursor.fetchall()]
+    except Exception:
+        return None
+    finally:
+        _explaining.reset(token)
+
+
+def slow_query_wrapper(execute, sql, params, many, context):
+    if _explaining.get():
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration_ms = (time.perf_counter() - started) * 1000
+
+    threshold = getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', None)
+    if threshold is not None and duration_ms >= threshold:
+        connection = context['connection']
+        plan = None
+        if not many and sql.lstrip()[:6].upper() == 'SELECT':
+            plan = _explain(connection, sql, params)
+        logger.warning(
+            'Yavaş sorgu (%.1f ms, view=%s): %s | params=%.500r | plan=%s',
+            duration_ms, current_view.get(), sql, params, plan,
+            extra={
+                'duration_ms': round(duration_ms, 2),
+                'view': current_view.get(),
+                'sql': sql,
+                'params': params,
+                'plan': plan,
+                'db_alias': connection.alias,
+            },
+        )
+    return result
+
+
+def install_slow_query_logging(sender, connection, **kwargs):
+    """connection_created sinyali: her yeni veritabanı bağlantısına yavaş sorgu hook'u eklenir."""
+    if slow_query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query_wrapper)
+
+
+def start_queue_listener():
+    """
+    Logger'a LOGGING ile verilen handler'ları bir QueueListener arkasına taşır.
+    İstek thread'i sadece kuyruğa yazar; dosyaya/konsola yazma ayrı bir thread'de yapılır.
+    """
+    global _listener
+    if _listener is not None or not logger.handlers:
+        return
+    log_queue = queue.SimpleQueue()
+    handlers = logger.handlers[:]
+    logger.handlers = [QueueHandler(log_queue)]
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
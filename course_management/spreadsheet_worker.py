@@ -0,0 +1,73 @@
+"""
+Excel dosyasını ayrı bir süreçte okuyan worker (spreadsheets.read_excel_rows çalıştırır).
+
+    python -m course_management.spreadsheet_worker <bellek_mb> <cpu_saniye>  < dosya.xlsx
+
+Dosya stdin'den okunur. pandas import edilmeden önce süreç kendi bellek (RLIMIT_AS) ve CPU
+(RLIMIT_CPU) sınırını koyar; bozuk veya çok büyük bir dosya sadece bu süreci öldürür, web
+worker'ı etkilemez. Başlık ve satırlar stdout'a art arda marshal kayıtları olarak yazılır
+(önce başlık, sonra her satır için bir tuple). Hata olursa mesaj stderr'in son satırına
+yazılır ve süreç 1 koduyla çıkar.
+
+Django yüklenmez; bu modül sadece standart kütüphane ve pandas kullanır.
+"""
+import io
+import marshal
+import sys
+import warnings
+
+try:
+    import resource
+except ImportError:  # Windows: sınır konamaz, sadece zaman aşımı geçerli olur
+    resource = None
+
+
+def _limit(memory_mb, cpu_seconds):
+    if resource is None:
+        return
+    memory = memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+
+
+def _plain(value):
+    """Hücreyi marshal'ın yazabileceği bir değere çevirir (None, bool, int, float, str)."""
+    if hasattr(value, "item") and not isinstance(value, (str, bytes)):
+        # numpy skalerleri
+        value = value.item()
+    if value is None or value != value:
+        # boş hücre (NaN/NaT)
+        return None
+    if isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def main(argv):
+    memory_mb, cpu_seconds = int(argv[1]), int(argv[2])
+    data = sys.stdin.buffer.read()
+    _limit(memory_mb, cpu_seconds)
+    # openpyxl'in stil uyarıları hata mesajının yerini almasın
+    warnings.simplefilter("ignore")
+
+    try:
+        import pandas
+
+        df = pandas.read_excel(io.BytesIO(data))
+        out = sys.stdout.buffer
+        marshal.dump(tuple(_plain(name) for name in df.columns), out)
+        for row in df.itertuples(index=False, name=None):
+            marshal.dump(tuple(_plain(value) for value in row), out)
+        out.flush()
+    except MemoryError:
+        sys.stderr.write(f"\nDosya okunurken bellek sınırı ({memory_mb} MB) aşıldı\n")
+        return 1
+    except Exception as e:
+        # çok satırlı mesajlar tek satıra indirilir
+        sys.stderr.write(f"\n{' '.join(str(e).split()) or type(e).__name__}\n")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
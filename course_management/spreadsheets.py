@@ -0,0 +1,87 @@
+"""
+Excel/CSV okuma yardımcıları.
+
+pandas (ve openpyxl) import edilmesi yüzlerce ms ve onlarca MB bellek tutar; bu yüzden modül seviyesinde
+değil, sadece dosya gerçekten okunduğunda import edilir. Yükleme/içe aktarma dışındaki istekleri
+karşılayan worker'lar pandas'ı hiç yüklemez.
+
+Kullanıcının yüklediği Excel dosyaları ise web worker'ında hiç açılmaz: read_excel_rows dosyayı
+bellek ve süre sınırlı ayrı bir süreçte (spreadsheet_worker) okur. Bozuk veya çok büyük bir .xlsx
+gigabaytlarca bellek tutsa ya da takılsa bile sadece o süreç ölür.
+"""
+import io
+import marshal
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+
+# numpy/BLAS her çekirdek için thread ve bellek ayırmasın; bellek sınırını boşa tüketir
+WORKER_ENV = {"OPENBLAS_NUM_THREADS": "1", "OMP_NUM_THREADS": "1", "MKL_NUM_THREADS": "1"}
+
+
+class SpreadsheetError(Exception):
+    """Yüklenen dosya okunamadı (bozuk dosya, bellek veya süre sınırı aşıldı)."""
+
+
+def read_excel_rows(source, memory_mb=None, timeout=None):
+    """
+    Yüklenen Excel dosyasını ayrı bir süreçte okur; (header, rows) döner.
+
+    header sütun adlarının listesi, rows her satır için bir tuple üreten iterator'dır (boş hücreler
+    None). Hücreler sadece None/bool/int/float/str olabilir. Süreç SPREADSHEET_PARSE_MEMORY_MB'den
+    fazla bellek kullanırsa veya SPREADSHEET_PARSE_TIMEOUT saniyede bitmezse SpreadsheetError atılır.
+    """
+    memory_mb = memory_mb or settings.SPREADSHEET_PARSE_MEMORY_MB
+    timeout = timeout or settings.SPREADSHEET_PARSE_TIMEOUT
+    if hasattr(source, "seek"):
+        source.seek(0)
+    data = source.read()
+
+    process = subprocess.Popen(
+        # CPU sınırı zaman aşımına yedektir: web worker'ı beklerken ölse bile süreç kendiliğinden biter
+        [sys.executable, "-m", "course_management.spreadsheet_worker", str(memory_mb), str(int(timeout) + 1)],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        cwd=settings.BASE_DIR, env={**os.environ, **WORKER_ENV},
+    )
+    try:
+        output, stderr = process.communicate(data, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.communicate()
+        raise SpreadsheetError(f"Dosya {timeout:g} saniye içinde okunamadı")
+
+    if process.returncode:
+        lines = stderr.decode("utf-8", errors="replace").strip().splitlines()
+        if process.returncode > 0 and lines:
+            raise SpreadsheetError(lines[-1])
+        # sinyalle öldürüldü (ör. CPU sınırı) veya mesaj bırakamadan çöktü
+        raise SpreadsheetError(f"Dosya okunurken bellek veya süre sınırı aşıldı (çıkış kodu {process.returncode})")
+
+    stream = io.BytesIO(output)
+    return list(marshal.load(stream)), _marshal_rows(stream)
+
+
+def _marshal_rows(stream):
+    while True:
+        try:
+            yield marshal.load(stream)
+        except EOFError:
+            return
+
+
+def _pandas():
+    import pandas
+
+    return pandas
+
+
+def read_excel(source, **kwargs):
+    """Excel dosyasını (yol veya yüklenen dosya) DataFrame olarak okur."""
+    return _pandas().read_excel(source, **kwargs)
+
+
+def read_csv(source, **kwargs):
+    """CSV dosyasını (yol veya yüklenen dosya) DataFrame olarak okur."""
+    return _pandas().read_csv(source, **kwargs)
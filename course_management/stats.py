@@ -0,0 +1,138 @@
+"""
+Bölüm başkanı panelinin denormalize sayaçları (DepartmentStats, tek satır).
+
+Yapısal değişiklikler (kullanıcı/rol, ders, bileşen, kayıt) seyrek olduğu için satır commit'te
+hemen yeniden hesaplanır. Not yazmaları sık olduğundan (autosave, toplu içe aktarma) pahalı not
+sayımları her yazmada yapılmaz: satır en fazla DEPARTMENT_STATS_REFRESH_INTERVAL saniyede bir
+yeniden hesaplanır, arada sadece eskimiş (stale) olarak işaretlenir. Panel satırı her zaman olduğu
+gibi okur; okuma yolunda hiç sayım yapılmaz (satır hiç yoksa bir kez hesaplanır).
+Aynı transaction'daki değişiklikler tek bir commit işine indirgenir.
+"""
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import Course, DepartmentStats, EvaluationComponent, Grade, Profile
+
+STATS_PK = 1
+REFRESH = 'refresh'
+STALE = 'stale'
+
+_pending = threading.local()
+
+logger = logging.getLogger(__name__)
+
+
+def compute_department_stats():
+    """Sayaçları kaynak tablolardan hesaplar."""
+    values = Profile.objects.aggregate(
+        instructor_count=Count('id', filter=Q(role='instructor')),
+        student_count=Count('id', filter=Q(role='student')),
+    )
+    values['course_count'] = Course.objects.count()
+    values['courses_without_components'] = Course.objects.filter(evaluation_components__isnull=True).count()
+
+    # doldurulması beklenen not hücresi: her derste kayıtlı öğrenci × bileşen sayısı
+    enrollments = dict(Course.students.through.objects.values_list('course_id').annotate(n=Count('id')).order_by())
+    components = dict(EvaluationComponent.objects.values_list('course_id').annotate(n=Count('id')).order_by())
+    values['expected_grade_count'] = sum(n * components.get(course_id, 0) for course_id, n in enrollments.items())
+
+    graded = Grade.objects.filter(score__isnull=False)
+    values['grade_count'] = graded.count()
+    # kayıt silinmiş öğrencilerin eski notları doluluk oranına sayılmaz
+    values['filled_grade_count'] = graded.filter(component__course__students=F('student')).count()
+    return values
+
+
+def refresh_department_stats():
+    """Sayaç satırını yeniden hesaplar ve güncel satırı döner."""
+    # bayrak hesaplamadan önce temizlenir: hesaplama sırasında yazılan bir not satırı tekrar eskitir
+    DepartmentStats.objects.filter(pk=STATS_PK).update(stale=False)
+    values = compute_department_stats()
+    values['updated_at'] = timezone.now()
+    if not DepartmentStats.objects.filter(pk=STATS_PK).update(**values):
+        try:
+            with transaction.atomic():
+                DepartmentStats.objects.create(pk=STATS_PK, stale=False, **values)
+        except IntegrityError:
+            # başka bir süreç satırı aynı anda oluşturdu
+            DepartmentStats.objects.filter(pk=STATS_PK).update(**values)
+    return DepartmentStats(pk=STATS_PK, stale=False, **values)
+
+
+def get_department_stats():
+    """
+    Panelin okuduğu satır. Eskimiş olsa da olduğu gibi döner; not sayıları en fazla
+    DEPARTMENT_STATS_REFRESH_INTERVAL saniye geride kalabilir. Sadece satır hiç yoksa hesaplanır.
+    """
+    stats = DepartmentStats.objects.filter(pk=STATS_PK).first()
+    if stats is None:
+        stats = refresh_department_stats()
+    return stats
+
+
+def mark_department_stats_stale():
+    DepartmentStats.objects.filter(pk=STATS_PK, stale=False).update(stale=True)
+
+
+def refresh_department_stats_if_due():
+    """
+    Not yazmasından sonra: satır son DEPARTMENT_STATS_REFRESH_INTERVAL saniyede hesaplanmadıysa
+    yeniden hesaplar, hesaplandıysa sadece eskimiş olarak işaretler.
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=settings.DEPARTMENT_STATS_REFRESH_INTERVAL)
+    # koşullu UPDATE: aynı anda not yazan süreçlerden sadece biri hesaplamayı üstlenir
+    claimed = DepartmentStats.objects.filter(
+        Q(updated_at__isnull=True) | Q(updated_at__lt=cutoff), pk=STATS_PK,
+    ).update(updated_at=now)
+    if claimed:
+        refresh_department_stats()
+    else:
+        mark_department_stats_stale()
+
+
+def refresh_on_commit():
+    """Yapısal bir değişiklikten sonra: transaction commit edilince satırı yeniden hesapla."""
+    _schedule(REFRESH)
+
+
+def mark_stale_on_commit():
+    """Not yazmasından sonra: commit edilince satırı eskimiş işaretle (süresi geldiyse yeniden hesapla)."""
+    _schedule(STALE)
+
+
+def _schedule(action):
+    previous = getattr(_pending, 'action', None)
+    if previous != REFRESH:
+        # yeniden hesaplama eskitmeyi de kapsar
+        _pending.action = action
+    connection = transaction.get_connection()
+    # toplu işlemlerde her satır için ayrı bir commit işi birikmesin; geri alınan bir transaction'ın
+    # işi listeden düştüğü için bekleyen eylem olsa bile yeniden kaydedilir
+    if previous is None or not any(func is _flush for _, func, _ in connection.run_on_commit):
+        # robust: commit işi hata verirse (ör. "database is locked") hata commit eden koda, dolayısıyla
+        # retry_on_lock'a ulaşmaz; zaten commit edilmiş yazma tekrar çalıştırılmaz
+        transaction.on_commit(_flush, robust=True)
+
+
+def _flush():
+    action, _pending.action = getattr(_pending, 'action', None), None
+    try:
+        if action == REFRESH:
+            refresh_department_stats()
+        elif action == STALE:
+            refresh_department_stats_if_due()
+    except Exception:
+        # sayaçlar bir sonraki yazmada veya refresh_department_stats komutuyla düzelir
+        logger.exception('Bölüm istatistikleri güncellenemedi')
+        try:
+            mark_department_stats_stale()
+        except Exception:
+            # veritabanı hâlâ kilitli; satır en geç bir sonraki yenilemede düzelir
+            pass
@@ -0,0 +1,81 @@
+import traceback
+from collections import Counter
+from contextlib import ContextDecorator
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# sorgu yolundaki ölçüm katmanları (execute_wrapper'lar) çağrı yeri olarak gösterilmez
+_INSTRUMENTATION_FILES = {
+    Path(__file__).resolve(),
+    Path(__file__).resolve().with_name('slow_queries.py'),
+    Path(__file__).resolve().with_name('middleware.py'),
+}
+
+
+def _call_site():
+    """
+    Sorguyu tetikleyen en içteki proje satırını döner (Django ve site-packages kareleri atlanır).
+    Template içinden tetiklenen sorgularda bu, render'ı çağıran view satırıdır.
+    """
+    base_dir = Path(settings.BASE_DIR).resolve()
+    for frame in reversed(traceback.extract_stack()):
+        path = Path(frame.filename).resolve()
+        if path in _INSTRUMENTATION_FILES or 'site-packages' in path.parts or base_dir not in path.parents:
+            continue
+        return f'{path.relative_to(base_dir)}:{frame.lineno} in {frame.name}'
+    return '<bilinmeyen>'
+
+
+class query_budget(ContextDecorator):
+    """
+    Blok (veya dekore edilen fonksiyon) içinde çalışan sorgu sayısını sınırlar.
+
+        with query_budget(6):
+            self.client.get(url)
+
+        @query_budget(6)
+        def test_dashboard(self): ...
+
+    Bütçe aşılırsa AssertionError, sorguları çağrı yerine göre gruplayarak
+    hangi satırın fazladan sorgu attığını gösterir. Ölçülen sayı `count` ile okunabilir.
+    """
+
+    def __init__(self, max_queries, using=DEFAULT_DB_ALIAS):
+        self.max_queries = max_queries
+        self.using = using
+        self.queries = []
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    def _record(self, execute, sql, params, many, context):
+        self.queries.append((_call_site(), sql))
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self.queries = []
+        self._wrapper = connections[self.using].execute_wrapper(self._record)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self._wrapper.__exit__(exc_type, exc_value, tb)
+        if exc_type is None and self.count > self.max_queries:
+            raise AssertionError(self.report())
+        return False
+
+    def report(self):
+        sites = Counter(site for site, _ in self.queries)
+        examples = {}
+        for site, sql in self.queries:
+            examples.setdefault(site, sql)
+
+        lines = [f'Sorgu bütçesi aşıldı: {self.count} sorgu çalıştı, bütçe {self.max_queries}.',
+                 'Çağrı yerlerine göre sorgular:']
+        for site, count in sites.most_common():
+            lines.append(f'  {count:>4} x {site}')
+            lines.append(f'         {examples[site][:200]}')
+        return '\n'.join(lines)
@@ -0,0 +1,99 @@
+import re
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.urls import resolve, reverse
+
+from course_management.middleware import ProfilingMiddleware, RequestMetricsMiddleware
+from course_management.models import Course, Profile
+
+
+def _user(username, role):
+    user = User.objects.create_user(username=username, password='testpass123')
+    Profile.objects.filter(user=user).update(role=role)
+    return user
+
+
+class AsyncDashboardTest(TestCase):
+    """Dashboard'lar async view'dır; ASGI'de bütün zincir (decorator + middleware) async çalışmalı."""
+
+    DASHBOARDS = ('department_head_dashboard', 'instructor_dashboard', 'student_dashboard')
+
+    def setUp(self):
+        self.head = _user('async_head', 'department_head')
+        self.instructor = _user('async_instructor', 'instructor')
+        self.student = _user('async_student', 'student')
+        course = Course.objects.create(course_code='ASY101', course_name='Async')
+        course.instructors.add(self.instructor)
+        course.students.add(self.student)
+
+    def test_dashboards_stay_coroutines_through_decorators(self):
+        for name in self.DASHBOARDS:
+            with self.subTest(view=name):
+                self.assertTrue(iscoroutinefunction(resolve(reverse(name)).func))
+
+    async def test_department_head_dashboard_counts(self):
+        await self.async_client.alogin(username='async_head', password='testpass123')
+
+        response = await self.async_client.get(reverse('department_head_dashboard'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['course_count'], 1)
+        self.assertEqual(response.context['instructor_count'], 1)
+        self.assertEqual(response.context['student_count'], 1)
+
+    async def test_instructor_and_student_dashboards(self):
+        await self.async_client.alogin(username='async_instructor', password='testpass123')
+        response = await self.async_client.get(reverse('instructor_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([c.course_code for c in response.context['courses']], ['ASY101'])
+
+        await self.async_client.alogin(username='async_student', password='testpass123')
+        response = await self.async_client.get(reverse('student_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['course'].course_code for row in response.context['course_data']], ['ASY101'])
+
+    async def test_role_checks(self):
+        response = await self.async_client.get(reverse('department_head_dashboard'))
+        self.assertEqual(response.status_code, 302)
+
+        await self.async_client.alogin(username='async_student', password='testpass123')
+        response = await self.async_client.get(reverse('department_head_dashboard'))
+        self.assertEqual(response.status_code, 403)
+
+    async def test_request_metrics_count_queries_from_async_views(self):
+        await self.async_client.alogin(username='async_head', password='testpass123')
+
+        response = await self.async_client.get(reverse('department_head_dashboard'))
+
+        queries = int(re.search(r'db;desc="(\d+) queries"', response['Server-Timing']).group(1))
+        # oturum + kullanıcı + profil + üç sayım
+        self.assertGreaterEqual(queries, 6)
+
+
+class AsyncMiddlewareTest(TestCase):
+
+    def test_middleware_follows_get_response_mode(self):
+        async def async_view(request):
+            return HttpResponse()
+
+        def sync_view(request):
+            return HttpResponse()
+
+        for middleware in (RequestMetricsMiddleware, ProfilingMiddleware):
+            with self.subTest(middleware=middleware.__name__):
+                self.assertTrue(iscoroutinefunction(middleware(async_view)))
+                self.assertFalse(iscoroutinefunction(middleware(sync_view)))
+
+    async def test_async_request_metrics(self):
+        async def view(request):
+            await Course.objects.acount()
+            return HttpResponse()
+
+        request = RequestFactory().get('/')
+        response = await RequestMetricsMiddleware(view)(request)
+
+        self.assertEqual(request.metrics.queries, 1)
+        self.assertIn('Server-Timing', response)
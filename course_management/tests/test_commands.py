@@ -0,0 +1,120 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from course_management.models import (
+    Course, EvaluationComponent, Grade, LearningOutcome, Profile, ProgramOutcome,
+)
+
+
+class GenerateSyntheticDataCommandTest(TestCase):
+
+    def _generate(self, **options):
+        options = {
+            'students': 20, 'instructors': 2, 'courses': 3, 'components': 2, 'outcomes': 2,
+            'program_outcomes': 2, 'courses_per_student': 2, 'stdout': StringIO(), **options,
+        }
+        call_command('generate_synthetic_data', **options)
+
+    def test_generates_dataset(self):
+        self._generate(sparsity=0)
+
+        self.assertEqual(Profile.objects.filter(role='student', user__username__startswith='syn_').count(), 20)
+        self.assertEqual(Profile.objects.filter(role='instructor', user__username__startswith='syn_').count(), 2)
+        self.assertEqual(Course.objects.filter(course_code__startswith='SYN').count(), 3)
+        self.assertEqual(EvaluationComponent.objects.count(), 6)
+        self.assertEqual(LearningOutcome.objects.count(), 6)
+        # sparsity=0 --> her kayıt x bileşen hücresi dolu
+        self.assertEqual(Grade.objects.count(), 20 * 2 * 2)
+        self.assertTrue(User.objects.get(username='syn_student_0').check_password('synthetic123'))
+
+    def test_seed_is_deterministic(self):
+        self._generate(seed=7)
+        first = list(Grade.objects.order_by('student__username', 'component__id').values_list('score', flat=True))
+
+        self._generate(seed=7, clear=True)
+        second = list(Grade.objects.order_by('student__username', 'component__id').values_list('score', flat=True))
+        self.assertEqual(first, second)
+
+
+    def test_clear_only_deletes_generated_rows(self):
+        self._generate()
+        # ön ekle başlayan ama komutun üretmediği kullanıcı silinmez
+        bystander = User.objects.create_user(username='syn_admin', password='x')
+
+        self._generate(clear=True, courses=1)
+
+        self.assertTrue(User.objects.filter(pk=bystander.pk).exists())
+        self.assertEqual(list(Course.objects.values_list('course_code', flat=True)), ['SYN00000'])
+
+    def test_refuses_prefix_of_real_courses(self):
+        course = Course.objects.create(course_code='CSE311', course_name='Gerçek Ders')
+        component = EvaluationComponent.objects.create(course=course, name='Final', percentage=100)
+        student = User.objects.create_user(username='real_student', password='x')
+        Grade.objects.create(student=student, component=component, score=80)
+
+        with self.assertRaisesMessage(CommandError, 'CSE311'):
+            self._generate(prefix='cse', clear=True)
+
+        self.assertTrue(Grade.objects.filter(component__course=course).exists())
+        self.assertFalse(User.objects.filter(username__startswith='cse_').exists())
+
+    def test_refuses_prefix_of_real_program_outcomes(self):
+        ProgramOutcome.objects.create(code='SYN-1', description='Gerçek PO')
+
+        with self.assertRaisesMessage(CommandError, 'SYN-1'):
+            self._generate(clear=True)
+
+        self.assertTrue(ProgramOutcome.objects.filter(code='SYN-1').exists())
+
+class BenchmarkRunnerTest(TestCase):
+
+    def test_run_scenarios_measures_every_view(self):
+        from benchmarks.runner import run_scenarios
+        from benchmarks.scenarios import SCENARIOS
+
+        call_command('generate_synthetic_data', students=10, instructors=1, courses=2, components=2,
+                     outcomes=2, program_outcomes=2, courses_per_student=2, stdout=StringIO())
+
+        results = run_scenarios(10, repeat=1, warmup=0)
+
+        self.assertEqual([row['view'] for row in results], [s.name for s in SCENARIOS])
+        for row in results:
+            self.assertEqual(row['status'], 200, row['view'])
+            self.assertGreater(row['queries'], 0, row['view'])
+
+    def test_session_scenarios_compare_strategies(self):
+        from benchmarks.runner import run_session_scenarios
+
+        call_command('generate_synthetic_data', students=10, instructors=1, courses=2, components=2,
+                     outcomes=2, program_outcomes=2, courses_per_student=2, stdout=StringIO())
+
+        results = {row['session']: row for row in run_session_scenarios(10, repeat=1, warmup=1)}
+
+        self.assertEqual(set(results), {'db', 'cached_db', 'signed_cookies'})
+        for row in results.values():
+            self.assertEqual(row['status'], 200, row['session'])
+        # ısınmış cache'ten veya çerezden okunan oturum session tablosuna gitmez
+        self.assertEqual(results['cached_db']['saved_queries'], 1)
+        self.assertEqual(results['signed_cookies']['saved_queries'], 1)
+
+    def test_compare_reports_regressions(self):
+        from benchmarks.runner import compare
+
+        baseline = {'results': [
+            {'scale': 100, 'view': 'a', 'p95_ms': 10.0, 'queries': 5},
+            {'scale': 100, 'view': 'b', 'p95_ms': 10.0, 'queries': 5},
+            {'scale': 100, 'view': 'c', 'p95_ms': 10.0, 'queries': 5},
+        ]}
+        current = {'results': [
+            {'scale': 100, 'view': 'a', 'p95_ms': 11.0, 'queries': 5},  # eşik içinde
+            {'scale': 100, 'view': 'b', 'p95_ms': 15.0, 'queries': 5},  # yavaşlama
+            {'scale': 100, 'view': 'c', 'p95_ms': 10.0, 'queries': 6},  # fazladan sorgu
+            {'scale': 1000, 'view': 'a', 'p95_ms': 99.0, 'queries': 9},  # baseline'da yok
+        ]}
+
+        regressions = compare(baseline, current)
+
+        self.assertEqual([r['view'] for r in regressions], ['b', 'c'])
@@ -0,0 +1,165 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from unittest.mock import patch
+
+from course_management import metrics
+
+
+class MetricsEndpointTest(TestCase):
+
+    def setUp(self):
+        self.metrics_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.metrics_dir.cleanup)
+        self.settings_override = override_settings(METRICS_DIR=self.metrics_dir.name, METRICS_TOKEN='scrape-token')
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def _scrape(self, **extra):
+        extra.setdefault('HTTP_AUTHORIZATION', 'Bearer scrape-token')
+        return self.client.get(reverse('metrics'), **extra)
+
+    def test_request_metrics_exposed(self):
+        User.objects.create_user(username='metrics_user', password='testpass123')
+        self.client.login(username='metrics_user', password='testpass123')
+        self.client.get(reverse('student_dashboard'))
+
+        response = self._scrape()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+        self.assertIn('http_requests_total{method="GET",status="200",view="student_dashboard"}', body)
+        self.assertIn('db_queries_per_request_count{view="student_dashboard"}', body)
+        self.assertIn('http_request_duration_seconds_bucket{view="student_dashboard",le="+Inf"}', body)
+
+    def test_grade_import_metrics(self):
+        metrics.record_grade_import(500, 0.5, source='excel')
+
+        body = self._scrape().content.decode()
+
+        self.assertIn('grade_import_rows_total{source="excel"}', body)
+        self.assertIn('grade_import_rows_per_second_bucket{source="excel",le="1000"}', body)
+
+    def test_merges_other_process_files(self):
+        metrics.registry.inc('grade_import_rows_total', (('source', 'merge-test'),), 3)
+        # başka bir worker sürecinin yazdığı dosya
+        other = Path(self.metrics_dir.name) / 'metrics_999999.json'
+        other.write_text(json.dumps([['grade_import_rows_total', [['source', 'merge-test']], 4]]))
+
+        body = self._scrape().content.decode()
+
+        self.assertIn('grade_import_rows_total{source="merge-test"} 7', body)
+
+    def test_hidden_without_token(self):
+        # reverse proxy arkasında her istek loopback'ten gelir; tek başına yetki vermez
+        self.assertEqual(self._scrape(HTTP_AUTHORIZATION='', REMOTE_ADDR='127.0.0.1').status_code, 404)
+        self.assertEqual(self._scrape(HTTP_AUTHORIZATION='Bearer yanlis').status_code, 404)
+
+        with override_settings(METRICS_TOKEN=''):
+            self.assertEqual(self._scrape(HTTP_AUTHORIZATION='Bearer ').status_code, 404)
+
+    def test_allowed_ips_are_opt_in(self):
+        with override_settings(METRICS_ALLOWED_IPS=['10.0.0.5']):
+            self.assertEqual(self._scrape(HTTP_AUTHORIZATION='', REMOTE_ADDR='10.0.0.5').status_code, 200)
+
+    def test_hidden_from_external_clients(self):
+        response = self._scrape(HTTP_AUTHORIZATION='', REMOTE_ADDR='203.0.113.7')
+        self.assertEqual(response.status_code, 404)
+
+        User.objects.create_superuser(username='metrics_admin', password='testpass123')
+        self.client.login(username='metrics_admin', password='testpass123')
+        response = self._scrape(HTTP_AUTHORIZATION='', REMOTE_ADDR='203.0.113.7')
+        self.assertEqual(response.status_code, 200)
+
+
+class MetricsFlushTest(TestCase):
+
+    def setUp(self):
+        self.metrics_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.metrics_dir.cleanup)
+
+    def test_concurrent_flushes_do_not_raise(self):
+        registry = metrics._Registry()
+        errors = []
+
+        def hammer():
+            try:
+                for _ in range(300):
+                    registry.inc('grade_import_rows_total', (('source', 'thread-test'),))
+            except Exception as e:  # pragma: no cover - başarısızlıkta görünür
+                errors.append(e)
+
+        with override_settings(METRICS_DIR=self.metrics_dir.name), patch.object(metrics, 'FLUSH_INTERVAL', 0):
+            threads = [threading.Thread(target=hammer) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            registry.flush()
+
+        self.assertEqual(errors, [])
+        payload = json.loads(next(Path(self.metrics_dir.name).glob('metrics_*.json')).read_text())
+        self.assertEqual(payload, [['grade_import_rows_total', [['source', 'thread-test']], 2400]])
+        self.assertEqual(list(Path(self.metrics_dir.name).glob('*.tmp')), [])
+
+    def test_unwritable_metrics_dir_does_not_break_requests(self):
+        # dizin yerine dosya: mkdir/yazma OSError atar
+        blocker = Path(self.metrics_dir.name) / 'not_a_dir'
+        blocker.write_text('')
+
+        with override_settings(METRICS_DIR=blocker), patch.object(metrics, 'FLUSH_INTERVAL', 0), \
+                self.assertLogs('course_management.metrics', level='WARNING'):
+            response = self.client.get(reverse('login'))
+
+        self.assertLess(response.status_code, 500)
+
+    def _write_process_file(self, pid, value):
+        path = Path(self.metrics_dir.name) / f'metrics_{pid}.json'
+        path.write_text(json.dumps([['grade_import_rows_total', [['source', 'archive-test']], value]]))
+        return path
+
+    def _total(self, registry):
+        with override_settings(METRICS_DIR=self.metrics_dir.name):
+            return registry.collect().get(('grade_import_rows_total', (('source', 'archive-test'),)))
+
+    def test_dead_process_files_are_archived(self):
+        process = subprocess.Popen([sys.executable, '-c', 'pass'])
+        process.wait()
+        dead = self._write_process_file(process.pid, 4)
+        registry = metrics._Registry()
+        registry.inc('grade_import_rows_total', (('source', 'archive-test'),), 3)
+
+        self.assertEqual(self._total(registry), 7)
+        self.assertFalse(dead.exists())
+        self.assertTrue((Path(self.metrics_dir.name) / metrics.ARCHIVE_NAME).exists())
+
+        # ikinci ölü süreç arşive eklenir, önceki toplam korunur
+        self._write_process_file(process.pid, 5)
+        self.assertEqual(self._total(registry), 12)
+        self.assertEqual(len(list(Path(self.metrics_dir.name).glob('metrics_*.json'))), 2)
+
+    def test_live_process_files_are_kept(self):
+        parent = self._write_process_file(os.getppid(), 4)
+
+        self.assertEqual(self._total(metrics._Registry()), 4)
+        self.assertTrue(parent.exists())
+
+    def test_reused_pid_keeps_previous_totals(self):
+        # aynı pid'i almış ölü bir sürecin dosyası: üzerine yazılırsa sayaç geriye gider
+        self._write_process_file(os.getpid(), 5)
+        registry = metrics._Registry()
+        with override_settings(METRICS_DIR=self.metrics_dir.name):
+            registry.inc('grade_import_rows_total', (('source', 'archive-test'),), 1)
+            registry.flush()
+
+        self.assertEqual(self._total(registry), 6)
@@ -0,0 +1,91 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from course_management.models import Course
+
+
+class RequestMetricsMiddlewareTest(TestCase):
+
+    def setUp(self):
+        self.student = User.objects.create_user(username='metrics_student', password='testpass123')
+        course = Course.objects.create(course_code='MET101', course_name='Metrics')
+        course.students.add(self.student)
+        self.client.login(username='metrics_student', password='testpass123')
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('student_dashboard'))
+
+        self.assertEqual(response.status_code, 200)
+        header = response['Server-Timing']
+        for name in ('db;', 'tpl;', 'view;', 'total;'):
+            self.assertIn(name, header)
+
+        metrics = response.wsgi_request.metrics
+        self.assertGreater(metrics.queries, 0)
+        self.assertIn(f'db;desc="{metrics.queries} queries"', header)
+        self.assertGreater(metrics.template_time, 0)
+        self.assertGreaterEqual(metrics.view_time, metrics.template_time)
+        self.assertGreaterEqual(metrics.total_time, metrics.view_time)
+
+    def test_structured_log_line(self):
+        with self.assertLogs('course_management.metrics', level='INFO') as logs:
+            self.client.get(reverse('student_dashboard'))
+
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record['view'], 'student_dashboard')
+        self.assertEqual(record['status'], 200)
+        self.assertGreater(record['queries'], 0)
+        for key in ('sql_ms', 'template_ms', 'view_ms', 'total_ms'):
+            self.assertIn(key, record)
+
+
+class ProfilingMiddlewareTest(TestCase):
+
+    def setUp(self):
+        self.profiling_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.profiling_dir.cleanup)
+        self.settings_override = override_settings(PROFILING_DIR=self.profiling_dir.name, PROFILING_MAX_FILES=2)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+        User.objects.create_superuser(username='profiler_admin', password='testpass123')
+        User.objects.create_user(username='profiler_student', password='testpass123')
+
+    def _files(self, suffix):
+        return sorted(Path(self.profiling_dir.name).glob(f'*{suffix}'))
+
+    def test_superuser_query_flag_writes_profile(self):
+        self.client.login(username='profiler_admin', password='testpass123')
+
+        response = self.client.get(reverse('student_dashboard'), {'profile': '1'})
+
+        self.assertEqual(response.status_code, 200)
+        name = response['X-Profile-Id']
+        self.assertEqual([p.name for p in self._files('.prof')], [f'{name}.prof'])
+        html = (Path(self.profiling_dir.name) / f'{name}.html').read_text(encoding='utf-8')
+        self.assertIn('cumulative', html)
+        # student_dashboard async bir view; ORM sorguları ve render senkron thread'de çalışıp profile girer
+        self.assertIn('_fetch_all', html)
+        self.assertIn('render', html)
+
+    def test_header_flag_and_retention(self):
+        self.client.login(username='profiler_admin', password='testpass123')
+
+        for _ in range(3):
+            self.client.get(reverse('student_dashboard'), HTTP_X_PROFILE='1')
+
+        self.assertEqual(len(self._files('.prof')), 2)
+        self.assertEqual(len(self._files('.html')), 2)
+
+    def test_ignored_for_regular_users(self):
+        self.client.login(username='profiler_student', password='testpass123')
+
+        response = self.client.get(reverse('student_dashboard'), {'profile': '1'})
+
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(self._files('.prof'), [])
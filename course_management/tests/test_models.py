@@ -1,6 +1,8 @@
 from decimal import Decimal
+from unittest.mock import patch
 from django.contrib.auth.models import User
 from django.test import TestCase
+from course_management.bulk import bulk_upsert, upsert_grades
 from course_management.models import (
     Profile, Course, LearningOutcome, EvaluationComponent,
     Grade, ProgramOutcome, OutcomeWeight, LearningOutcomeProgramOutcomeWeight
@@ -183,6 +185,32 @@ class GradeModelTest(TestCase):
         self.assertEqual(grade.component, self.component)
         self.assertEqual(grade.score, Decimal('85.50'))
     
+    def test_grade_version_increments_on_update(self):
+        grade = Grade.objects.create(student=self.student, component=self.component, score=Decimal('50'))
+        self.assertEqual(grade.version, 0)
+        grade.score = Decimal('60')
+        grade.save()
+        grade.refresh_from_db()
+        self.assertEqual(grade.version, 1)
+
+    def test_lo_scores_weighted_average(self):
+        final = EvaluationComponent.objects.create(course=self.course, name='Final', percentage=60)
+        project = EvaluationComponent.objects.create(course=self.course, name='Project', percentage=0)
+        outcome = LearningOutcome.objects.create(course=self.course, description='LO')
+        OutcomeWeight.objects.create(component=self.component, outcome=outcome, weight=1)
+        OutcomeWeight.objects.create(component=final, outcome=outcome, weight=3)
+        OutcomeWeight.objects.create(component=project, outcome=outcome, weight=5)
+        Grade.objects.create(student=self.student, component=self.component, score=Decimal('40'))
+        Grade.objects.create(student=self.student, component=final, score=Decimal('80'))
+        Grade.objects.create(student=self.student, component=project, score=None)
+
+        rows = list(Grade.objects.filter(component__course=self.course).lo_scores())
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['student_id'], self.student.id)
+        self.assertEqual(rows[0]['outcome_id'], outcome.id)
+        self.assertEqual(rows[0]['total_weight'], 4)
+        self.assertAlmostEqual(rows[0]['lo_score'], 70.0)
+
     def test_grade_unique_together(self):
         """Bir öğrencinin bir component için sadece bir notu olabilir"""
         Grade.objects.create(
@@ -257,3 +285,53 @@ class OutcomeWeightModelTest(TestCase):
                 weight=5
             )
 
+
+
+class BulkUpsertTest(TestCase):
+
+    def setUp(self):
+        self.course = Course.objects.create(course_code='UPS101', course_name='Upsert')
+        self.component = EvaluationComponent.objects.create(course=self.course, name='Midterm', percentage=40)
+        self.outcome = LearningOutcome.objects.create(course=self.course, description='LO')
+        self.students = [User.objects.create_user(username=f'upsert_{i}', password='x') for i in range(3)]
+
+    def test_upsert_grades_inserts_updates_and_bumps_version(self):
+        existing = Grade.objects.create(student=self.students[0], component=self.component, score=Decimal('10'))
+
+        written = upsert_grades(
+            [Grade(student=s, component=self.component, score=Decimal('75')) for s in self.students],
+            batch_size=2,
+        )
+
+        self.assertEqual(written, 3)
+        self.assertEqual(Grade.objects.filter(component=self.component, score=Decimal('75')).count(), 3)
+        existing.refresh_from_db()
+        self.assertEqual(existing.version, 1)
+        # yeni eklenen satırların sürümü de artar; autosave'in version=0 "yeni hücre" varsayımı bozulmaz
+        self.assertFalse(Grade.objects.filter(component=self.component, version=0).exists())
+
+    def test_duplicate_keys_last_value_wins(self):
+        bulk_upsert(
+            OutcomeWeight,
+            [
+                OutcomeWeight(component=self.component, outcome=self.outcome, weight=2),
+                OutcomeWeight(component=self.component, outcome=self.outcome, weight=4),
+            ],
+            unique_fields=['component', 'outcome'],
+            update_fields=['weight'],
+        )
+
+        self.assertEqual(OutcomeWeight.objects.get(component=self.component, outcome=self.outcome).weight, 4)
+
+    def test_empty_input(self):
+        self.assertEqual(upsert_grades([]), 0)
+
+    def test_rows_are_written_in_key_order(self):
+        # eşzamanlı upsert'ler satırları hep aynı sırayla kilitlesin (PostgreSQL deadlock'u önler)
+        grades = [Grade(student=s, component=self.component, score=Decimal('50')) for s in reversed(self.students)]
+
+        with patch.object(Grade.objects, 'bulk_create', wraps=Grade.objects.bulk_create) as bulk_create:
+            upsert_grades(grades)
+
+        written = [g.student_id for g in bulk_create.call_args.args[0]]
+        self.assertEqual(written, sorted(s.id for s in self.students))
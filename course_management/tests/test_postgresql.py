@@ -0,0 +1,36 @@
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from course_management.bulk import upsert_grades
+from course_management.models import Course, EvaluationComponent, Grade
+
+
+@skipUnless(connection.vendor == 'postgresql', 'DB_ENGINE=postgresql ile çalıştırılmalı')
+class PostgreSQLProfileTest(TestCase):
+    """PostgreSQL dağıtım profili: bağlantı havuzu ve ON CONFLICT upsert'leri."""
+
+    def setUp(self):
+        self.course = Course.objects.create(course_code='PG101', course_name='Postgres')
+        self.component = EvaluationComponent.objects.create(course=self.course, name='Final', percentage=60)
+        self.students = [User.objects.create_user(username=f'pg_{i}', password='x') for i in range(3)]
+
+    def test_connection_pool_is_enabled(self):
+        self.assertIsNotNone(connection.pool)
+        self.assertGreater(connection.pool.max_size, 0)
+
+    def test_grade_upsert_is_single_on_conflict_statement(self):
+        Grade.objects.create(student=self.students[0], component=self.component, score=Decimal('10'))
+        grades = [Grade(student=s, component=self.component, score=Decimal('80')) for s in self.students]
+
+        with CaptureQueriesContext(connection) as ctx:
+            upsert_grades(grades)
+
+        inserts = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+        self.assertIn('ON CONFLICT', inserts[0])
+        self.assertEqual(Grade.objects.filter(score=Decimal('80'), version=1).count(), 3)
@@ -0,0 +1,78 @@
+import sqlite3
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+
+from course_management.models import (
+    Course, EvaluationComponent, Grade, LearningOutcome, LearningOutcomeProgramOutcomeWeight,
+    OutcomeWeight, Profile, ProgramOutcome,
+)
+from course_management.reporting import REPORTING_DB, ReportingRouter, reporting_db
+
+
+class ReportingRouterTest(SimpleTestCase):
+
+    def setUp(self):
+        self.router = ReportingRouter()
+
+    def test_writes_and_migrations_never_go_to_reporting(self):
+        self.assertEqual(self.router.db_for_write(Course), 'default')
+        self.assertIs(self.router.allow_migrate(REPORTING_DB, 'course_management'), False)
+        self.assertIsNone(self.router.allow_migrate('default', 'course_management'))
+
+    def test_reads_are_only_routed_explicitly(self):
+        self.assertIsNone(self.router.db_for_read(Course))
+
+    def test_falls_back_to_default_when_not_configured(self):
+        self.assertEqual(reporting_db(), 'default')
+
+
+class ReportingSnapshotTest(TransactionTestCase):
+
+    def test_snapshot_is_consistent_copy(self):
+        Course.objects.create(course_code='SNAP101', course_name='Snapshot')
+
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / 'reporting.sqlite3'
+            out = StringIO()
+            call_command('refresh_reporting_snapshot', output=str(target), stdout=out)
+
+            self.assertIn('Rapor kopyası yazıldı', out.getvalue())
+            self.assertFalse(target.with_name(target.name + '.tmp').exists())
+            with sqlite3.connect(target) as conn:
+                codes = [row[0] for row in conn.execute('SELECT course_code FROM course_management_course')]
+                journal_mode = conn.execute('PRAGMA journal_mode').fetchone()[0]
+            conn.close()
+
+        self.assertEqual(codes, ['SNAP101'])
+        self.assertEqual(journal_mode, 'delete')
+
+
+class ExportPoAchievementTest(TestCase):
+
+    def setUp(self):
+        student = User.objects.create_user(username='export_student', password='x')
+        Profile.objects.filter(user=student).update(role='student')
+        course = Course.objects.create(course_code='EXP101', course_name='Export')
+        course.students.add(student)
+        component = EvaluationComponent.objects.create(course=course, name='Final', percentage=100)
+        outcome = LearningOutcome.objects.create(course=course, description='LO')
+        OutcomeWeight.objects.create(component=component, outcome=outcome, weight=1)
+        po = ProgramOutcome.objects.create(code='PO1', description='Program çıktısı')
+        ProgramOutcome.objects.create(code='PO2', description='Ağırlıksız')
+        LearningOutcomeProgramOutcomeWeight.objects.create(learning_outcome=outcome, program_outcome=po, weight=2)
+        Grade.objects.create(student=student, component=component, score=Decimal('80'))
+
+    def test_writes_csv(self):
+        out = StringIO()
+        call_command('export_po_achievement', stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], 'code,description,average_score,min_score,max_score,student_count')
+        self.assertEqual(lines[1], 'PO1,Program çıktısı,80.0,80.0,80.0,1')
+        self.assertEqual(lines[2], 'PO2,Ağırlıksız,0,0,0,0')
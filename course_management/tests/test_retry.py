@@ -0,0 +1,68 @@
+from unittest.mock import patch
+
+from django.db import OperationalError, transaction
+from django.test import SimpleTestCase, TransactionTestCase
+
+from course_management.retry import DatabaseBusy, retry_on_lock
+
+
+class RetryOnLockTest(TransactionTestCase):
+
+    def _flaky(self, failures, error='database is locked'):
+        calls = []
+
+        @retry_on_lock(attempts=3)
+        def write():
+            calls.append(1)
+            if len(calls) <= failures:
+                raise OperationalError(error)
+            return 'ok'
+
+        return write, calls
+
+    @patch('course_management.retry.time.sleep')
+    def test_retries_until_lock_is_released(self, sleep):
+        write, calls = self._flaky(failures=2)
+
+        self.assertEqual(write(), 'ok')
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(sleep.call_count, 2)
+        # üstel bekleme üst sınırı: 1. bekleme <= base_delay, 2. bekleme <= 2 * base_delay
+        self.assertLessEqual(sleep.call_args_list[0].args[0], 0.05)
+        self.assertLessEqual(sleep.call_args_list[1].args[0], 0.1)
+
+    @patch('course_management.retry.time.sleep')
+    def test_gives_up_with_database_busy(self, sleep):
+        write, calls = self._flaky(failures=10)
+
+        with self.assertRaises(DatabaseBusy):
+            write()
+        self.assertEqual(len(calls), 3)
+
+    def test_other_errors_are_not_retried(self):
+        write, calls = self._flaky(failures=1, error='no such table: x')
+
+        with self.assertRaises(OperationalError):
+            write()
+        self.assertEqual(len(calls), 1)
+
+    def test_no_retry_inside_outer_transaction(self):
+        write, calls = self._flaky(failures=1)
+
+        with self.assertRaises(OperationalError), transaction.atomic():
+            write()
+        self.assertEqual(len(calls), 1)
+
+
+class ConcurrentWriteStressTest(SimpleTestCase):
+    """Ayrı süreçler aynı SQLite dosyasına aynı anda not yazar; hiçbir yazma kaybolmamalı."""
+
+    def test_concurrent_writers(self):
+        from benchmarks.stress_writes import run
+
+        report = run(processes=4, writes=25)
+
+        self.assertEqual(report['failed'], 0)
+        self.assertEqual(report['busy'], 0)
+        self.assertEqual(report['ok'], 100)
+        self.assertEqual(report['version_sum'], 100)
@@ -0,0 +1,45 @@
+from django.contrib.auth.models import User
+from django.core.checks import run_checks
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from course_management.models import Course
+
+CACHED_DB = 'django.contrib.sessions.backends.cached_db'
+SIGNED_COOKIES = 'django.contrib.sessions.backends.signed_cookies'
+
+
+class SessionStrategyTest(TestCase):
+    """SESSION_STRATEGY ile seçilen her oturum motoru giriş/çıkış akışını desteklemeli."""
+
+    def setUp(self):
+        student = User.objects.create_user(username='session_student', password='testpass123')
+        Course.objects.create(course_code='SES101', course_name='Sessions').students.add(student)
+
+    def _login_and_logout(self):
+        self.assertTrue(self.client.login(username='session_student', password='testpass123'))
+        self.assertEqual(self.client.get(reverse('student_dashboard')).status_code, 200)
+
+        self.client.post(reverse('logout'))
+        self.assertEqual(self.client.get(reverse('student_dashboard')).status_code, 302)
+
+    def test_cached_db(self):
+        with override_settings(SESSION_ENGINE=CACHED_DB):
+            self._login_and_logout()
+
+    def test_signed_cookies(self):
+        with override_settings(SESSION_ENGINE=SIGNED_COOKIES):
+            self._login_and_logout()
+
+    def test_cached_db_with_process_local_cache_warns_on_deploy_check(self):
+        with override_settings(SESSION_ENGINE=CACHED_DB):
+            ids = [message.id for message in run_checks(include_deployment_checks=True)]
+        self.assertIn('course_management.W001', ids)
+
+        with override_settings(
+            SESSION_ENGINE=CACHED_DB,
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                                'LOCATION': 'redis://localhost:6379'}},
+        ):
+            ids = [message.id for message in run_checks(include_deployment_checks=True)]
+        self.assertNotIn('course_management.W001', ids)
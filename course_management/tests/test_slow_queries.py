@@ -0,0 +1,33 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from course_management.slow_queries import slow_query_wrapper
+
+
+class SlowQueryLogTest(TestCase):
+
+    def test_hook_installed_on_connection(self):
+        connection.ensure_connection()
+        self.assertIn(slow_query_wrapper, connection.execute_wrappers)
+
+    def test_logs_select_with_plan_and_view(self):
+        User.objects.create_user(username='slow_student', password='testpass123')
+        self.client.login(username='slow_student', password='testpass123')
+
+        with self.assertLogs('course_management.slow_queries', level='WARNING') as logs, \
+                override_settings(SLOW_QUERY_THRESHOLD_MS=0):
+            self.client.get(reverse('student_dashboard'))
+
+        records = [r for r in logs.records if r.sql.lstrip().upper().startswith('SELECT')]
+        self.assertTrue(records)
+        self.assertTrue(all(r.view == 'student_dashboard' for r in records))
+        self.assertTrue(all(r.plan for r in records))
+        # EXPLAIN sorgularının kendisi loglanmaz
+        self.assertFalse(any('EXPLAIN' in r.sql for r in logs.records))
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=None)
+    def test_disabled_without_threshold(self):
+        with self.assertNoLogs('course_management.slow_queries', level='WARNING'):
+            User.objects.count()
@@ -0,0 +1,68 @@
+from io import BytesIO
+from unittest.mock import patch
+
+import pandas as pd
+from django.test import SimpleTestCase
+
+from course_management import spreadsheets
+
+
+class SpreadsheetsTest(SimpleTestCase):
+
+    def test_read_csv(self):
+        df = spreadsheets.read_csv(BytesIO(b'username,score\nali,80\n'))
+        self.assertEqual(list(df.columns), ['username', 'score'])
+        self.assertEqual(df.iloc[0]['score'], 80)
+
+    def test_pandas_not_imported_at_startup(self):
+        from benchmarks.startup import probe
+
+        # ayrı bir süreçte django.setup() + URLConf yüklenir, pandas import edilmemiş olmalı
+        self.assertFalse(probe(eager=False)['pandas_loaded'])
+
+
+class ReadExcelRowsTest(SimpleTestCase):
+    """Excel dosyası web worker'ında değil, sınırlı bir alt süreçte okunur."""
+
+    def _excel(self, df):
+        excel = BytesIO()
+        df.to_excel(excel, index=False)
+        excel.seek(0)
+        return excel
+
+    def test_rows_are_read_in_a_subprocess(self):
+        excel = self._excel(pd.DataFrame({
+            'username': ['ali', 'ayşe'],
+            'Vize': [55, None],
+            'Final': [90.5, 70],
+            'tarih': [pd.Timestamp('2025-01-02'), None],
+        }))
+
+        # pandas bu süreçte hiç kullanılmaz
+        with patch('course_management.spreadsheets._pandas', side_effect=AssertionError):
+            header, rows = spreadsheets.read_excel_rows(excel)
+
+        self.assertEqual(header, ['username', 'Vize', 'Final', 'tarih'])
+        self.assertEqual(list(rows), [
+            ('ali', 55.0, 90.5, '2025-01-02 00:00:00'),
+            ('ayşe', None, 70.0, None),
+        ])
+
+    def test_malformed_file(self):
+        with self.assertRaises(spreadsheets.SpreadsheetError) as raised:
+            spreadsheets.read_excel_rows(BytesIO(b'bu bir excel dosyasi degil'))
+
+        self.assertTrue(str(raised.exception))
+
+    def test_memory_limit(self):
+        excel = self._excel(pd.DataFrame({'username': ['ali']}))
+
+        # pandas bu sınırda import bile edilemez; alt süreç başarısız olur, bu süreçte sadece hata kalır
+        with self.assertRaises(spreadsheets.SpreadsheetError):
+            spreadsheets.read_excel_rows(excel, memory_mb=32)
+
+    def test_timeout(self):
+        excel = self._excel(pd.DataFrame({'username': ['ali']}))
+
+        with self.assertRaisesMessage(spreadsheets.SpreadsheetError, 'saniye içinde okunamadı'):
+            spreadsheets.read_excel_rows(excel, timeout=0.01)
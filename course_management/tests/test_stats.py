@@ -0,0 +1,172 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import OperationalError, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from course_management.bulk import upsert_grades
+from course_management.models import Course, DepartmentStats, EvaluationComponent, Grade, Profile
+from course_management.retry import retry_on_lock
+from course_management.stats import STATS_PK, get_department_stats, refresh_department_stats, refresh_on_commit
+
+
+class DepartmentStatsTest(TestCase):
+    """Panel sayaçları signal'larla commit'te güncellenir; TestCase'de commit işleri elle çalıştırılır."""
+
+    def _user(self, username, role='student'):
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.create_user(username=username, password='x')
+            if role != 'student':
+                user.profile.role = role
+                user.profile.save()
+        return user
+
+    def _row(self):
+        return DepartmentStats.objects.get(pk=STATS_PK)
+
+    def test_user_create_role_change_and_delete_refresh_counts(self):
+        self._user('stats_student')
+        instructor = self._user('stats_instructor', role='instructor')
+        row = self._row()
+        self.assertEqual((row.student_count, row.instructor_count), (1, 1))
+        self.assertFalse(row.stale)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            profile = Profile.objects.get(user=instructor)
+            profile.role = 'student'
+            profile.save()
+        self.assertEqual((self._row().student_count, self._row().instructor_count), (2, 0))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            instructor.delete()
+        self.assertEqual(self._row().student_count, 1)
+
+    def test_saving_profile_without_role_change_does_not_refresh(self):
+        user = self._user('stats_same_role')
+        with self.captureOnCommitCallbacks() as callbacks:
+            user.save()
+        self.assertEqual(callbacks, [])
+
+    def test_course_changes_refresh_counts(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            course = Course.objects.create(course_code='STA101', course_name='Stats')
+        row = self._row()
+        self.assertEqual((row.course_count, row.courses_without_components), (1, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            EvaluationComponent.objects.create(course=course, name='Final', percentage=100)
+        self.assertEqual(self._row().courses_without_components, 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            course.delete()
+        self.assertEqual(self._row().course_count, 0)
+
+    def test_one_refresh_per_transaction(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            for i in range(3):
+                Course.objects.create(course_code=f'ONE{i}', course_name='One')
+            User.objects.create_user(username='stats_one', password='x')
+        self.assertEqual(len(callbacks), 1)
+
+    def test_grade_writes_mark_row_stale(self):
+        student = self._user('stats_grades')
+        with self.captureOnCommitCallbacks(execute=True):
+            course = Course.objects.create(course_code='GRD101', course_name='Grades')
+            course.students.add(student)
+            components = [
+                EvaluationComponent.objects.create(course=course, name=name, percentage=50)
+                for name in ('Vize', 'Final')
+            ]
+        row = self._row()
+        self.assertEqual((row.expected_grade_count, row.grade_count, row.fill_ratio), (2, 0, 0))
+
+        # satır az önce hesaplandı: not yazması sadece eskitir, panel okuması sayım yapmaz
+        with self.captureOnCommitCallbacks(execute=True):
+            Grade.objects.create(student=student, component=components[0], score=Decimal('70'))
+        self.assertTrue(self._row().stale)
+        with self.assertNumQueries(1):
+            stats = get_department_stats()
+        self.assertEqual((stats.grade_count, stats.stale), (0, True))
+
+        # aralık dolduktan sonraki ilk not yazması satırı commit'te yeniden hesaplar
+        DepartmentStats.objects.filter(pk=STATS_PK).update(updated_at=timezone.now() - timedelta(minutes=5))
+        with self.captureOnCommitCallbacks(execute=True):
+            upsert_grades([Grade(student=student, component=components[1], score=Decimal('90'))])
+        row = self._row()
+        self.assertFalse(row.stale)
+        self.assertEqual((row.grade_count, row.filled_grade_count, row.fill_ratio), (2, 2, 100.0))
+
+    @override_settings(DEPARTMENT_STATS_REFRESH_INTERVAL=3600)
+    def test_grade_refresh_is_throttled(self):
+        student = self._user('stats_throttle')
+        with self.captureOnCommitCallbacks(execute=True):
+            course = Course.objects.create(course_code='THR101', course_name='Throttle')
+            course.students.add(student)
+            component = EvaluationComponent.objects.create(course=course, name='Final', percentage=100)
+
+        for score in ('40', '50', '60'):
+            with self.captureOnCommitCallbacks(execute=True):
+                upsert_grades([Grade(student=student, component=component, score=Decimal(score))])
+
+        row = self._row()
+        self.assertEqual((row.grade_count, row.stale), (0, True))
+        # zamanlanmış komut veya aralık sonrası ilk yazma satırı tazeler
+        self.assertEqual(refresh_department_stats().grade_count, 1)
+
+    def test_grades_of_unenrolled_students_do_not_fill(self):
+        student = self._user('stats_dropped')
+        course = Course.objects.create(course_code='DRP101', course_name='Dropped')
+        component = EvaluationComponent.objects.create(course=course, name='Final', percentage=100)
+        Grade.objects.create(student=student, component=component, score=Decimal('50'))
+
+        stats = refresh_department_stats()
+
+        self.assertEqual((stats.grade_count, stats.filled_grade_count, stats.expected_grade_count), (1, 0, 0))
+        self.assertEqual(stats.fill_ratio, 0)
+
+    def test_first_read_creates_row(self):
+        DepartmentStats.objects.all().delete()
+        Course.objects.create(course_code='NEW101', course_name='New')
+
+        self.assertEqual(get_department_stats().course_count, 1)
+        # sonraki okumalar tek satırlık SELECT
+        with self.assertNumQueries(1):
+            self.assertEqual(get_department_stats().course_count, 1)
+
+    def test_refresh_command(self):
+        Course.objects.create(course_code='CMD101', course_name='Command')
+        out = StringIO()
+
+        call_command('refresh_department_stats', stdout=out)
+
+        self.assertIn('1 ders', out.getvalue())
+        self.assertEqual(self._row().course_count, 1)
+
+
+class DepartmentStatsCommitHookTest(TransactionTestCase):
+    """Commit işi gerçek bir commit'ten sonra çalışır; hatası yazan fonksiyona geri dönmemeli."""
+
+    def test_failed_refresh_does_not_rerun_committed_write(self):
+        refresh_department_stats()
+        calls = []
+
+        @retry_on_lock()
+        @transaction.atomic
+        def write():
+            calls.append(Course.objects.create(course_code=f'HOOK{len(calls)}', course_name='Hook'))
+            refresh_on_commit()
+
+        locked = OperationalError('database is locked')
+        with patch('course_management.stats.compute_department_stats', side_effect=locked), \
+                self.assertLogs('course_management.stats', level='ERROR'):
+            write()
+
+        # retry_on_lock commit edilmiş yazmayı tekrar çalıştırmadı
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(Course.objects.count(), 1)
+        self.assertTrue(DepartmentStats.objects.get(pk=STATS_PK).stale)
@@ -0,0 +1,32 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from course_management.testing import query_budget
+
+
+class QueryBudgetTest(TestCase):
+
+    def test_within_budget(self):
+        with query_budget(2) as budget:
+            list(User.objects.all())
+            User.objects.count()
+        self.assertEqual(budget.count, 2)
+
+    def test_exceeding_budget_reports_call_sites(self):
+        with self.assertRaises(AssertionError) as ctx:
+            with query_budget(1):
+                for _ in range(3):
+                    User.objects.count()
+
+        message = str(ctx.exception)
+        self.assertIn('3 sorgu çalıştı, bütçe 1', message)
+        # üç sorgu da aynı satırdan geldiği için tek bir çağrı yeri altında toplanır
+        self.assertIn('3 x course_management/tests/test_testing.py:', message)
+
+    def test_decorator(self):
+        @query_budget(0)
+        def runs_query():
+            User.objects.exists()
+
+        with self.assertRaises(AssertionError):
+            runs_query()
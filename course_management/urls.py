@@ -7,5 +7,7 @@ urlpatterns = [
     path('', views.home, name='home'),
     # giriş yönlendiricisi --> settings.pydeki dashboard_redirect burayı kullanır
     path('dashboard/', views.dashboard_redirect, name='dashboard_redirect'),
+    # Prometheus scrape adresi (iç erişim)
+    path('metrics', views.metrics_endpoint, name='metrics'),
     
 ]
\ No newline at end of file
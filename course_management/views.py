@@ -1,7 +1,12 @@
+import hmac
+
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.views import LoginView
+from django.conf import settings
+from django.http import Http404
 from .models import Profile
+from . import metrics, spreadsheets
 
 
 def home(request):
@@ -88,6 +93,25 @@ class RoleBasedLoginView(LoginView):
         return redirect('dashboard_redirect')
 
 
+def metrics_endpoint(request):
+    """
+    Prometheus metin formatında metrikler. Süper kullanıcılara, `Authorization: Bearer <METRICS_TOKEN>`
+    gönderen scraper'lara ve (açıkça ayarlandıysa) METRICS_ALLOWED_IPS adreslerine açıktır.
+    """
+    if not (request.user.is_superuser or _metrics_token_ok(request)
+            or request.META.get("REMOTE_ADDR") in settings.METRICS_ALLOWED_IPS):
+        raise Http404
+    return HttpResponse(metrics.render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def _metrics_token_ok(request):
+    token = settings.METRICS_TOKEN
+    if not token:
+        return False
+    scheme, _, sent = request.META.get("HTTP_AUTHORIZATION", "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(sent.strip().encode(), token.encode())
+
+
 @login_required
 def dashboard_redirect(request):
     try:
@@ -107,7 +131,6 @@ def dashboard_redirect(request):
         return redirect("login")
 
 
-import pandas as pd
 from django.contrib.auth.models import User
 from django.shortcuts import HttpResponse
 
@@ -116,7 +139,7 @@ def import_students(request):
     file_path = 'students.xlsx'  # projenizin root klasöründe olduğunu varsayıyoruz
 
     # Excel dosyasını oku
-    df = pd.read_excel(file_path)
+    df = spreadsheets.read_excel(file_path)
 
     # Her satır için kullanıcı oluştur
     for index, row in df.iterrows():
@@ -141,7 +164,6 @@ def import_students(request):
     return HttpResponse("Öğrenciler başarıyla yüklendi!")
 
 
-import pandas as pd
 from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
@@ -154,7 +176,7 @@ def import_grades_from_excel(request):
         excel_file = request.FILES["excel_file"]
 
         try:
-            df = pd.read_excel(excel_file)
+            df = spreadsheets.read_excel(excel_file)
 
             required_columns = {"student_number", "course_code", "grade"}
             if not required_columns.issubset(df.columns):
@@ -5,6 +5,8 @@ from django.contrib.auth.models import User
 from django.db.models.signals import m2m_changed
 from django.test import TestCase, Client, TransactionTestCase
 from django.urls import reverse
+from course_management.stats import refresh_department_stats
+from course_management.testing import query_budget
 from course_management.models import (
     Profile, Course, LearningOutcome, EvaluationComponent,
     Grade, OutcomeWeight, ProgramOutcome, LearningOutcomeProgramOutcomeWeight
@@ -265,6 +267,40 @@ class POAchievementTest(TestCase):
         self.assertIn('po_achievement_data', response.context)
         self.assertEqual(len(response.context['po_achievement_data']), 1)
 
+    def test_program_outcome_achievement_scores(self):
+        Grade.objects.create(student=self.student, component=self.component, score=Decimal('80.0'))
+        outsider = User.objects.create_user(username='outsider', password='testpass123')
+        Grade.objects.create(student=outsider, component=self.component, score=Decimal('10.0'))
+
+        self.client.login(username=self.department_head.username, password='testpass123')
+        response = self.client.get(reverse('po_achievement'))
+
+        data = response.context['po_achievement_data'][0]
+        self.assertEqual(data['student_count'], 1)
+        self.assertAlmostEqual(data['average_score'], 80.0)
+
+    def test_program_outcome_achievement_counts_missing_grades_as_zero(self):
+        # LO'ya bağlı ama notu girilmemiş bileşen paydada kalır: LO skoru 80·3 / (3+1) = 60
+        final = EvaluationComponent.objects.create(course=self.course, name='Final', percentage=60)
+        OutcomeWeight.objects.create(component=final, outcome=self.outcome, weight=1)
+        Grade.objects.create(student=self.student, component=self.component, score=Decimal('80.0'))
+        Grade.objects.create(student=self.student, component=final, score=None)
+        # derse kayıtlı ama hiç notu olmayan öğrenci 0 ile sayılır
+        newcomer = User.objects.create_user(username='newcomer', password='testpass123')
+        profile, _ = Profile.objects.get_or_create(user=newcomer)
+        profile.role = 'student'
+        profile.save()
+        self.course.students.add(newcomer)
+
+        self.client.login(username=self.department_head.username, password='testpass123')
+        response = self.client.get(reverse('po_achievement'))
+
+        data = response.context['po_achievement_data'][0]
+        self.assertEqual(data['student_count'], 2)
+        self.assertAlmostEqual(data['max_score'], 60.0)
+        self.assertAlmostEqual(data['min_score'], 0.0)
+        self.assertAlmostEqual(data['average_score'], 30.0)
+
 
 class EditProgramOutcomeTest(TestCase):
     
@@ -665,6 +701,70 @@ class DeleteLearningOutcomeTest(TestCase):
         
         self.assertFalse(LearningOutcome.objects.filter(id=outcome_id).exists())
 
+class DepartmentHeadQueryBudgetTest(TestCase):
+    """Bölüm başkanı sayfalarının sorgu sayısı ders/öğrenci sayısıyla artmamalı (N+1 koruması)."""
+
+    BUDGETS = {
+        # sayaçlar tek DepartmentStats satırından okunur
+        'department_head_dashboard': 4,
+        'department_head_courses': 6,
+        'department_head_students': 6,
+        'department_head_instructors': 6,
+        'manage_lo_po_weights': 7,
+        'view_outcomes': 8,
+        # PO skoru notu olmayan kayıtlı öğrencileri de sayar: bileşen ağırlıkları ve kayıtlar ayrıca okunur
+        'po_achievement': 8,
+    }
+
+    def setUp(self):
+        self.department_head = User.objects.create_user(username='budget_head', password='testpass123')
+        profile, _ = Profile.objects.get_or_create(user=self.department_head)
+        profile.role = 'department_head'
+        profile.save()
+        self.program_outcomes = [
+            ProgramOutcome.objects.create(code=f'PO{i}', description=f'PO {i}') for i in range(2)
+        ]
+        self.client.login(username='budget_head', password='testpass123')
+
+    def _add_course(self, index):
+        instructor = User.objects.create_user(username=f'budget_instructor_{index}', password='testpass123')
+        Profile.objects.filter(user=instructor).update(role='instructor')
+        course = Course.objects.create(course_code=f'BGT{index}', course_name=f'Budget {index}')
+        course.instructors.add(instructor)
+        students = []
+        for k in range(3):
+            student = User.objects.create_user(username=f'budget_student_{index}_{k}', password='testpass123')
+            Profile.objects.filter(user=student).update(role='student')
+            students.append(student)
+        course.students.add(*students)
+        for j in range(2):
+            component = EvaluationComponent.objects.create(course=course, name=f'C{j}', percentage=50)
+            outcome = LearningOutcome.objects.create(course=course, description=f'LO {j}')
+            OutcomeWeight.objects.create(component=component, outcome=outcome, weight=2)
+            for po in self.program_outcomes:
+                LearningOutcomeProgramOutcomeWeight.objects.create(
+                    learning_outcome=outcome, program_outcome=po, weight=3
+                )
+            for student in students:
+                Grade.objects.create(student=student, component=component, score=Decimal('65'))
+
+    def _assert_budgets(self):
+        # TestCase on_commit çalıştırmaz; signal'ların commit'te yapacağı yenileme burada yapılır
+        refresh_department_stats()
+        for url_name, budget in self.BUDGETS.items():
+            with self.subTest(view=url_name), query_budget(budget):
+                response = self.client.get(reverse(url_name))
+                self.assertEqual(response.status_code, 200)
+
+    def test_query_count_is_constant(self):
+        self._add_course(0)
+        self._assert_budgets()
+
+        for i in range(1, 5):
+            self._add_course(i)
+        self._assert_budgets()
+
+
 class RollbackError(Exception):
     pass
 
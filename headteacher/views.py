@@ -1,17 +1,23 @@
-from decimal import Decimal
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from course_management.forms import LearningOutcomeForm
 from django.db import transaction
+from django.db.models import Prefetch
 
+from course_management.bulk import bulk_upsert
 from course_management.decorators import user_is_department_head
+from course_management.retry import DATABASE_BUSY_MESSAGE, DatabaseBusy, retry_on_lock
 from course_management.forms import (
     CourseCreateForm, ProgramOutcomeForm
 )
+from course_management.reporting import po_achievement_data, reporting_db
+from course_management.shortcuts import arender
+from course_management.stats import get_department_stats
 from course_management.models import (
-    Course, Grade, LearningOutcome, LearningOutcomeProgramOutcomeWeight,
+    Course, LearningOutcome, LearningOutcomeProgramOutcomeWeight,
     OutcomeWeight, ProgramOutcome, User,
 )
 # =========================
@@ -19,19 +25,19 @@ from course_management.models import (
 # =========================
 @login_required
 @user_is_department_head
-def department_head_dashboard(request):
+async def department_head_dashboard(request):
     """
     Sadece sistem özeti gösterir.
     Form/liste yok — hepsi sidebar sayfalarında.
+    Sayaçlar her istekte sayılmaz, signal'larla güncel tutulan tek DepartmentStats satırından okunur.
     """
-    course_count = Course.objects.count()
-    instructor_count = User.objects.filter(profile__role="instructor").count()
-    student_count = User.objects.filter(profile__role="student").count()
-
-    return render(request, "headteacher/department_head_dashboard.html", {
-        "course_count": course_count,
-        "instructor_count": instructor_count,
-        "student_count": student_count,
+    stats = await sync_to_async(get_department_stats)()
+
+    return await arender(request, "headteacher/department_head_dashboard.html", {
+        "stats": stats,
+        "course_count": stats.course_count,
+        "instructor_count": stats.instructor_count,
+        "student_count": stats.student_count,
     })
 
 
@@ -110,7 +116,11 @@ def department_head_program_outcomes(request):
 @login_required
 @user_is_department_head
 def department_head_instructors(request):
-    all_instructors = User.objects.filter(profile__role="instructor").order_by("last_name", "first_name")
+    all_instructors = (
+        User.objects.filter(profile__role="instructor")
+        .order_by("last_name", "first_name")
+        .prefetch_related("courses_taught")
+    )
     return render(request, "headteacher/department_head_instructors.html", {
         "all_instructors": all_instructors,
         "instructor_count": all_instructors.count(),
@@ -175,10 +185,24 @@ def department_head_students(request):
 # =========================
 # LO–PO WEIGHTS
 # =========================
+@retry_on_lock()
+@transaction.atomic
+def _write_lo_po_weights(outcome, weights, cleared_program_outcome_ids):
+    """LO'nun PO ağırlıklarını tek upsert ile yazar, boş bırakılanları siler."""
+    bulk_upsert(
+        LearningOutcomeProgramOutcomeWeight, weights,
+        unique_fields=["learning_outcome", "program_outcome"], update_fields=["weight"],
+    )
+    if cleared_program_outcome_ids:
+        LearningOutcomeProgramOutcomeWeight.objects.filter(
+            learning_outcome=outcome, program_outcome_id__in=cleared_program_outcome_ids
+        ).delete()
+
+
 @login_required
 @user_is_department_head
 def manage_lo_po_weights(request):
-    all_courses = Course.objects.all().prefetch_related("learning_outcomes")
+    all_courses = Course.objects.all().prefetch_related("learning_outcomes__program_outcome_weights")
     all_program_outcomes = ProgramOutcome.objects.all().order_by("code")
 
     course_data = []
@@ -187,10 +211,7 @@ def manage_lo_po_weights(request):
         outcome_data = []
 
         for outcome in outcomes:
-            weight_map = {
-                w.program_outcome_id: w.weight
-                for w in LearningOutcomeProgramOutcomeWeight.objects.filter(learning_outcome=outcome)
-            }
+            weight_map = {w.program_outcome_id: w.weight for w in outcome.program_outcome_weights.all()}
             outcome_data.append({
                 "outcome": outcome,
                 "po_rows": [{"program_outcome": po, "weight": weight_map.get(po.id)} for po in all_program_outcomes],
@@ -201,20 +222,23 @@ def manage_lo_po_weights(request):
     if request.method == "POST":
         outcome = get_object_or_404(LearningOutcome, id=request.POST.get("outcome_id"))
 
-        with transaction.atomic():
-            for po in all_program_outcomes:
-                value = request.POST.get(f"weight_{outcome.id}_{po.id}")
-                if value:
-                    LearningOutcomeProgramOutcomeWeight.objects.update_or_create(
-                        learning_outcome=outcome,
-                        program_outcome=po,
-                        defaults={"weight": int(value)}
-                    )
-                else:
-                    LearningOutcomeProgramOutcomeWeight.objects.filter(
-                        learning_outcome=outcome,
-                        program_outcome=po
-                    ).delete()
+        weights, cleared = [], []
+        for po in all_program_outcomes:
+            value = request.POST.get(f"weight_{outcome.id}_{po.id}")
+            if value:
+                weights.append(LearningOutcomeProgramOutcomeWeight(
+                    learning_outcome=outcome, program_outcome=po, weight=int(value)
+                ))
+            else:
+                cleared.append(po.id)
+
+        try:
+            _write_lo_po_weights(outcome, weights, cleared)
+        except DatabaseBusy:
+            if request.headers.get("X-Requested-With") == "XMLHttpRequest":
+                return JsonResponse({"success": False, "message": DATABASE_BUSY_MESSAGE}, status=503)
+            messages.error(request, DATABASE_BUSY_MESSAGE)
+            return redirect("manage_lo_po_weights")
 
         if request.headers.get("X-Requested-With") == "XMLHttpRequest":
             return JsonResponse({"success": True, "message": "Ağırlıklar başarıyla güncellendi."})
@@ -234,8 +258,18 @@ def manage_lo_po_weights(request):
 @login_required
 @user_is_department_head
 def view_outcomes(request):
-    all_courses = Course.objects.all().prefetch_related("learning_outcomes", "evaluation_components")
-    all_program_outcomes = ProgramOutcome.objects.all().order_by("code")
+    # ağırlıklar bileşen/LO başına ayrı sorgu yerine ilişki başına tek sorguyla okunur;
+    # rapor salt okunur reporting veritabanından okunur (prefetch'ler de aynı alias'ı kullanır)
+    all_courses = Course.objects.using(reporting_db()).prefetch_related(
+        "evaluation_components",
+        Prefetch("evaluation_components__outcome_weights", queryset=OutcomeWeight.objects.select_related("outcome")),
+        "learning_outcomes",
+        Prefetch(
+            "learning_outcomes__program_outcome_weights",
+            queryset=LearningOutcomeProgramOutcomeWeight.objects.select_related("program_outcome"),
+        ),
+    )
+    all_program_outcomes = ProgramOutcome.objects.using(reporting_db()).order_by("code")
 
     course_data = []
     for course in all_courses:
@@ -245,11 +279,11 @@ def view_outcomes(request):
         course_data.append({
             "course": course,
             "component_lo_data": [
-                {"component": c, "weights": OutcomeWeight.objects.filter(component=c).select_related("outcome")}
+                {"component": c, "weights": c.outcome_weights.all()}
                 for c in components
             ],
             "lo_po_data": [
-                {"outcome": o, "weights": LearningOutcomeProgramOutcomeWeight.objects.filter(learning_outcome=o).select_related("program_outcome")}
+                {"outcome": o, "weights": o.program_outcome_weights.all()}
                 for o in outcomes
             ],
         })
@@ -266,77 +300,12 @@ def view_outcomes(request):
 @login_required
 @user_is_department_head
 def po_achievement(request):
-    all_courses = Course.objects.all().prefetch_related("learning_outcomes", "evaluation_components", "students")
-    all_program_outcomes = ProgramOutcome.objects.all().order_by("code")
-    all_students = User.objects.filter(profile__role="student").prefetch_related("enrolled_courses", "grades")
-
-    grade_map = {
-        (g.student_id, g.component_id): g.score
-        for g in Grade.objects.select_related("student", "component")
-        .filter(student__profile__role="student", score__isnull=False)
-    }
-    comp_lo_weight_map = {
-        (w.component_id, w.outcome_id): w.weight
-        for w in OutcomeWeight.objects.select_related("component", "outcome").all()
-    }
-    lo_po_weight_map = {
-        (w.learning_outcome_id, w.program_outcome_id): w.weight
-        for w in LearningOutcomeProgramOutcomeWeight.objects.select_related("learning_outcome", "program_outcome").all()
-    }
-
-    po_achievement_data = []
-
-    for po in all_program_outcomes:
-        student_po_scores = []
-
-        for student in all_students:
-            student_po_score = Decimal("0.0")
-            student_po_weight = Decimal("0.0")
-
-            for course in all_courses:
-                if student not in course.students.all():
-                    continue
-
-                components = list(course.evaluation_components.all())
-                outcomes = list(course.learning_outcomes.all())
-
-                for outcome in outcomes:
-                    lo_po_weight = lo_po_weight_map.get((outcome.id, po.id))
-                    if not lo_po_weight:
-                        continue
-
-                    lo_weight_to_po = Decimal(lo_po_weight)
-
-                    lo_weighted_score = sum(
-                        Decimal(grade_map.get((student.id, c.id), 0)) * Decimal(comp_lo_weight_map.get((c.id, outcome.id), 0))
-                        for c in components
-                        if grade_map.get((student.id, c.id)) and comp_lo_weight_map.get((c.id, outcome.id))
-                    )
-
-                    lo_total_weight = sum(
-                        Decimal(comp_lo_weight_map.get((c.id, outcome.id), 0))
-                        for c in components
-                        if comp_lo_weight_map.get((c.id, outcome.id))
-                    )
-
-                    if lo_total_weight > 0:
-                        lo_score = lo_weighted_score / lo_total_weight
-                        student_po_score += lo_score * lo_weight_to_po
-                        student_po_weight += lo_weight_to_po
-
-            if student_po_weight > 0:
-                student_po_scores.append(float(student_po_score / student_po_weight))
-
-        po_achievement_data.append({
-            "program_outcome": po,
-            "average_score": sum(student_po_scores) / len(student_po_scores) if student_po_scores else 0,
-            "min_score": min(student_po_scores) if student_po_scores else 0,
-            "max_score": max(student_po_scores) if student_po_scores else 0,
-            "student_count": len(student_po_scores),
-        })
-
+    """
+    Her program çıktısı için öğrenci başarı istatistiklerini gösterir.
+    Hesaplama salt okunur reporting veritabanından yapılır (bkz. course_management.reporting).
+    """
     return render(request, "headteacher/department_head_program_outcome_achievement.html", {
-        "po_achievement_data": po_achievement_data,
+        "po_achievement_data": po_achievement_data(),
     })
 
 
@@ -2,6 +2,7 @@ from decimal import Decimal
 from django.contrib.auth.models import User
 from django.test import TestCase, Client
 from django.urls import reverse
+from course_management.testing import query_budget
 from course_management.models import (
     Profile, Course, LearningOutcome, EvaluationComponent,
     Grade, OutcomeWeight, ProgramOutcome, LearningOutcomeProgramOutcomeWeight
@@ -229,3 +230,61 @@ class StudentCourseDetailTest(TestCase):
         self.assertIn('program_outcome_scores', response.context)
         self.assertEqual(len(response.context['program_outcome_scores']), 1)
 
+
+
+class StudentQueryBudgetTest(TestCase):
+    """Sorgu sayısı ders/not sayısı arttıkça sabit kalmalı (N+1 koruması)."""
+
+    DASHBOARD_BUDGET = 8
+    COURSE_DETAIL_BUDGET = 9
+
+    def setUp(self):
+        self.student = User.objects.create_user(username='budget_student', password='testpass123')
+        profile, _ = Profile.objects.get_or_create(user=self.student)
+        profile.role = 'student'
+        profile.save()
+        self.program_outcome = ProgramOutcome.objects.create(code='PO1', description='PO')
+        self.client.login(username='budget_student', password='testpass123')
+
+    def _add_course(self, index):
+        course = Course.objects.create(course_code=f'BGT{index}', course_name=f'Budget {index}')
+        course.students.add(self.student)
+        for j in range(3):
+            component = EvaluationComponent.objects.create(course=course, name=f'C{j}', percentage=30)
+            outcome = LearningOutcome.objects.create(course=course, description=f'LO {j}')
+            OutcomeWeight.objects.create(component=component, outcome=outcome, weight=2)
+            LearningOutcomeProgramOutcomeWeight.objects.create(
+                learning_outcome=outcome, program_outcome=self.program_outcome, weight=3
+            )
+            Grade.objects.create(student=self.student, component=component, score=Decimal('70'))
+        return course
+
+    def test_dashboard_query_count_is_constant(self):
+        self._add_course(0)
+        with query_budget(self.DASHBOARD_BUDGET):
+            self.client.get(reverse('student_dashboard'))
+
+        for i in range(1, 6):
+            self._add_course(i)
+        with query_budget(self.DASHBOARD_BUDGET):
+            response = self.client.get(reverse('student_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['course_data']), 6)
+
+    def test_course_detail_query_count_is_constant(self):
+        course = self._add_course(0)
+        url = reverse('student_course_detail', args=[course.id])
+        with query_budget(self.COURSE_DETAIL_BUDGET):
+            self.client.get(url)
+
+        for j in range(3, 10):
+            component = EvaluationComponent.objects.create(course=course, name=f'C{j}', percentage=1)
+            outcome = LearningOutcome.objects.create(course=course, description=f'LO {j}')
+            OutcomeWeight.objects.create(component=component, outcome=outcome, weight=1)
+            LearningOutcomeProgramOutcomeWeight.objects.create(
+                learning_outcome=outcome, program_outcome=self.program_outcome, weight=1
+            )
+            Grade.objects.create(student=self.student, component=component, score=Decimal('50'))
+        with query_budget(self.COURSE_DETAIL_BUDGET):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
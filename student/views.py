@@ -1,54 +1,53 @@
+import asyncio
 from decimal import Decimal
 from django.contrib.auth.decorators import login_required
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404, render
 from course_management.decorators import user_is_student
+from course_management.shortcuts import alist, arender
 from course_management.models import (
     Course, EvaluationComponent, Grade, LearningOutcomeProgramOutcomeWeight,
-    OutcomeWeight, ProgramOutcome,
+    ProgramOutcome,
 )
 
+def _round_score(score):
+    return round(score, 2) if score is not None else None
+
+
 @login_required
 @user_is_student
-def student_dashboard(request):
-    """Öğrencinin tüm derslerini ve notlarını gösterir."""
-    enrolled_courses = request.user.enrolled_courses.all()
+async def student_dashboard(request):
+    """
+    Öğrencinin tüm derslerini ve notlarını gösterir.
+    Dersler, LO skorları ve notlar birbirinden bağımsız okunur; async ORM ile birlikte beklenir.
+    """
+    enrolled_courses, lo_rows, grade_rows = await asyncio.gather(
+        alist(request.user.enrolled_courses.prefetch_related(
+            Prefetch("evaluation_components", queryset=EvaluationComponent.objects.order_by("id")),
+            "learning_outcomes",
+        )),
+        # tüm derslerin LO skorları tek bir GROUP BY sorgusuyla veritabanında hesaplanır
+        alist(Grade.objects.filter(student=request.user).lo_scores()),
+        # ders başına sorgu atmamak için öğrencinin tüm notları tek seferde okunur
+        alist(Grade.objects.filter(student=request.user, score__isnull=False).values_list("component_id", "score")),
+    )
     course_data = []
 
+    lo_score_map = {row["outcome_id"]: row["lo_score"] for row in lo_rows}
+    grade_map = dict(grade_rows)
+
     for course in enrolled_courses:
-        components = EvaluationComponent.objects.filter(course=course).order_by("id")
-        grades = Grade.objects.filter(student=request.user, component__in=components)
+        components = course.evaluation_components.all()
         outcomes = course.learning_outcomes.all()
-        grade_map = {g.component_id: g.score for g in grades if g.score is not None}
 
         # Bileşen not listesi ve toplam skor hesaplama
         component_grade_list = [{"name": c.name, "percentage": c.percentage, "score": grade_map.get(c.id)} for c in components]
         total_score = sum((Decimal(grade_map.get(c.id, 0)) * (Decimal(c.percentage) / Decimal("100.0")) for c in components if grade_map.get(c.id) is not None), Decimal("0.0"))
 
-        # Learning outcome skorlarını hesaplar
-        comp_lo_weight_map = {(w.component_id, w.outcome_id): w.weight for w in OutcomeWeight.objects.filter(component__in=components).select_related("component", "outcome")}
-        learning_outcome_scores = []
-
-        for outcome in outcomes:
-            lo_weighted_score = Decimal("0.0")
-            lo_total_weight = Decimal("0.0")
-
-            for component in components:
-                grade_score = grade_map.get(component.id)
-                if grade_score is None:
-                    continue
-
-                comp_lo_weight = comp_lo_weight_map.get((component.id, outcome.id))
-                if not comp_lo_weight:
-                    continue
-
-                comp_weight_to_lo = Decimal(comp_lo_weight)
-                lo_weighted_score += Decimal(grade_score) * comp_weight_to_lo
-                lo_total_weight += comp_weight_to_lo
-
-            learning_outcome_scores.append({
-                "outcome": outcome,
-                "score": float((lo_weighted_score / lo_total_weight).quantize(Decimal("0.01"))) if lo_total_weight > 0 else None
-            })
+        learning_outcome_scores = [
+            {"outcome": outcome, "score": _round_score(lo_score_map.get(outcome.id))}
+            for outcome in outcomes
+        ]
 
         course_data.append({
             "course": course,
@@ -57,8 +56,9 @@ def student_dashboard(request):
             "learning_outcome_scores": learning_outcome_scores,
         })
     
-    return render(request, "student/student_dashboard.html", {
+    return await arender(request, "student/student_dashboard.html", {
         "course_data": course_data,
+        # template kullanırsa render sırasında (thread'de) okunur
         "all_program_outcomes": ProgramOutcome.objects.all(),
     })
 
@@ -77,34 +77,19 @@ def student_course_detail(request, course_id):
 
     component_grade_list = [{"name": c.name, "percentage": c.percentage, "score": grade_map.get(c.id)} for c in components]
 
-    # Learning outcome skorlarını hesaplar
-    comp_lo_weight_map = {(w.component_id, w.outcome_id): w.weight for w in OutcomeWeight.objects.filter(component__in=components).select_related("component", "outcome")}
+    # Learning outcome skorları veritabanında hesaplanır
+    lo_score_map = {
+        row["outcome_id"]: row["lo_score"]
+        for row in Grade.objects.filter(student=request.user, component__course=course).lo_scores()
+    }
     learning_outcome_scores = []
     learning_outcome_score_map = {}
 
     for outcome in outcomes:
-        lo_weighted_score = Decimal("0.0")
-        lo_total_weight = Decimal("0.0")
-
-        for component in components:
-            grade_score = grade_map.get(component.id)
-            if grade_score is None:
-                continue
-
-            comp_lo_weight = comp_lo_weight_map.get((component.id, outcome.id))
-            if not comp_lo_weight:
-                continue
-
-            comp_weight_to_lo = Decimal(comp_lo_weight)
-            lo_weighted_score += Decimal(grade_score) * comp_weight_to_lo
-            lo_total_weight += comp_weight_to_lo
-
-        if lo_total_weight > 0:
-            lo_score = (lo_weighted_score / lo_total_weight).quantize(Decimal("0.01"))
-            learning_outcome_score_map[outcome.id] = lo_score
-            learning_outcome_scores.append({"outcome": outcome, "score": float(lo_score)})
-        else:
-            learning_outcome_scores.append({"outcome": outcome, "score": None})
+        lo_score = _round_score(lo_score_map.get(outcome.id))
+        if lo_score is not None:
+            learning_outcome_score_map[outcome.id] = Decimal(str(lo_score))
+        learning_outcome_scores.append({"outcome": outcome, "score": lo_score})
 
     # Program outcome skorlarını hesaplar
     lo_po_weights = LearningOutcomeProgramOutcomeWeight.objects.filter(learning_outcome__in=outcomes).select_related("program_outcome")
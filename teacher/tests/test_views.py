@@ -1,16 +1,22 @@
+import json
 from decimal import Decimal
 from io import BytesIO
 
 import pandas as pd
 from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase, Client
 from django.urls import reverse
+from course_management.bulk import upsert_grades
+from course_management.retry import DatabaseBusy
+from course_management.testing import query_budget
 from unittest.mock import patch
 from django.test import TransactionTestCase
 from django.db import transaction
 from course_management.models import (
     Profile, Course, LearningOutcome, EvaluationComponent,
-    Grade, OutcomeWeight
+    Grade, GradeImport, OutcomeWeight
 )
 
 
@@ -82,6 +88,146 @@ class TeacherViewsTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "teacher/course_manage_detail.html")
 
+    def test_manage_course_tab_skips_gradebook(self):
+        self.client.login(username=self.instructor.username, password="testpass123")
+
+        response = self.client.get(reverse("course_home", args=[self.course.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["active_tab"], "manage")
+        self.assertNotIn("student_grade_rows", response.context)
+
+    def test_course_grades_tab(self):
+        self.client.login(username=self.instructor.username, password="testpass123")
+
+        response = self.client.get(reverse("course_grades", args=[self.course.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["active_tab"], "grades")
+        self.assertEqual(len(response.context["student_grade_rows"]), 1)
+        self.assertNotIn("student_lo_scores", response.context)
+
+    def test_course_lo_scores(self):
+        OutcomeWeight.objects.create(component=self.component, outcome=self.outcome, weight=2)
+        self.client.login(username=self.instructor.username, password="testpass123")
+
+        response = self.client.get(reverse("course_lo_scores", args=[self.course.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "teacher/partials/lo_scores_table.html")
+        lo_scores = response.context["student_lo_scores"][0]["lo_scores"]
+        self.assertEqual(lo_scores[0]["score"], 85.0)
+
+    def test_course_gradebook_api(self):
+        self.client.login(username=self.instructor.username, password="testpass123")
+
+        response = self.client.get(reverse("course_gradebook_api", args=[self.course.id]), {"offset": 0, "limit": 10})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["total"], 1)
+        self.assertEqual([c["id"] for c in data["components"]], [self.component.id])
+        self.assertEqual(data["rows"][0]["id"], self.student.id)
+        self.assertEqual(data["rows"][0]["scores"], [85.0])
+
+    def test_course_gradebook_api_paginates(self):
+        for i in range(3):
+            extra = User.objects.create_user(username=f"extra_{i}", last_name=f"Z{i}")
+            self.course.students.add(extra)
+        self.client.login(username=self.instructor.username, password="testpass123")
+
+        response = self.client.get(reverse("course_gradebook_api", args=[self.course.id]), {"offset": 1, "limit": 2})
+        data = response.json()
+        self.assertEqual(data["total"], 4)
+        self.assertEqual([row["username"] for row in data["rows"]], ["extra_0", "extra_1"])
+        self.assertEqual(data["rows"][0]["scores"], [None])
+
+    @patch("teacher.views.GRADEBOOK_VIRTUAL_THRESHOLD", 0)
+    def test_course_grades_tab_virtualized(self):
+        self.client.login(username=self.instructor.username, password="testpass123")
+
+        response = self.client.get(reverse("course_grades", args=[self.course.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["gradebook_virtual"])
+        self.assertNotIn("student_grade_rows", response.context)
+        self.assertContains(response, reverse("course_gradebook_api", args=[self.course.id]))
+
+    def _autosave(self, cells):
+        return self.client.post(
+            reverse("course_grades_autosave", args=[self.course.id]),
+            data=json.dumps({"cells": cells}),
+            content_type="application/json",
+        )
+
+    def test_grades_autosave_updates_cell(self):
+        self.client.login(username=self.instructor.username, password="testpass123")
+
+        response = self._autosave([
+            {"student": self.student.id, "component": self.component.id, "score": "70.5", "version": 0},
+        ])
+        data = response.json()
+        self.assertTrue(data["success"])
+        self.assertEqual(data["saved"][0]["version"], 1)
+
+        grade = Grade.objects.get(student=self.student, component=self.component)
+        self.assertEqual(grade.score, Decimal("70.5"))
+        self.assertEqual(grade.version, 1)
+
+    def test_grades_autosave_reports_conflict(self):
+        grade = Grade.objects.get(student=self.student, component=self.component)
+        grade.score = 60
+        grade.save()  # başka bir hocanın düzenlemesi --> sürüm 1
+        self.client.login(username=self.instructor.username, password="testpass123")
+
+        response = self._autosave([
+            {"student": self.student.id, "component": self.component.id, "score": "99", "version": 0},
+        ])
+        data = response.json()
+        self.assertFalse(data["success"])
+        self.assertEqual(data["conflicts"], [
+            {"student": self.student.id, "component": self.component.id, "score": "60.00", "version": 1},
+        ])
+        grade.refresh_from_db()
+        self.assertEqual(grade.score, Decimal("60"))
+
+    def test_grades_autosave_creates_missing_grade(self):
+        final = EvaluationComponent.objects.create(course=self.course, name="Final", percentage=60)
+        self.client.login(username=self.instructor.username, password="testpass123")
+
+        data = self._autosave([
+            {"student": self.student.id, "component": final.id, "score": "88", "version": 0},
+        ]).json()
+        self.assertTrue(data["success"])
+        self.assertEqual(data["saved"][0]["version"], 1)
+        self.assertEqual(Grade.objects.get(student=self.student, component=final).score, Decimal("88"))
+
+    def test_grades_autosave_second_client_on_blank_cell_conflicts(self):
+        final = EvaluationComponent.objects.create(course=self.course, name="Final", percentage=60)
+        self.client.login(username=self.instructor.username, password="testpass123")
+        cell = {"student": self.student.id, "component": final.id, "version": 0}
+
+        # iki istemci de hücreyi boş (sürüm 0) görüyor
+        first = self._autosave([{**cell, "score": "70"}]).json()
+        second = self._autosave([{**cell, "score": "30"}]).json()
+
+        self.assertTrue(first["success"])
+        self.assertFalse(second["success"])
+        self.assertEqual(second["conflicts"], [
+            {"student": self.student.id, "component": final.id, "score": "70.00", "version": 1},
+        ])
+        grade = Grade.objects.get(student=self.student, component=final)
+        self.assertEqual((grade.score, grade.version), (Decimal("70"), 1))
+
+    def test_grades_autosave_rejects_foreign_cells(self):
+        other_course = Course.objects.create(course_code="CSE999", course_name="Other")
+        other_component = EvaluationComponent.objects.create(course=other_course, name="Quiz", percentage=10)
+        self.client.login(username=self.instructor.username, password="testpass123")
+
+        data = self._autosave([
+            {"student": self.student.id, "component": other_component.id, "score": "50", "version": 0},
+            {"student": self.student.id, "component": self.component.id, "score": "150", "version": 0},
+            {"student": self.student.id, "component": self.component.id, "score": "NaN", "version": 0},
+        ]).json()
+        self.assertFalse(data["success"])
+        self.assertEqual(len(data["errors"]), 3)
+        self.assertFalse(Grade.objects.filter(component=other_component).exists())
+
     def test_manage_course_add_evaluation_component(self):
         self.client.login(username=self.instructor.username, password="testpass123")
         
@@ -136,6 +282,77 @@ class TeacherViewsTest(TestCase):
         grade = Grade.objects.get(student=self.student, component=self.component)
         self.assertEqual(grade.score, Decimal("92.5"))
 
+    def test_manage_course_update_grades_skips_unchanged_cells(self):
+        final = EvaluationComponent.objects.create(course=self.course, name="Final", percentage=60)
+        self.client.login(username=self.instructor.username, password="testpass123")
+
+        with patch.object(Grade.objects, "bulk_create", wraps=Grade.objects.bulk_create) as bulk_create:
+            response = self.client.post(
+                reverse("manage_course", args=[self.course.id]),
+                {
+                    "submit_grades": "1",
+                    f"grade_{self.student.id}_{self.component.id}": "85.00",
+                    f"orig_grade_{self.student.id}_{self.component.id}": "85.00",
+                    f"grade_{self.student.id}_{final.id}": "",
+                    f"orig_grade_{self.student.id}_{final.id}": "",
+                }
+            )
+        self.assertEqual(response.status_code, 302)
+        bulk_create.assert_not_called()
+        self.assertFalse(Grade.objects.filter(component=final).exists())
+
+    def test_manage_course_update_grades_database_busy(self):
+        self.client.login(username=self.instructor.username, password="testpass123")
+
+        with patch("teacher.views.upsert_grades", side_effect=DatabaseBusy("database is locked")):
+            response = self.client.post(
+                reverse("manage_course", args=[self.course.id]),
+                {"submit_grades": "1", f"grade_{self.student.id}_{self.component.id}": "91"},
+            )
+
+        self.assertEqual(response.status_code, 302)
+        messages = [str(m) for m in get_messages(response.wsgi_request)]
+        self.assertTrue(any("Sistem şu anda yoğun" in m for m in messages))
+        self.assertEqual(Grade.objects.get(student=self.student, component=self.component).score, Decimal("85.00"))
+
+    def test_manage_course_update_grades_keeps_concurrent_edit(self):
+        grade = Grade.objects.get(student=self.student, component=self.component)
+        grade.score = 70
+        grade.save()  # form açıkken başka bir hoca notu değiştirdi
+        self.client.login(username=self.instructor.username, password="testpass123")
+
+        self.client.post(
+            reverse("manage_course", args=[self.course.id]),
+            {
+                "submit_grades": "1",
+                f"grade_{self.student.id}_{self.component.id}": "90",
+                f"orig_grade_{self.student.id}_{self.component.id}": "85.00",
+            }
+        )
+        grade.refresh_from_db()
+        self.assertEqual(grade.score, Decimal("70"))
+
+    def test_autosave_then_form_submit_keeps_own_edit(self):
+        self.client.login(username=self.instructor.username, password="testpass123")
+        url = reverse("manage_course", args=[self.course.id])
+        page = self.client.get(reverse("course_grades", args=[self.course.id]))
+        # autosave başarılı olunca sayfa orig_ hücresini kaydedilen değere çeker
+        self.assertContains(page, f'name="orig_grade_{self.student.id}_{self.component.id}"')
+        self.assertContains(page, "'[name=\"orig_' + input.name + '\"]'")
+
+        self.assertTrue(self._autosave([
+            {"student": self.student.id, "component": self.component.id, "score": "80", "version": 0},
+        ]).json()["success"])
+        response = self.client.post(url, {
+            "submit_grades": "1",
+            f"grade_{self.student.id}_{self.component.id}": "90",
+            f"orig_grade_{self.student.id}_{self.component.id}": "80",
+        })
+
+        grade = Grade.objects.get(student=self.student, component=self.component)
+        self.assertEqual(grade.score, Decimal("90"))
+        self.assertFalse(any("başka biri" in str(m) for m in get_messages(response.wsgi_request)))
+
     def test_manage_outcome_weights(self):
         self.client.login(username=self.instructor.username, password="testpass123")
         
@@ -266,6 +483,396 @@ class TeacherViewsTest(TestCase):
         self.assertFalse(LearningOutcome.objects.filter(id=outcome_id).exists())
 
 
+class TeacherQueryBudgetTest(TestCase):
+    """Hoca sayfalarının sorgu sayısı öğrenci/bileşen/LO sayısıyla artmamalı (N+1 koruması)."""
+
+    BUDGETS = {
+        "instructor_dashboard": 4,
+        "manage_course": 6,
+        "course_grades": 9,
+        "course_lo_scores": 7,
+        "course_weights": 8,
+        "course_gradebook_api": 8,
+    }
+
+    def setUp(self):
+        self.instructor = User.objects.create_user(username="budget_instructor", password="testpass123")
+        Profile.objects.filter(user=self.instructor).update(role="instructor")
+        self.course = Course.objects.create(course_code="BGT100", course_name="Budget")
+        self.course.instructors.add(self.instructor)
+        self.client.login(username="budget_instructor", password="testpass123")
+
+    def _grow(self, index):
+        """Derse bir bileşen, bir LO ve üç öğrenci ekler; hocaya da yeni bir ders atar."""
+        component = EvaluationComponent.objects.create(course=self.course, name=f"C{index}", percentage=10)
+        outcome = LearningOutcome.objects.create(course=self.course, description=f"LO {index}")
+        OutcomeWeight.objects.create(component=component, outcome=outcome, weight=2)
+        for k in range(3):
+            student = User.objects.create_user(username=f"budget_student_{index}_{k}", password="testpass123")
+            self.course.students.add(student)
+            Grade.objects.create(student=student, component=component, score=Decimal("55"))
+        extra = Course.objects.create(course_code=f"BGT{index}", course_name=f"Extra {index}")
+        extra.instructors.add(self.instructor)
+
+    def _assert_budgets(self):
+        for url_name, budget in self.BUDGETS.items():
+            kwargs = {} if url_name == "instructor_dashboard" else {"course_id": self.course.id}
+            with self.subTest(view=url_name), query_budget(budget):
+                response = self.client.get(reverse(url_name, kwargs=kwargs))
+                self.assertEqual(response.status_code, 200)
+
+    def test_query_count_is_constant(self):
+        self._grow(0)
+        self._assert_budgets()
+
+        for i in range(1, 5):
+            self._grow(i)
+        self._assert_budgets()
+
+
+class GradeUploadReportTest(TestCase):
+    """Hatalı satırlar satır başına mesaj yerine tek bir GradeImport raporunda toplanır."""
+
+    def setUp(self):
+        self.instructor = User.objects.create_user(username="report_instructor", password="testpass123")
+        Profile.objects.filter(user=self.instructor).update(role="instructor")
+        self.student = User.objects.create_user(username="report_student", password="testpass123")
+        self.course = Course.objects.create(course_code="RPT101", course_name="Report")
+        self.course.instructors.add(self.instructor)
+        self.course.students.add(self.student)
+        self.component = EvaluationComponent.objects.create(course=self.course, name="Final", percentage=100)
+        self.client.login(username="report_instructor", password="testpass123")
+
+    def _upload(self, rows, columns=("username", "component_name", "score"), **data):
+        excel = BytesIO()
+        pd.DataFrame(rows, columns=list(columns)).to_excel(excel, index=False)
+        excel.seek(0)
+        excel.name = "notlar.xlsx"
+        return self.client.post(reverse("upload_grades", args=[self.course.id]), {"file": excel, **data})
+
+    def test_errors_are_collected_into_one_report(self):
+        response = self._upload([
+            ["report_student", "Final", 90],
+            ["missing_student", "Final", 70],
+            ["report_student", "Vize", 60],
+            ["report_student", "Final", "yüz"],
+            ["report_student", None, 50],
+        ] + [[f"ghost_{i}", "Final", 40] for i in range(50)])
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Grade.objects.get(student=self.student, component=self.component).score, Decimal("90"))
+        # 54 hatalı satır --> sadece başarı + özet mesajı
+        messages = [str(m) for m in get_messages(response.wsgi_request)]
+        self.assertEqual(len(messages), 2)
+        self.assertIn("54 satır hatalı", messages[1])
+
+        report = GradeImport.objects.get(course=self.course)
+        self.assertEqual((report.total_rows, report.imported_count, report.error_count), (55, 1, 54))
+        self.assertEqual(report.uploaded_by, self.instructor)
+        self.assertEqual(report.errors[0], {
+            "row": 3, "username": "missing_student", "component": "Final", "error": "Öğrenci sistemde bulunamadı",
+        })
+        self.assertEqual([e["row"] for e in report.errors[1:4]], [4, 5, 6])
+
+    def test_error_report_download(self):
+        self._upload([["report_student", "Final", 90], ["missing_student", "Final", 70]])
+        report = GradeImport.objects.get(course=self.course)
+
+        page = self.client.get(reverse("upload_grades", args=[self.course.id]))
+        url = reverse("grade_import_errors", args=[self.course.id, report.id])
+        self.assertContains(page, url)
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        lines = response.content.decode("utf-8-sig").splitlines()
+        self.assertEqual(lines, ["row,username,component,error", "3,missing_student,Final,Öğrenci sistemde bulunamadı"])
+
+    def _preview_setup(self):
+        vize = EvaluationComponent.objects.create(course=self.course, name="Vize", percentage=0)
+        other = User.objects.create_user(username="report_other_student", password="testpass123")
+        self.course.students.add(other)
+        Grade.objects.create(student=self.student, component=self.component, score=Decimal("70"))
+        Grade.objects.create(student=other, component=self.component, score=Decimal("55.5"))
+        return vize, other
+
+    def test_dry_run_previews_without_writing(self):
+        vize, other = self._preview_setup()
+        excel = BytesIO()
+        pd.DataFrame([
+            ["report_student", "Final", 80],  # güncellenecek
+            ["report_other_student", "Final", 55.5],  # aynı
+            ["report_student", "Vize", 60],  # yeni
+            ["missing_student", "Final", 10],  # hatalı
+        ], columns=["username", "component_name", "score"]).to_excel(excel, index=False)
+        excel.seek(0)
+        excel.name = "notlar.xlsx"
+
+        # mevcut notlar tek sorguda okunur; satır sayısından bağımsız
+        with self.assertNumQueries(8):
+            response = self.client.post(reverse("upload_grades", args=[self.course.id]),
+                                        {"file": excel, "dry_run": "1"})
+
+        report = GradeImport.objects.get(course=self.course)
+        self.assertRedirects(response, reverse("grade_import_preview", args=[self.course.id, report.id]))
+        self.assertEqual(report.status, GradeImport.STATUS_PREVIEW)
+        self.assertEqual(
+            (report.created_count, report.updated_count, report.unchanged_count, report.error_count, report.imported_count),
+            (1, 1, 1, 1, 0),
+        )
+        self.assertEqual(report.changes[0], {
+            "student": self.student.id, "component": self.component.id, "username": "report_student",
+            "component_name": "Final", "created": False, "old": "70.00", "new": "80.00",
+        })
+        # hiçbir not yazılmadı
+        self.assertEqual(Grade.objects.get(student=self.student, component=self.component).score, Decimal("70"))
+        self.assertFalse(Grade.objects.filter(component=vize).exists())
+
+        page = self.client.get(response.url)
+        self.assertContains(page, "Onayla ve 2 Notu Kaydet")
+
+    def test_confirm_applies_stored_preview_once(self):
+        vize, other = self._preview_setup()
+        excel = BytesIO()
+        pd.DataFrame([["report_student", "Final", 80], ["report_student", "Vize", 60]],
+                     columns=["username", "component_name", "score"]).to_excel(excel, index=False)
+        excel.seek(0)
+        excel.name = "notlar.xlsx"
+        self.client.post(reverse("upload_grades", args=[self.course.id]), {"file": excel, "dry_run": "1"})
+        report = GradeImport.objects.get(course=self.course)
+        url = reverse("grade_import_confirm", args=[self.course.id, report.id])
+
+        # onay dosyayı tekrar okumaz
+        with patch("course_management.spreadsheets.read_excel_rows", side_effect=AssertionError):
+            response = self.client.post(url)
+
+        self.assertRedirects(response, reverse("upload_grades", args=[self.course.id]))
+        self.assertEqual(Grade.objects.get(student=self.student, component=self.component).score, Decimal("80"))
+        self.assertEqual(Grade.objects.get(student=self.student, component=vize).score, Decimal("60"))
+        report.refresh_from_db()
+        self.assertEqual((report.status, report.imported_count, report.changes), (GradeImport.STATUS_APPLIED, 2, []))
+
+        response = self.client.post(url)
+        self.assertIn("zaten uygulanmış", [str(m) for m in get_messages(response.wsgi_request)][-1])
+        self.assertEqual(Grade.objects.get(student=self.student, component=self.component).version, 1)
+
+    def test_confirm_keeps_grades_changed_after_preview(self):
+        vize, other = self._preview_setup()
+        self._upload([
+            ["report_student", "Final", 80],
+            ["report_other_student", "Final", 65],
+            ["report_student", "Vize", 60],
+            ["report_other_student", "Vize", 40],
+        ], dry_run="1")
+        report = GradeImport.objects.get(course=self.course)
+
+        # önizleme ile onay arasında: bir not autosave ile değişti, biri silindi, biri aynı değere getirildi,
+        # yeni not beklenen hücreye başkası not girdi
+        Grade.objects.filter(student=self.student, component=self.component).update(score=Decimal("75"))
+        Grade.objects.create(student=self.student, component=vize, score=Decimal("60"))
+        Grade.objects.create(student=other, component=vize, score=Decimal("30"))
+
+        response = self.client.post(reverse("grade_import_confirm", args=[self.course.id, report.id]))
+
+        self.assertEqual(Grade.objects.get(student=self.student, component=self.component).score, Decimal("75"))
+        self.assertEqual(Grade.objects.get(student=other, component=self.component).score, Decimal("65"))
+        self.assertEqual(Grade.objects.get(student=other, component=vize).score, Decimal("30"))
+        report.refresh_from_db()
+        self.assertEqual((report.imported_count, report.conflict_count), (1, 2))
+        self.assertEqual([(e["username"], e["component"]) for e in report.errors], [
+            ("report_student", "Final"), ("report_other_student", "Vize"),
+        ])
+        self.assertIn("şu anki not: 75.00", report.errors[0]["error"])
+        self.assertIn("2 not önizlemeden sonra", [str(m) for m in get_messages(response.wsgi_request)][-1])
+
+    def test_upload_skips_unchanged_grades(self):
+        Grade.objects.create(student=self.student, component=self.component, score=Decimal("90"))
+
+        self._upload([["report_student", "Final", 90]])
+
+        grade = Grade.objects.get(student=self.student, component=self.component)
+        self.assertEqual(grade.version, 0)
+        report = GradeImport.objects.get(course=self.course)
+        self.assertEqual((report.imported_count, report.unchanged_count), (0, 1))
+
+    def test_out_of_range_scores_are_reported(self):
+        self._upload([
+            ["report_student", "Final", 1000],
+            ["report_student", "Final", -20],
+            ["report_student", "Final", 100],
+        ])
+
+        self.assertEqual(Grade.objects.get(student=self.student, component=self.component).score, Decimal("100"))
+        report = GradeImport.objects.get(course=self.course)
+        self.assertEqual([(e["row"], e["error"]) for e in report.errors], [
+            (2, "Not 0-100 arasında olmalıdır: 1000"),
+            (3, "Not 0-100 arasında olmalıdır: -20"),
+        ])
+
+    def test_wide_format_one_column_per_component(self):
+        vize = EvaluationComponent.objects.create(course=self.course, name="Vize", percentage=0)
+        other = User.objects.create_user(username="report_other_student", password="testpass123")
+        self.course.students.add(other)
+
+        with patch("teacher.views.upsert_grades", wraps=upsert_grades) as upsert:
+            self._upload([
+                ["report_student", "Ada", 55, 90, 1],
+                ["report_other_student", "Can", None, 75.5, 2],  # boş vize atlanır
+                ["missing_student", "Ece", 10, 20, 3],
+                ["report_student", "Ada", "girmedi", 90, 4],
+            ], columns=["username", "first_name", "Vize", " Final ", "Proje"])
+
+        upsert.assert_called_once()
+        self.assertEqual(Grade.objects.get(student=self.student, component=vize).score, Decimal("55"))
+        self.assertEqual(Grade.objects.get(student=self.student, component=self.component).score, Decimal("90"))
+        self.assertEqual(Grade.objects.get(student=other, component=self.component).score, Decimal("75.5"))
+        self.assertFalse(Grade.objects.filter(student=other, component=vize).exists())
+
+        report = GradeImport.objects.get(course=self.course)
+        self.assertEqual((report.total_rows, report.imported_count), (4, 3))
+        # eşleşmeyen sütun satır başına değil bir kez raporlanır
+        self.assertEqual([(e["row"], e["component"]) for e in report.errors], [
+            (1, "Proje"), (4, ""), (5, "Vize"),
+        ])
+
+    def test_only_enrolled_students_are_graded(self):
+        outsider = User.objects.create_user(username="report_outsider", password="testpass123")
+
+        self._upload([
+            ["report_student", 90],
+            ["report_outsider", 80],
+            ["report_instructor", 70],
+            ["missing_student", 60],
+        ], columns=["username", "Final"])
+
+        self.assertEqual(list(Grade.objects.values_list("student__username", flat=True)), ["report_student"])
+        self.assertFalse(Grade.objects.filter(student__in=[outsider, self.instructor]).exists())
+        report = GradeImport.objects.get(course=self.course)
+        self.assertEqual([(e["username"], e["error"]) for e in report.errors], [
+            ("report_outsider", "Öğrenci bu derse kayıtlı değil"),
+            ("report_instructor", "Öğrenci bu derse kayıtlı değil"),
+            ("missing_student", "Öğrenci sistemde bulunamadı"),
+        ])
+
+    def test_wide_format_requires_username_column(self):
+        self._upload([["Ada", 90]], columns=["first_name", "Final"])
+
+        report = GradeImport.objects.get(course=self.course)
+        self.assertEqual(report.errors, [{"row": 1, "username": "", "component": "", "error": "username sütunu yok"}])
+        self.assertFalse(Grade.objects.exists())
+
+    def test_unreadable_excel_is_rejected(self):
+        excel = BytesIO(b"PK\x03\x04 yarim kalmis bir xlsx")
+        excel.name = "notlar.xlsx"
+
+        response = self.client.post(reverse("upload_grades", args=[self.course.id]), {"file": excel})
+
+        self.assertRedirects(response, reverse("upload_grades", args=[self.course.id]))
+        self.assertIn("Dosya okunamadı", [str(m) for m in get_messages(response.wsgi_request)][0])
+        self.assertFalse(GradeImport.objects.exists())
+
+    def _upload_csv(self, content, encoding="utf-8", name="notlar.csv", **data):
+        upload = SimpleUploadedFile(name, content.encode(encoding), content_type="text/csv")
+        return self.client.post(reverse("upload_grades_csv", args=[self.course.id]), {"file": upload, **data})
+
+    def test_csv_upload_page(self):
+        response = self.client.get(reverse("upload_grades_csv", args=[self.course.id]))
+
+        self.assertContains(response, "CSV ile Toplu Not Yükleme")
+        self.assertContains(response, reverse("upload_grades", args=[self.course.id]))
+
+    def test_csv_upload_sniffs_encoding_and_delimiter(self):
+        vize = EvaluationComponent.objects.create(course=self.course, name="Sınav Öncesi", percentage=0)
+        other = User.objects.create_user(username="öğrenci_çağrı", password="testpass123")
+        self.course.students.add(other)
+        content = (
+            "username;first_name;Final;Sınav Öncesi\r\n"
+            "report_student;Ayşe;87,5;60\r\n"
+            "öğrenci_çağrı;Şule;;45,25\r\n"
+            "missing_student;Ece;10;20\r\n"
+        )
+
+        # Windows-1254 (Türkçe Excel'in CSV çıktısı), noktalı virgül ayraç ve ondalık virgül; pandas kullanılmaz
+        with patch("course_management.spreadsheets._pandas", side_effect=AssertionError), \
+                patch("teacher.views.upsert_grades", wraps=upsert_grades) as upsert:
+            response = self._upload_csv(content, encoding="cp1254")
+
+        self.assertRedirects(response, reverse("upload_grades_csv", args=[self.course.id]))
+        upsert.assert_called_once()
+        self.assertEqual(Grade.objects.get(student=self.student, component=self.component).score, Decimal("87.5"))
+        self.assertEqual(Grade.objects.get(student=self.student, component=vize).score, Decimal("60"))
+        self.assertEqual(Grade.objects.get(student=other, component=vize).score, Decimal("45.25"))
+        self.assertFalse(Grade.objects.filter(student=other, component=self.component).exists())
+
+        report = GradeImport.objects.get(course=self.course)
+        self.assertEqual((report.source, report.total_rows, report.imported_count), ("csv", 3, 3))
+        self.assertEqual([e["username"] for e in report.errors], ["missing_student"])
+
+    def test_csv_upload_long_format_with_bom(self):
+        content = "\ufeffusername,component_name,score\nreport_student,Final,72.5\nreport_student,Vize,10\n"
+
+        self._upload_csv(content)
+
+        self.assertEqual(Grade.objects.get(student=self.student, component=self.component).score, Decimal("72.5"))
+        report = GradeImport.objects.get(course=self.course)
+        self.assertEqual(report.errors, [{
+            "row": 3, "username": "report_student", "component": "Vize", "error": "'Vize' adında değerlendirme bileşeni yok",
+        }])
+
+    def test_csv_rejects_non_finite_scores(self):
+        vize = EvaluationComponent.objects.create(course=self.course, name="Vize", percentage=0)
+
+        self._upload_csv("username,Final,Vize\nreport_student,inf,nan\n")
+
+        self.assertFalse(Grade.objects.exists())
+        report = GradeImport.objects.get(course=self.course)
+        self.assertEqual([(e["component"], e["error"]) for e in report.errors], [
+            ("Final", "Not 0-100 arasında olmalıdır: inf"),
+            (vize.name, "Not 0-100 arasında olmalıdır: nan"),
+        ])
+
+    def test_dry_run_with_invalid_scores_does_not_fail(self):
+        content = "username,component_name,score\nreport_student,Final,inf\nreport_student,Final,nan\n" \
+                  "report_student,Final,1000\n"
+
+        for data in ({"dry_run": "1"}, {}):
+            response = self._upload_csv(content, **data)
+            self.assertEqual(response.status_code, 302)
+
+        self.assertFalse(Grade.objects.exists())
+        for report in GradeImport.objects.filter(course=self.course):
+            self.assertEqual((report.created_count, report.updated_count, report.error_count), (0, 0, 3))
+
+    def test_csv_dry_run_returns_to_csv_page(self):
+        self._upload_csv("username\tcomponent_name\tscore\nreport_student\tFinal\t66\n", dry_run="1")
+        report = GradeImport.objects.get(course=self.course)
+        self.assertEqual((report.source, report.status), ("csv", GradeImport.STATUS_PREVIEW))
+        self.assertFalse(Grade.objects.exists())
+
+        response = self.client.post(reverse("grade_import_confirm", args=[self.course.id, report.id]))
+
+        self.assertRedirects(response, reverse("upload_grades_csv", args=[self.course.id]))
+        self.assertEqual(Grade.objects.get(student=self.student, component=self.component).score, Decimal("66"))
+
+    def test_csv_upload_rejects_other_extensions(self):
+        response = self._upload_csv("username,component_name,score\n", name="notlar.xlsx")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["form"].errors)
+        self.assertFalse(GradeImport.objects.exists())
+
+    def test_error_report_is_limited_to_course_instructors(self):
+        self._upload([["missing_student", "Final", 70]])
+        report = GradeImport.objects.get(course=self.course)
+        other = User.objects.create_user(username="report_other", password="testpass123")
+        Profile.objects.filter(user=other).update(role="instructor")
+        self.client.login(username="report_other", password="testpass123")
+
+        response = self.client.get(reverse("grade_import_errors", args=[self.course.id, report.id]))
+
+        self.assertEqual(response.status_code, 404)
+
+
 class RollbackError(Exception):
     pass
 
@@ -316,6 +923,16 @@ class TeacherRollbackTest(TransactionTestCase):
 
         self.client.login(username=self.instructor.username, password="testpass123")
 
+    def _fail_after_write(self, model):
+        """bulk_create partiyi gerçekten yazar, ardından hata verir --> yazılanlar geri alınmalı."""
+        bulk_create = model.objects.bulk_create
+
+        def write_then_fail(*args, **kwargs):
+            bulk_create(*args, **kwargs)
+            raise RollbackError
+
+        return patch.object(model.objects, "bulk_create", side_effect=write_then_fail)
+
     def test_manage_course_update_grades_rollback(self):
         url = reverse('manage_course', args=[self.course.id])
         post_data = {
@@ -323,7 +940,7 @@ class TeacherRollbackTest(TransactionTestCase):
             f'grade_{self.student.id}_{self.component.id}': '90.0'
         }
 
-        with patch.object(Grade, 'save', side_effect=RollbackError):
+        with self._fail_after_write(Grade):
             try:
                 self.client.post(url, post_data)
             except RollbackError:
@@ -339,7 +956,7 @@ class TeacherRollbackTest(TransactionTestCase):
             f'weight_{self.component.id}_{self.outcome.id}': '5'
         }
 
-        with patch('course_management.models.OutcomeWeight.objects.update_or_create', side_effect=RollbackError):
+        with self._fail_after_write(OutcomeWeight):
             try:
                 self.client.post(url, post_data)
             except RollbackError:
@@ -369,7 +986,7 @@ class TeacherRollbackTest(TransactionTestCase):
             f'grade_{s2.id}_{self.component.id}': '100'
         }
 
-        with patch.object(Grade, 'save', side_effect=[None, RollbackError]):
+        with self._fail_after_write(Grade):
             try:
                 self.client.post(url, post_data)
             except RollbackError:
@@ -403,7 +1020,7 @@ class TeacherRollbackTest(TransactionTestCase):
         excel.name = 'test.xlsx'
 
         url = reverse('upload_grades', args=[self.course.id])
-        with patch('course_management.models.Grade.objects.update_or_create', side_effect=[None, RollbackError]):
+        with self._fail_after_write(Grade):
             try:
                 self.client.post(url, {'file': excel})
             except RollbackError:
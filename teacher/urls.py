@@ -41,6 +41,21 @@ urlpatterns = [
         views.upload_grades,
         name='upload_grades'  # Bu ismi, 'redirect' fonksiyonunda kullandık.
     ),
+    path(
+        "course/<int:course_id>/upload-grades/<int:import_id>/preview/",
+        views.grade_import_preview,
+        name="grade_import_preview",
+    ),
+    path(
+        "course/<int:course_id>/upload-grades/<int:import_id>/confirm/",
+        views.grade_import_confirm,
+        name="grade_import_confirm",
+    ),
+    path(
+        "course/<int:course_id>/upload-grades/<int:import_id>/errors.csv",
+        views.grade_import_errors,
+        name="grade_import_errors",
+    ),
 
     path(
         "course/<int:course_id>/components/<int:component_id>/edit/",
@@ -73,7 +88,13 @@ urlpatterns = [
 
    path("course/<int:course_id>/weights/", views.course_weights, name="course_weights"),
 
-   path("course/<int:course_id>/csv-upload/", views.instructor_csv_upload_placeholder, name="instructor_csv_upload_placeholder"),
+   path("course/<int:course_id>/csv-upload/", views.upload_grades_csv, name="upload_grades_csv"),
+
+   path("course/<int:course_id>/grades/", views.course_grades, name="course_grades"),
+
+   path("course/<int:course_id>/gradebook.json", views.course_gradebook_api, name="course_gradebook_api"),
+
+   path("course/<int:course_id>/grades/autosave/", views.course_grades_autosave, name="course_grades_autosave"),
 
-   path("course/<int:course_id>/grades/", views.manage_course, name="course_grades")
+   path("course/<int:course_id>/lo-scores/", views.course_lo_scores, name="course_lo_scores"),
 ]
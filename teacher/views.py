@@ -1,36 +1,186 @@
+import csv
+import json
+import time
 from decimal import Decimal, InvalidOperation
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.db.models import F
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import require_POST
+from course_management import grade_import, metrics, spreadsheets
+from course_management.bulk import bulk_upsert, upsert_grades
+from course_management.retry import DATABASE_BUSY_MESSAGE, DatabaseBusy, retry_on_lock
 from course_management.decorators import user_is_instructor
+from course_management.shortcuts import alist, arender
 from django.shortcuts import render, redirect
 from django.contrib.auth import get_user_model
 User = get_user_model()
-import pandas as pd
 from course_management.forms import (
     EvaluationComponentForm, GradeForm, LearningOutcomeForm, SyllabusForm,
 )
 from course_management.models import (
-    Course, EvaluationComponent, Grade, LearningOutcome, OutcomeWeight,
+    Course, EvaluationComponent, Grade, GradeImport, LearningOutcome, OutcomeWeight,
 )
 
+# bu sayıdan kalabalık sınıflarda not tablosu sunucuda çizilmez,
+# sanal (virtualized) tablo JSON API'den parça parça yükler
+GRADEBOOK_VIRTUAL_THRESHOLD = 150
+GRADEBOOK_PAGE_SIZE = 100
+GRADEBOOK_MAX_PAGE_SIZE = 500
+# autosave isteğinde tek seferde gönderilebilecek en fazla hücre
+AUTOSAVE_MAX_CELLS = 50
+# içe aktarma kaynağı --> o kaynağın yükleme sayfası
+GRADE_UPLOAD_PAGES = {"excel": "upload_grades", "csv": "upload_grades_csv"}
+# not yükleme önizlemesinde listelenen en fazla değişiklik/hata satırı (hataların tamamı CSV olarak indirilir)
+GRADE_IMPORT_PREVIEW_ROWS = 100
+
 @login_required
 @user_is_instructor
-def instructor_dashboard(request):
+async def instructor_dashboard(request):
     """Öğretim görevlisinin derslerini listeler."""
-    return render(request, "teacher/instructor_dashboard.html", {
-        "courses": Course.objects.filter(instructors=request.user)
+    return await arender(request, "teacher/instructor_dashboard.html", {
+        "courses": await alist(Course.objects.filter(instructors=request.user))
     })
 
+def _round_score(score):
+    return round(score, 2) if score is not None else None
+
+
+def _build_student_lo_scores(course, outcomes, students):
+    """Öğrenci x LO başarı matrisini hesaplar (sadece LO analizi endpoint'i kullanır)."""
+    lo_score_map = {
+        (row["student_id"], row["outcome_id"]): row["lo_score"]
+        for row in Grade.objects.filter(component__course=course, student__in=students).lo_scores()
+    }
+
+    return [
+        {
+            "student": student,
+            "lo_scores": [
+                {"outcome": outcome, "score": _round_score(lo_score_map.get((student.id, outcome.id)))}
+                for outcome in outcomes
+            ],
+        }
+        for student in students
+    ]
+
+
+def _parse_grade_value(value):
+    """Formdan gelen not metnini Decimal'e çevirir. Boş ise None, geçersiz ise ValueError."""
+    value = value.strip() if value else ""
+    if not value:
+        return None
+    try:
+        score = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(value)
+    # NaN ile karşılaştırma InvalidOperation atar; sonsuz da aralık dışıdır
+    if not score.is_finite() or not (Decimal("0") <= score <= Decimal("100")):
+        raise ValueError(value)
+    return score
+
+
+@retry_on_lock()
+@transaction.atomic
+def _save_changed_grades(course, post):
+    """
+    Not formundan sadece gerçekten değişen hücreleri yazar.
+    Her hücre için form, sayfa açıldığındaki değeri (orig_grade_<öğrenci>_<bileşen>) da taşır:
+      - yeni değer orijinalle aynıysa hücre hiç işlenmez,
+      - kalanlar tek sorguyla veritabanındaki güncel değerle karşılaştırılır,
+      - veritabanı değeri orijinalden farklıysa (başka biri değiştirmiş) üzerine yazılmaz.
+    (değişen, değişmeyen, çakışan) hücre sayılarını döner.
+    """
+    submitted = {}
+    unchanged = 0
+    for key, value in post.items():
+        if not key.startswith("grade_"):
+            continue
+
+        parts = key.split("_")
+        if len(parts) != 3:
+            continue
+
+        try:
+            cell = (int(parts[1]), int(parts[2]))
+            score = _parse_grade_value(value)
+        except ValueError:
+            continue
+
+        orig_key = f"orig_{key}"
+        if orig_key in post:
+            try:
+                original = _parse_grade_value(post[orig_key])
+            except ValueError:
+                original = None
+            if original == score:
+                unchanged += 1
+                continue
+            submitted[cell] = (score, original, True)
+        else:
+            submitted[cell] = (score, None, False)
+
+    if not submitted:
+        return 0, unchanged, 0
+
+    # hücreler sadece bu dersin bileşenleri ve kayıtlı öğrencileri için yazılabilir
+    component_ids = set(
+        EvaluationComponent.objects.filter(course=course, id__in={c for _, c in submitted})
+        .values_list("id", flat=True)
+    )
+    student_ids = set(
+        course.students.filter(id__in={s for s, _ in submitted}).values_list("id", flat=True)
+    )
+    current = {
+        (g.student_id, g.component_id): g
+        for g in Grade.objects.filter(student_id__in=student_ids, component_id__in=component_ids)
+    }
+
+    to_write = []
+    conflicts = 0
+    for (student_id, component_id), (score, original, has_original) in submitted.items():
+        if student_id not in student_ids or component_id not in component_ids:
+            continue
+
+        grade = current.get((student_id, component_id))
+        current_score = grade.score if grade else None
+        if current_score == score:
+            unchanged += 1
+            continue
+        if has_original and current_score != original:
+            conflicts += 1
+            continue
+
+        to_write.append(Grade(student_id=student_id, component_id=component_id, score=score))
+
+    # değişen hücreler tek bir INSERT ... ON CONFLICT ile yazılır, sürümleri artırılır
+    changed = upsert_grades(to_write)
+    return changed, unchanged, conflicts
+
+
+@retry_on_lock()
+@transaction.atomic
+def _write_outcome_weights(component, weights, cleared_outcome_ids):
+    """Bileşenin LO ağırlıklarını tek upsert ile yazar, boş bırakılanları siler."""
+    bulk_upsert(OutcomeWeight, weights, unique_fields=["component", "outcome"], update_fields=["weight"])
+    if cleared_outcome_ids:
+        OutcomeWeight.objects.filter(component=component, outcome_id__in=cleared_outcome_ids).delete()
+
+
 @login_required
 @user_is_instructor
-def manage_course(request, course_id):
+def manage_course(request, course_id, tab="manage"):
+    """
+    Dersin yönetim sayfası. Aynı view birden fazla sekmeyi besler:
+    'manage' sekmesi bileşen/syllabus/LO listelerini, 'grades' sekmesi not tablosunu gösterir.
+    Ağır bağlamlar (not tablosu) sadece ilgili sekmede hesaplanır,
+    LO başarı matrisi ise ayrı endpoint'ten (course_lo_scores) istek üzerine yüklenir.
+    """
     course = get_object_or_404(Course, id=course_id, instructors=request.user)
     components = EvaluationComponent.objects.filter(course=course).order_by("id")
     outcomes = LearningOutcome.objects.filter(course=course)
-    students = course.students.all().order_by("last_name", "first_name")
 
     syllabus_form = SyllabusForm(instance=course)
     eval_form = EvaluationComponentForm()
@@ -66,100 +216,263 @@ def manage_course(request, course_id):
 
         elif "submit_grades" in request.POST:
             try:
-                with transaction.atomic():
-                    for key, value in request.POST.items():
-                        if not key.startswith("grade_"):
-                            continue
-
-                        parts = key.split("_")
-                        if len(parts) != 3:
-                            continue
-
-                        _, student_id, component_id = parts
-                        score_value = value.strip() if value else ""
-
-                        if score_value:
-                            try:
-                                score_decimal = Decimal(score_value)
-                                if not (Decimal("0") <= score_decimal <= Decimal("100")):
-                                    continue
-                            except (ValueError, InvalidOperation):
-                                continue
-                        else:
-                            score_decimal = None
-
-                        grade, _ = Grade.objects.get_or_create(
-                            student_id=student_id,
-                            component_id=component_id
-                        )
-                        grade.score = score_decimal
-                        grade.save()
-
-                    messages.success(request, "Notlar başarıyla kaydedildi.")
+                changed, unchanged, conflicts = _save_changed_grades(course, request.POST)
+
+                if changed:
+                    messages.success(request, f"{changed} not başarıyla kaydedildi.")
+                else:
+                    messages.success(request, "Değişen not bulunmadı, kayıt yapılmadı.")
+                if conflicts:
+                    messages.warning(
+                        request,
+                        f"{conflicts} not siz düzenlerken başka biri tarafından değiştirildiği için kaydedilmedi. "
+                        "Sayfayı yenileyip tekrar kontrol edin."
+                    )
+            except DatabaseBusy:
+                messages.error(request, DATABASE_BUSY_MESSAGE)
             except Exception as e:
                 messages.error(request, f"Notları kaydederken bir hata oluştu: {e}")
 
-            return redirect("course_home", course_id=course.id)
+            return redirect("course_grades", course_id=course.id)
 
-    grade_map = {
-        (g.student_id, g.component_id): g.score
-        for g in Grade.objects.filter(component__in=components, student__in=students)
+    context = {
+        "course": course,
+        "components": components,
+        "outcomes": outcomes,
+        "eval_form": eval_form,
+        "outcome_form": outcome_form,
+        "syllabus_form": syllabus_form,
+        "active_tab": tab,
     }
 
-    student_grade_rows = [
-        {
-            "student_object": s,
-            "grades_list": [
-                {"component_id": c.id, "score": grade_map.get((s.id, c.id))}
-                for c in components
-            ],
+    # not tablosu sadece not girişi sekmesinde hesaplanır
+    if tab == "grades":
+        student_count = course.students.count()
+        context["student_count"] = student_count
+        context["gradebook_page_size"] = GRADEBOOK_PAGE_SIZE
+
+        if student_count > GRADEBOOK_VIRTUAL_THRESHOLD:
+            # kalabalık sınıf: satırlar course_gradebook_api'den görünür pencere kadar yüklenir
+            context["gradebook_virtual"] = True
+            return render(request, "teacher/course_manage_detail.html", context)
+
+        students = course.students.all().order_by("last_name", "first_name")
+        grade_map = {
+            (g.student_id, g.component_id): g
+            for g in Grade.objects.filter(component__in=components, student__in=students)
         }
-        for s in students
-    ]
+        context["students"] = students
+        context["student_grade_rows"] = [
+            {
+                "student_object": s,
+                "grades_list": [
+                    {
+                        "component_id": c.id,
+                        "score": getattr(grade_map.get((s.id, c.id)), "score", None),
+                        "version": getattr(grade_map.get((s.id, c.id)), "version", 0),
+                    }
+                    for c in components
+                ],
+            }
+            for s in students
+        ]
+
+    return render(request, "teacher/course_manage_detail.html", context)
 
-    comp_lo_weight_map = {
-        (w.component_id, w.outcome_id): w.weight
-        for w in OutcomeWeight.objects.filter(component__in=components).select_related("component", "outcome")
-    }
 
-    student_lo_scores = []
-    for student in students:
-        student_lo_data = []
-        for outcome in outcomes:
-            lo_weighted_score = Decimal("0")
-            lo_total_weight = Decimal("0")
-
-            for c in components:
-                score = grade_map.get((student.id, c.id))
-                weight = comp_lo_weight_map.get((c.id, outcome.id))
-                if score is None or weight is None:
-                    continue
-                lo_weighted_score += Decimal(score) * Decimal(weight)
-                lo_total_weight += Decimal(weight)
-
-            student_lo_data.append({
-                "outcome": outcome,
-                "score": float((lo_weighted_score / lo_total_weight).quantize(Decimal("0.01"))) if lo_total_weight > 0 else None
-            })
+@login_required
+@user_is_instructor
+def course_gradebook_api(request, course_id):
+    """
+    Not tablosunu sayfalı JSON olarak döner (sanal tablo için).
+    ?offset=&limit= ile sadece görünen pencere kadar öğrenci okunur,
+    her satır öğrenci id'si, adı ve bileşen sırasına göre kompakt bir not dizisi taşır.
+    """
+    course = get_object_or_404(Course, id=course_id, instructors=request.user)
 
-        student_lo_scores.append({"student": student, "lo_scores": student_lo_data})
+    try:
+        offset = max(int(request.GET.get("offset", 0)), 0)
+        limit = int(request.GET.get("limit", GRADEBOOK_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({"error": "offset ve limit sayı olmalıdır."}, status=400)
+    limit = min(max(limit, 1), GRADEBOOK_MAX_PAGE_SIZE)
 
-    return render(
-        request,
-        "teacher/course_manage_detail.html",
-        {
-            "course": course,
-            "components": components,
-            "outcomes": outcomes,
-            "students": students,
-            "student_grade_rows": student_grade_rows,
-            "student_lo_scores": student_lo_scores,
-            "eval_form": eval_form,
-            "outcome_form": outcome_form,
-            "syllabus_form": syllabus_form,
-            "active_tab": "manage",
-        },
+    components = list(
+        EvaluationComponent.objects.filter(course=course).order_by("id").values("id", "name", "percentage")
+    )
+    students = course.students.all()
+    total = students.count()
+    page = list(
+        students.order_by("last_name", "first_name", "id")
+        .values_list("id", "username", "first_name", "last_name")[offset:offset + limit]
+    )
+
+    component_index = {c["id"]: i for i, c in enumerate(components)}
+    row_index = {student_id: i for i, (student_id, *_rest) in enumerate(page)}
+    scores = [[None] * len(components) for _ in page]
+    versions = [[0] * len(components) for _ in page]
+
+    if page and components:
+        for student_id, component_id, score, version in Grade.objects.filter(
+            student_id__in=row_index, component_id__in=component_index
+        ).values_list("student_id", "component_id", "score", "version"):
+            i, j = row_index[student_id], component_index[component_id]
+            versions[i][j] = version
+            if score is not None:
+                scores[i][j] = float(score)
+
+    return JsonResponse({
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "components": components,
+        "rows": [
+            {
+                "id": student_id,
+                "username": username,
+                "name": f"{first_name} {last_name}".strip() or username,
+                "scores": scores[i],
+                "versions": versions[i],
+            }
+            for i, (student_id, username, first_name, last_name) in enumerate(page)
+        ],
+    })
+
+
+@retry_on_lock()
+@transaction.atomic
+def _autosave_cells(cells):
+    """
+    Hücreleri sürüm kontrollü (version) koşullu UPDATE ile yazar.
+    (kaydedilen hücreler, çakışan (öğrenci, bileşen) listesi) döner.
+    """
+    saved, conflicted = [], []
+    for student_id, component_id, score, version in cells:
+        updated = Grade.objects.filter(
+            student_id=student_id, component_id=component_id, version=version
+        ).update(score=score, version=F("version") + 1)
+
+        if updated:
+            saved.append({"student": student_id, "component": component_id, "version": version + 1})
+            continue
+
+        if version == 0:
+            # henüz not satırı yok: ilk yazan oluşturur, aynı anda oluşturan diğer kişi çakışma alır.
+            # satır upsert_grades gibi sürüm 1 ile oluşturulur; boş hücreyi (sürüm 0) gösteren diğer
+            # istemciler version=0 koşuluna takılır ve yeni notun üzerine yazamaz
+            try:
+                with transaction.atomic():
+                    Grade.objects.create(student_id=student_id, component_id=component_id, score=score, version=1)
+                saved.append({"student": student_id, "component": component_id, "version": 1})
+                continue
+            except IntegrityError:
+                pass
+
+        conflicted.append((student_id, component_id))
+    return saved, conflicted
+
+
+@login_required
+@user_is_instructor
+@require_POST
+def course_grades_autosave(request, course_id):
+    """
+    Tek hücre veya küçük bir hücre grubu için not kaydeder (autosave).
+    Her hücre okunduğu andaki sürümü (version) taşır; sürüm veritabanındakiyle
+    eşleşmezse not üzerine yazılmaz, güncel değer çakışma (conflict) olarak döner.
+
+    Beklenen gövde: {"cells": [{"student": 1, "component": 2, "score": "85.5", "version": 3}, ...]}
+    """
+    course = get_object_or_404(Course, id=course_id, instructors=request.user)
+
+    try:
+        cells = json.loads(request.body)["cells"]
+        if not isinstance(cells, list):
+            raise TypeError
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({"success": False, "message": "Geçersiz istek gövdesi."}, status=400)
+
+    if len(cells) > AUTOSAVE_MAX_CELLS:
+        return JsonResponse(
+            {"success": False, "message": f"Tek istekte en fazla {AUTOSAVE_MAX_CELLS} hücre gönderilebilir."},
+            status=400,
+        )
+
+    parsed, errors = [], []
+    for cell in cells:
+        try:
+            student_id, component_id = int(cell["student"]), int(cell["component"])
+            version = int(cell.get("version") or 0)
+            raw_score = "" if cell.get("score") is None else str(cell["score"]).strip()
+            score = Decimal(raw_score) if raw_score else None
+        except (KeyError, TypeError, ValueError, InvalidOperation):
+            errors.append({"cell": cell, "error": "Hücre bilgisi okunamadı."})
+            continue
+        if score is not None and (not score.is_finite() or not (Decimal("0") <= score <= Decimal("100"))):
+            errors.append({"student": student_id, "component": component_id, "error": "Not 0-100 arasında olmalıdır."})
+            continue
+        parsed.append((student_id, component_id, score, version))
+
+    # hücreler bu derse ait mi --> iki sorgu ile topluca kontrol edilir
+    component_ids = set(
+        EvaluationComponent.objects.filter(course=course, id__in={c for _, c, _, _ in parsed})
+        .values_list("id", flat=True)
     )
+    student_ids = set(
+        course.students.filter(id__in={s for s, _, _, _ in parsed}).values_list("id", flat=True)
+    )
+
+    cells = []
+    for cell in parsed:
+        student_id, component_id = cell[0], cell[1]
+        if student_id not in student_ids or component_id not in component_ids:
+            errors.append({"student": student_id, "component": component_id, "error": "Hücre bu derse ait değil."})
+        else:
+            cells.append(cell)
+
+    try:
+        saved, conflicted = _autosave_cells(cells)
+    except DatabaseBusy:
+        return JsonResponse({"success": False, "message": DATABASE_BUSY_MESSAGE}, status=503)
+
+    conflicts = []
+    if conflicted:
+        current = {
+            (g.student_id, g.component_id): g
+            for g in Grade.objects.filter(
+                student_id__in={s for s, _ in conflicted}, component_id__in={c for _, c in conflicted}
+            )
+        }
+        for key in conflicted:
+            grade = current.get(key)
+            conflicts.append({
+                "student": key[0],
+                "component": key[1],
+                "score": None if grade is None or grade.score is None else str(grade.score),
+                "version": grade.version if grade else 0,
+            })
+
+    return JsonResponse({
+        "success": not conflicts and not errors,
+        "saved": saved,
+        "conflicts": conflicts,
+        "errors": errors,
+    })
+
+
+@login_required
+@user_is_instructor
+def course_lo_scores(request, course_id):
+    """Öğrenci x LO başarı matrisini parça (partial) olarak döner, not sekmesinden istek üzerine yüklenir."""
+    course = get_object_or_404(Course, id=course_id, instructors=request.user)
+    outcomes = LearningOutcome.objects.filter(course=course)
+    students = course.students.all().order_by("last_name", "first_name")
+
+    return render(request, "teacher/partials/lo_scores_table.html", {
+        "course": course,
+        "outcomes": outcomes,
+        "student_lo_scores": _build_student_lo_scores(course, outcomes, students),
+    })
 
 
 @login_required
@@ -213,16 +526,21 @@ def manage_outcome_weights(request, component_id):
     outcomes = course.learning_outcomes.all()
 
     if request.method == "POST":
-        with transaction.atomic():
-            for outcome in outcomes:
-                value = request.POST.get(f"weight_{outcome.id}")
-                if value:
-                    OutcomeWeight.objects.update_or_create(component=component, outcome=outcome,
-                                                           defaults={"weight": int(value)})
-                else:
-                    OutcomeWeight.objects.filter(component=component, outcome=outcome).delete()
-            messages.success(request, "Outcome ağırlıkları başarıyla güncellendi.")
-            return redirect("instructor_dashboard")
+        weights, cleared = [], []
+        for outcome in outcomes:
+            value = request.POST.get(f"weight_{outcome.id}")
+            if value:
+                weights.append(OutcomeWeight(component=component, outcome=outcome, weight=int(value)))
+            else:
+                cleared.append(outcome.id)
+
+        try:
+            _write_outcome_weights(component, weights, cleared)
+        except DatabaseBusy:
+            messages.error(request, DATABASE_BUSY_MESSAGE)
+            return redirect("manage_outcome_weights", component_id=component.id)
+        messages.success(request, "Outcome ağırlıkları başarıyla güncellendi.")
+        return redirect("instructor_dashboard")
 
     weight_map = {w.outcome_id: w.weight for w in OutcomeWeight.objects.filter(component=component)}
     return render(request, "teacher/instructor_manage_outcomes.html", {
@@ -242,10 +560,11 @@ def add_grade(request, component_id):
         form = GradeForm(request.POST, course=course)
         if form.is_valid():
             student, score = form.cleaned_data["student"], form.cleaned_data["score"]
-            grade, created = Grade.objects.get_or_create(student=student, component=component, defaults={"score": score})
-            if not created:
-                grade.score = score
-            grade.save()
+            try:
+                upsert_grades([Grade(student=student, component=component, score=score)])
+            except DatabaseBusy:
+                messages.error(request, DATABASE_BUSY_MESSAGE)
+                return redirect("course_home", course_id=course.id)
             messages.success(request, "Öğrenci notu başarıyla kaydedildi.")
             return redirect("course_home", course_id=course.id)
     else:
@@ -259,7 +578,7 @@ def manage_component_weights(request, course_id=None):
 
     course = get_object_or_404(Course, id=course_id, instructors=request.user)
     course = Course.objects.filter(id=course.id).prefetch_related(
-        "evaluation_components", "learning_outcomes"
+        "evaluation_components__outcome_weights", "learning_outcomes"
     ).first()
 
     components = course.evaluation_components.all()
@@ -267,10 +586,7 @@ def manage_component_weights(request, course_id=None):
 
     component_data = []
     for component in components:
-        weight_map = {
-            w.outcome_id: w.weight
-            for w in OutcomeWeight.objects.filter(component=component)
-        }
+        weight_map = {w.outcome_id: w.weight for w in component.outcome_weights.all()}
         component_data.append({
             "component": component,
             "outcome_rows": [{"outcome": o, "weight": weight_map.get(o.id)} for o in outcomes],
@@ -289,19 +605,21 @@ def manage_component_weights(request, course_id=None):
             course=course
         )
 
-        with transaction.atomic():
-            for outcome in outcomes:
-                key = f"weight_{component.id}_{outcome.id}"
-                value = request.POST.get(key)
+        weights, cleared = [], []
+        for outcome in outcomes:
+            value = request.POST.get(f"weight_{component.id}_{outcome.id}")
+            if value is not None and str(value).strip() != "":
+                weights.append(OutcomeWeight(component=component, outcome=outcome, weight=int(value)))
+            else:
+                cleared.append(outcome.id)
 
-                if value is not None and str(value).strip() != "":
-                    OutcomeWeight.objects.update_or_create(
-                        component=component,
-                        outcome=outcome,
-                        defaults={"weight": int(value)}
-                    )
-                else:
-                    OutcomeWeight.objects.filter(component=component, outcome=outcome).delete()
+        try:
+            _write_outcome_weights(component, weights, cleared)
+        except DatabaseBusy:
+            if request.headers.get("X-Requested-With") == "XMLHttpRequest":
+                return JsonResponse({"success": False, "message": DATABASE_BUSY_MESSAGE}, status=503)
+            messages.error(request, DATABASE_BUSY_MESSAGE)
+            return redirect("course_weights", course_id=course.id)
 
         if request.headers.get("X-Requested-With") == "XMLHttpRequest":
             return JsonResponse({"success": True, "message": "Ağırlıklar başarıyla güncellendi."})
@@ -335,84 +653,166 @@ def upload_grades(request, course_id):
         if form.is_valid():
             file = request.FILES["file"]
 
-            # Not: Excel dosyasını okumak için pd.read_excel kullanıyoruz.
-            # Yüklediğiniz örnek dosya CSV idi, eğer CSV yüklüyorsanız burayı pd.read_csv olarak değiştirin.
+            # Not: Excel dosyası bellek ve süre sınırlı ayrı bir süreçte okunur (pandas web worker'ında yüklenmez);
+            # bozuk veya çok büyük bir dosya sadece o süreci öldürür. CSV dosyaları upload_grades_csv ile yüklenir.
+            import_started = time.perf_counter()
             try:
-                df = pd.read_excel(file)
-            except Exception as e:
+                header, rows = spreadsheets.read_excel_rows(file)
+            except spreadsheets.SpreadsheetError as e:
                 messages.error(request, f"Dosya okunamadı veya formatı hatalı: {e}")
                 return redirect("upload_grades", course_id=course.id)
 
-            kayit_sayisi = 0
-            eslesmeyen_ogrenciler = []
-            with transaction.atomic():
-                # DataFrame içindeki her satırı (öğrenci/not kaydı) döngüye alıyoruz
-                for index, row in df.iterrows():
-                    # Alanların boş olup olmadığını kontrol ediyoruz
-                    if not row.get('username') or not row.get('component_name') or row.get('score') is None:
-                        messages.warning(request, f"{index + 2}. satırda eksik veri var ve atlandı.")
-                        continue
-
-                    try:
-                        # Eşleştirme anahtarı olarak username'i kullanıyoruz (Tavsiye edilen yol)
-                        student_username = str(row['username']).strip()
-                        component_name = str(row['component_name']).strip()
-                        score = float(row['score'])
-
-                        # 1. Kullanıcı Adı ile öğrenciyi bul (User Modelini Kullanarak)
-                        # Not: User modelinin username alanı benzersizdir ve güvenilir bir eşleştirme sağlar.
-                        student_user = User.objects.get(username=student_username)
-
-                        # 2. Not bileşenini bul (Vize, Final, Ödev vb.)
-                        component = EvaluationComponent.objects.get(name=component_name)
-
-                        # 3. Notu kaydet veya güncelle (Zaten varsa üzerine yazar)
-                        Grade.objects.update_or_create(
-                            student=student_user,
-                            component=component,
-                            defaults={'score': score}
-                        )
-
-                        kayit_sayisi += 1
-
-                    except User.DoesNotExist:
-                        # Kullanıcı adı veritabanında bulunamazsa
-                        eslesmeyen_ogrenciler.append(student_username)
-                    except EvaluationComponent.DoesNotExist:
-                        # Excel'deki not bileşeni adı (vize1, final vb.) sistemde tanımlı değilse
-                        messages.warning(request,
-                                         f"'{component_name}' adında Not Bileşeni bulunamadı ve not işlenemedi.")
-                    except ValueError:
-                        # Not (score) alanı sayıya çevrilemezse
-                        messages.error(request, f"Hata: {student_username} kullanıcısının notu sayısal değil.")
-                    except Exception as e:
-                        # Diğer tüm hatalar
-                        messages.error(request, f"Beklenmedik bir hata oluştu: {e}")
-
-            # Eşleşmeyen öğrencileri toplu halde raporla
-            if eslesmeyen_ogrenciler:
-                messages.warning(request,
-                                 f"Aşağıdaki {len(eslesmeyen_ogrenciler)} kullanıcı adına ait öğrenci sistemde bulunamadı ve notları işlenmedi: "
-                                 f"{', '.join(eslesmeyen_ogrenciler[:10])}{' ve daha fazlası...' if len(eslesmeyen_ogrenciler) > 10 else ''}"
-                                 )
-
-            messages.success(request, f"Başarıyla {kayit_sayisi} not sisteme işlendi.")
-            return redirect("upload_grades", course_id=course.id)
+            # hatalı satırlar tek tek flash mesajı olmaz, tek bir rapor kaydında toplanır
+            parsed = grade_import.parse_grade_table(header, rows, course)
+            return _import_grades(request, course, file.name, "excel", parsed, import_started)
     else:
         # Formun yüklenmesi
         form = GradeUploadForm()
 
-    return render(request, "teacher/upload_grades.html", {"form": form, "course": course})
+    return _render_upload_page(request, course, form, "excel")
+
+
+@login_required
+@user_is_instructor
+def upload_grades_csv(request, course_id):
+    """
+    CSV dosyasıyla toplu not yükleme. Dosya pandas olmadan csv modülüyle akış halinde okunur
+    (kodlama ve ayraç otomatik algılanır); doğrulama, önizleme ve toplu upsert Excel yolu ile aynıdır.
+    """
+    from course_management.forms import GradeCSVUploadForm
+
+    course = get_object_or_404(Course, id=course_id, instructors=request.user)
+
+    if request.method == "POST":
+        form = GradeCSVUploadForm(request.POST, request.FILES)
+        if form.is_valid():
+            file = request.FILES["file"]
+            import_started = time.perf_counter()
+            try:
+                header, rows = grade_import.read_csv_table(file)
+                parsed = grade_import.parse_grade_table(header, rows, course)
+            except csv.Error as e:
+                messages.error(request, f"Dosya okunamadı veya formatı hatalı: {e}")
+                return redirect("upload_grades_csv", course_id=course.id)
+            return _import_grades(request, course, file.name, "csv", parsed, import_started)
+    else:
+        form = GradeCSVUploadForm()
+
+    return _render_upload_page(request, course, form, "csv")
+
+
+def _import_grades(request, course, file_name, source, parsed, started):
+    """Excel ve CSV yüklemelerinin ortak akışı: diff, önizleme veya toplu upsert, rapor ve özet mesajı."""
+    upload_page = GRADE_UPLOAD_PAGES[source]
+    grades, errors, row_count = parsed
+    # mevcut notlarla bellekte karşılaştırılır, sadece yeni/değişen notlar yazılır
+    changes, unchanged = grade_import.diff_grades(grades, course)
+
+    # önizleme: hiçbir not yazılmaz, değişiklikler onay için saklanır
+    if "dry_run" in request.POST:
+        report = grade_import.save_import_report(
+            course, request.user, file_name, source, row_count, errors, changes, unchanged,
+            status=GradeImport.STATUS_PREVIEW,
+        )
+        return redirect("grade_import_preview", course_id=course.id, import_id=report.id)
+
+    # Notlar toplu upsert ile kaydedilir (zaten varsa üzerine yazar)
+    try:
+        kayit_sayisi = upsert_grades(grade_import.changes_to_grades(changes))
+    except DatabaseBusy:
+        messages.error(request, DATABASE_BUSY_MESSAGE)
+        return redirect(upload_page, course_id=course.id)
+
+    grade_import.save_import_report(course, request.user, file_name, source, row_count, errors, changes, unchanged)
+    metrics.record_grade_import(kayit_sayisi, time.perf_counter() - started, source=source)
+    messages.success(request, f"Başarıyla {kayit_sayisi} not sisteme işlendi ({unchanged} not zaten aynıydı).")
+    if errors:
+        messages.warning(request, f"{len(errors)} satır hatalı olduğu için atlandı. "
+                                  f"Ayrıntılı hata raporunu aşağıdan CSV olarak indirebilirsiniz.")
+    return redirect(upload_page, course_id=course.id)
+
+
+def _render_upload_page(request, course, form, source):
+    # hata ve değişiklik listeleri (JSON) sadece önizleme/CSV sayfalarında okunur
+    recent_imports = course.grade_imports.defer("errors", "changes")[:5]
+    return render(request, "teacher/upload_grades.html", {
+        "form": form,
+        "course": course,
+        "recent_imports": recent_imports,
+        "upload_format": source,
+    })
+
+
+@login_required
+@user_is_instructor
+def grade_import_preview(request, course_id, import_id):
+    """Önizlemesi alınmış bir yüklemenin yeni/güncellenen/değişmeyen not sayıları ve hatalı satırları."""
+    course = get_object_or_404(Course, id=course_id, instructors=request.user)
+    report = get_object_or_404(GradeImport, id=import_id, course=course)
+    return render(request, "teacher/grade_import_preview.html", {
+        "course": course,
+        "report": report,
+        "changes": report.changes[:GRADE_IMPORT_PREVIEW_ROWS],
+        "errors": report.errors[:GRADE_IMPORT_PREVIEW_ROWS],
+        "preview_rows": GRADE_IMPORT_PREVIEW_ROWS,
+    })
+
+
+@login_required
+@user_is_instructor
+@require_POST
+def grade_import_confirm(request, course_id, import_id):
+    """Önizlemedeki değişiklikleri dosyayı tekrar okumadan uygular."""
+    course = get_object_or_404(Course, id=course_id, instructors=request.user)
+    report = get_object_or_404(GradeImport.objects.only("id", "source"), id=import_id, course=course)
+
+    started = time.perf_counter()
+    try:
+        applied = grade_import.apply_preview(report.id)
+    except DatabaseBusy:
+        messages.error(request, DATABASE_BUSY_MESSAGE)
+        return redirect("grade_import_preview", course_id=course.id, import_id=report.id)
+
+    if applied is None:
+        messages.warning(request, "Bu önizleme zaten uygulanmış.")
+    else:
+        metrics.record_grade_import(applied.imported_count, time.perf_counter() - started, source=report.source)
+        messages.success(request, f"Başarıyla {applied.imported_count} not sisteme işlendi.")
+        if applied.conflict_count:
+            messages.warning(
+                request,
+                f"{applied.conflict_count} not önizlemeden sonra başka biri tarafından değiştirildiği için "
+                "üzerine yazılmadı. Ayrıntılar hata raporunda.",
+            )
+    return redirect(GRADE_UPLOAD_PAGES.get(report.source, "upload_grades"), course_id=course.id)
+
+
+@login_required
+@user_is_instructor
+def grade_import_errors(request, course_id, import_id):
+    """Bir not yüklemesinin hatalı satırlarını CSV olarak indirir."""
+    course = get_object_or_404(Course, id=course_id, instructors=request.user)
+    report = get_object_or_404(GradeImport, id=import_id, course=course)
+
+    response = HttpResponse(content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{course.course_code}_not_hatalari_{report.id}.csv"'
+    # BOM: Excel Türkçe karakterleri doğru açsın
+    response.write("\ufeff")
+    grade_import.write_errors_csv(report, response)
+    return response
 
 
-def instructor_csv_upload_placeholder(request, course_id):
-    return render(request, "teacher/csv_upload_placeholder.html", {"course_id": course_id})
 
 @login_required
 @user_is_instructor
 def course_home(request, course_id):
     return manage_course(request, course_id)
 
+@login_required
+@user_is_instructor
+def course_grades(request, course_id):
+    return manage_course(request, course_id, tab="grades")
+
 @login_required
 @user_is_instructor
 def course_outcomes(request, course_id):